@@ -1,8 +1,8 @@
 import logging
-import traceback
 from uuid import uuid4
-from typing import Any
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from typing import Any, Iterator, Optional
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
 from app.models.schemas import (
     AuditRequest,
@@ -10,88 +10,120 @@ from app.models.schemas import (
     GenerateRequest,
     GenerateStatusResponse,
 )
+from app.utils.archive import (
+    DEFAULT_COMPRESSION_LEVEL,
+    archive_etag,
+    archives,
+    build_zip,
+    iter_chunks,
+    iter_zip,
+    parse_range,
+    project_digests,
+)
+from app.services.job_runner import dispatcher
+from app.utils.cancellation import cancellations
 from app.utils.jobs import jobs
-from app.utils.storage import create_job_dir
-from app.services.audit import perform_audit
-from app.services.pipeline import run_full_generation
+from app.utils.metrics import render_metrics
+from app.utils.storage import storage
+from app.utils.tenants import tenants
+from app.utils.tracing import current_context, current_trace_id
 
 logger = logging.getLogger("ych.api")
 router = APIRouter()
 
 
+def _enqueue(kind: str, job_id: str, payload: dict[str, Any], schedule: dict[str, Any]) -> None:
+    """Record a queued job; wake the in-process slots unless out-of-process workers consume the queue.
+
+    schedule: {"tenant", "priority", "weight"} from `tenants.resolve`
+    """
+    ctx = current_context()
+    jobs.create_job(
+        kind, job_id,
+        trace_id=current_trace_id(),
+        payload=payload,
+        parent_span_id=ctx.span_id if ctx is not None else None,
+        **schedule,
+    )
+    if not jobs.out_of_process:
+        dispatcher.notify(kind)
+
+
+def _cancel(kind: str, job_id: str) -> dict:
+    """Cancel a queued job, or ask a running one to stop at its next checkpoint."""
+    status = jobs.request_cancel(kind, job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"{kind} job not found")
+    if status not in ("cancelled", "cancelling"):
+        raise HTTPException(status_code=409, detail=f"{kind} job already finished (status={status})")
+    if not jobs.out_of_process:
+        # Out-of-process workers pick the request up from the queue on their next poll
+        cancellations.cancel(kind, job_id, "cancelled by client")
+    logger.info("[%s:%s] cancel | status=%s", kind, job_id, status)
+    return {"status": status}
+
+
+def _audit_ready(audit_job: dict) -> bool:
+    """Generation only reads the DOM sample, so it may start while axe/PSI are still running."""
+    if audit_job.get("status") == "done":
+        return True
+    artifacts = (audit_job.get("result") or {}).get("artifacts") or {}
+    return audit_job.get("status") == "running" and bool(artifacts.get("dom_sample_path"))
+
+
 @router.post("/audit", response_model=dict)
-async def start_audit(req: AuditRequest, bg: BackgroundTasks) -> dict:
+async def start_audit(req: AuditRequest, x_api_key: Optional[str] = Header(None)) -> dict:
     audit_id = str(uuid4())
-    jobs.create_job("audit", audit_id)
-    logger.info("[audit:%s] queued | url=%s", audit_id, req.url)
-
-    def _run() -> None:
-        try:
-            out_dir = create_job_dir("audit", audit_id)
-            logger.info("[audit:%s] started | out_dir=%s", audit_id, out_dir)
-            result = perform_audit(req.url, req.options or {}, out_dir)
-            jobs.complete_job("audit", audit_id, result)
-            logger.info("[audit:%s] completed | screenshots=%s", audit_id, len(result.get("artifacts", {}).get("screenshots", [])))
-        except Exception as exc:  # noqa: BLE001
-            jobs.fail_job("audit", audit_id, {
-                "error": str(exc),
-                "traceback": traceback.format_exc(),
-            })
-            logger.exception("[audit:%s] failed: %s", audit_id, exc)
-
-    bg.add_task(_run)
+    options = req.options.model_dump() if req.options else {}
+    schedule = tenants.resolve(x_api_key, req.priority)
+    _enqueue("audit", audit_id, {"url": req.url, "options": options, "deadlines": req.deadlines}, schedule)
+    logger.info("[audit:%s] queued | url=%s | tenant=%s | priority=%s", audit_id, req.url, schedule["tenant"], schedule["priority"])
     return {"audit_id": audit_id}
 
 
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @router.get("/audit/{audit_id}", response_model=AuditStatusResponse)
 async def get_audit(audit_id: str) -> AuditStatusResponse:
     job = jobs.get_job("audit", audit_id)
     if not job:
         raise HTTPException(status_code=404, detail="audit not found")
+    storage.touch("audit", audit_id)
     logger.info("[audit:%s] polled | status=%s", audit_id, job.get("status"))
     return AuditStatusResponse(**job)
 
 
+@router.delete("/audit/{audit_id}", response_model=dict)
+async def cancel_audit(audit_id: str) -> dict:
+    return _cancel("audit", audit_id)
+
+
 @router.post("/generate", response_model=dict)
-async def start_generate(req: GenerateRequest, bg: BackgroundTasks) -> dict:
+async def start_generate(req: GenerateRequest, x_api_key: Optional[str] = Header(None)) -> dict:
     # Accept either a completed audit_id, or content provided directly
-    audit_result: dict[str, Any] = {}
     from_audit = False
     if req.audit_id:
         audit_job = jobs.get_job("audit", req.audit_id)
-        if not audit_job or audit_job.get("status") != "done":
+        if not audit_job or not _audit_ready(audit_job):
             raise HTTPException(status_code=400, detail="audit not found or incomplete")
-        audit_result = audit_job.get("result", {})
+        storage.touch("audit", req.audit_id)
         from_audit = True
     elif not req.content:
         raise HTTPException(status_code=400, detail="must provide content or a completed audit_id")
 
     gen_id = str(uuid4())
-    jobs.create_job("generate", gen_id)
-    logger.info("[generate:%s] queued | from_audit=%s", gen_id, from_audit)
-
-    def _run() -> None:
-        try:
-            out_dir = create_job_dir("generate", gen_id)
-            logger.info("[generate:%s] started | out_dir=%s", gen_id, out_dir)
-            result = run_full_generation(
-                audit_results=audit_result,
-                out_dir=out_dir,
-                tone=req.tone or ((req.preferences or {}).get("tone") if req.preferences else "professional"),
-                criteria=None,
-                content=req.content,
-            )
-            jobs.complete_job("generate", gen_id, result)
-            dev = result.get("dev_server", {})
-            logger.info("[generate:%s] completed | dev_url=%s", gen_id, dev.get("ephemeral_url"))
-        except Exception as exc:  # noqa: BLE001
-            jobs.fail_job("generate", gen_id, {
-                "error": str(exc),
-                "traceback": traceback.format_exc(),
-            })
-            logger.exception("[generate:%s] failed: %s", gen_id, exc)
-
-    bg.add_task(_run)
+    schedule = tenants.resolve(x_api_key, req.priority)
+    _enqueue("generate", gen_id, {
+        "audit_id": req.audit_id,
+        "content": req.content,
+        "tone": req.tone or "professional",
+        "mode": req.mode,
+        "deadlines": req.deadlines,
+    }, schedule)
+    logger.info("[generate:%s] queued | from_audit=%s | mode=%s | priority=%s", gen_id, from_audit, req.mode, schedule["priority"])
     return {"job_id": gen_id}
 
 
@@ -100,5 +132,76 @@ async def get_generate(job_id: str) -> GenerateStatusResponse:
     job = jobs.get_job("generate", job_id)
     if not job:
         raise HTTPException(status_code=404, detail="generation job not found")
+    storage.touch("generate", job_id)
     logger.info("[generate:%s] polled | status=%s", job_id, job.get("status"))
     return GenerateStatusResponse(**job)
+
+
+@router.delete("/generate/{job_id}", response_model=dict)
+async def cancel_generate(job_id: str) -> dict:
+    return _cancel("generate", job_id)
+
+
+@router.get("/generate/{job_id}/archive")
+def get_generate_archive(
+    job_id: str,
+    request: Request,
+    level: int = Query(DEFAULT_COMPRESSION_LEVEL, ge=0, le=9),
+) -> Response:
+    job = jobs.get_job("generate", job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="generation job not found")
+    project_dir = (job.get("result") or {}).get("project_dir")
+    if job.get("status") != "done" or not project_dir:
+        raise HTTPException(status_code=404, detail="archive not available for this job")
+    storage.touch("generate", job_id)
+
+    digests, sources = project_digests(project_dir)
+    etag = archive_etag(digests, level)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=0, must-revalidate",
+        "Content-Disposition": f'attachment; filename="{job_id}.zip"',
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range is not None and if_range != etag:
+        range_header = None
+    data = archives.get(etag)
+    if data is None and range_header is None:
+        # Stream entries while they are compressed; the finished bytes fill the cache for
+        # later Range/repeat requests (same bytes: build_zip joins the same stream)
+        def stream() -> Iterator[bytes]:
+            parts = []
+            for chunk in iter_zip(sources, level):
+                parts.append(chunk)
+                yield chunk
+            archive = b"".join(parts)
+            archives.put(etag, archive)
+            logger.info("[generate:%s] archive.streamed | files=%s | bytes=%s", job_id, len(sources), len(archive))
+
+        return StreamingResponse(stream(), media_type="application/zip", headers=headers)
+    if data is None:
+        data = build_zip(sources, level)
+        archives.put(etag, data)
+        logger.info("[generate:%s] archive.built | files=%s | bytes=%s", job_id, len(sources), len(data))
+    size = len(data)
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    logger.info("[generate:%s] archive | bytes=%s | range=%s", job_id, size, byte_range)
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(iter_chunks(data), media_type="application/zip", headers=headers)
+    start, end = byte_range
+    headers["Content-Length"] = str(end - start + 1)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        iter_chunks(data, start, end), status_code=206, media_type="application/zip", headers=headers
+    )
@@ -1,9 +1,16 @@
 import logging
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import router as api_router
-from app.utils.dspy_config import configure_from_env as _configure_dspy
+from app.services.job_runner import dispatcher
+from app.utils.dspy_config import ensure_configured as _configure_dspy
+from app.utils.jobs import jobs
+from app.utils.storage import storage
+from app.utils.tracing import processor as trace_processor, span
 
 # Basic logging configuration
 logging.basicConfig(
@@ -13,7 +20,24 @@ logging.basicConfig(
 
 logger = logging.getLogger("ych")
 
-app = FastAPI(title="YCH UX Auditor & Generator", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Heavy imports (dspy, playwright, freestyle) stay out of module import. DSPy is set up
+    # here only when jobs run in this process; queue workers configure it themselves
+    if not jobs.out_of_process:
+        _configure_dspy()
+    # Background runtime directory GC (TTL + disk quota)
+    storage.start()
+    try:
+        yield
+    finally:
+        dispatcher.stop()
+        storage.stop()
+        trace_processor.flush()
+
+
+app = FastAPI(title="YCH UX Auditor & Generator", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -25,12 +49,21 @@ app.add_middleware(
 
 app.include_router(api_router)
 
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    with span("http.request", method=request.method, path=request.url.path) as s:
+        response = await call_next(request)
+        route = request.scope.get("route")
+        if route is not None:
+            s.name = f"{request.method} {getattr(route, 'path', request.url.path)}"
+        s.set_attribute("status", response.status_code)
+        response.headers["X-Trace-Id"] = s.trace_id
+        return response
+
 @app.get("/health")
 async def health() -> dict:
     return {"status": "ok"}
 
 # Log app startup
 logger.info("FastAPI app initialized: %s v%s", app.title, app.version)
-
-# Configure DSPy
-_configure_dspy()
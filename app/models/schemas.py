@@ -1,16 +1,63 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from pydantic import BaseModel, HttpUrl, field_validator
 
 
+class AxeOptions(BaseModel):
+    # Only run rules with these tags (e.g. wcag2a, wcag2aa, best-practice); None runs every rule
+    tags: List[str] | None = ["wcag2a", "wcag2aa"]
+    # Rule groups returned; passes/inapplicable are large and rarely read
+    result_types: List[Literal["violations", "incomplete", "passes", "inapplicable"]] = ["violations"]
+    # Nodes kept per rule (node_count still reports the total)
+    max_nodes: int = 5
+    # CSS selectors limiting (include) or skipping (exclude) parts of the page
+    include: List[str] | None = None
+    exclude: List[str] | None = None
+
+    @field_validator("max_nodes")
+    @classmethod
+    def _positive_nodes(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("max_nodes must be at least 1")
+        return v
+
+
 class AuditOptions(BaseModel):
     mobile: bool = True
     viewport_width: int | None = None
     viewport_height: int | None = None
+    # fast: block trackers, media and streaming requests (DOM/copy extraction); fidelity: load everything
+    profile: Literal["fast", "fidelity"] = "fidelity"
+    # fast profile only: also block web fonts
+    block_fonts: bool = False
+    # adaptive: `load` + DOM/layout quiet window with a hard cap; networkidle: wait for network silence (30 s)
+    readiness: Literal["adaptive", "networkidle"] = "adaptive"
+    axe: AxeOptions = AxeOptions()
+    # PageSpeed Insights enrichment (accessibility/SEO scores); performance comes from the lab run
+    psi: bool = True
+    # Network/CPU emulation (see app/services/throttling.py); lab metrics are comparable within a profile
+    throttling: Literal["none", "slow-4g-midtier", "fast-3g", "desktop-cable"] = "none"
+    # Record a HAR file (headers and timings, no bodies) next to the screenshots
+    har: bool = False
+
+
+def _check_deadlines(v: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
+    if v and any(seconds <= 0 for seconds in v.values()):
+        raise ValueError("deadlines must be positive numbers of seconds")
+    return v
 
 
 class AuditRequest(BaseModel):
     url: str
     options: Optional[AuditOptions] = None
+    # Seconds per stage (launch, context, goto, settle, lab, screenshots, axe, playwright, psi) or "total"
+    deadlines: Dict[str, float] | None = None
+    # Scheduling class; defaults to the API key's class (interactive without a key)
+    priority: Literal["interactive", "batch"] | None = None
+
+    @field_validator("deadlines")
+    @classmethod
+    def _positive_deadlines(cls, v: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
+        return _check_deadlines(v)
 
     @field_validator("url")
     @classmethod
@@ -37,12 +84,29 @@ class Artifacts(BaseModel):
     axe: Dict[str, Any] | None = None
     psi: Dict[str, Any] | None = None
     dom_sample_path: str | None = None
+    # fast profile: {"profile", "blocked", "by_reason", "est_bytes_saved"}
+    blocking: Dict[str, Any] | None = None
+    # {"strategy", "reason", "load_s", "settle_s", "total_s", "mutations", "layout_shifts"}
+    readiness: Dict[str, Any] | None = None
+    # Lab metrics from the audit browser: ttfb_ms, fcp_ms, lcp_ms, cls, tbt_ms, transfer_bytes, ..., score
+    lab: Dict[str, Any] | None = None
+    # Bytes by type/origin, largest assets, uncompressed text, render-blocking and short-cached resources
+    resources: Dict[str, Any] | None = None
+    har_path: str | None = None
+    # {"profile", "latency_ms", "download_kbps", "upload_kbps", "cpu_slowdown"}
+    throttling: Dict[str, Any] | None = None
+    # File name -> sha256 of its content blob (files in the job directory are links to the blobs)
+    blobs: Dict[str, str] | None = None
 
 
 class AuditStatusResponse(BaseModel):
     status: str
+    # Partial while running: the artifacts of the phases finished so far
     result: Dict[str, Any] | None = None
     error: Dict[str, Any] | None = None
+    trace_id: str | None = None
+    # {"playwright": "done", "axe": "done", "psi": "running"}; each pending, running, done or failed
+    phases: Dict[str, str] | None = None
 
 
 class GeneratePreferences(BaseModel):
@@ -58,9 +122,21 @@ class GenerateRequest(BaseModel):
     content: str | None = None
     # Optional: tone for copywriting agent
     tone: str | None = None
+    # fast: template render from copy plan (no ReAct loop); agentic: DSPy ReAct agent
+    mode: Literal["fast", "agentic"] = "agentic"
+    # Seconds per stage (copy_llm, dev_server, react, lint, build, push) or "total"
+    deadlines: Dict[str, float] | None = None
+    # Scheduling class; defaults to the API key's class (interactive without a key)
+    priority: Literal["interactive", "batch"] | None = None
+
+    @field_validator("deadlines")
+    @classmethod
+    def _positive_deadlines(cls, v: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
+        return _check_deadlines(v)
 
 
 class GenerateStatusResponse(BaseModel):
     status: str
     result: Dict[str, Any] | None = None
     error: Dict[str, Any] | None = None
+    trace_id: str | None = None
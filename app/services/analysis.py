@@ -7,6 +7,80 @@ import logging
 logger = logging.getLogger("ych.analysis")
 
 
+_PRIORITY_ORDER = {"high": 0, "moderate": 1, "low": 2}
+# Images above this size are reported as candidates for resizing/re-encoding
+LARGE_IMAGE_BYTES = 100_000
+
+
+def _kb(n: int) -> str:
+    return f"{round(n / 1024):,} KB"
+
+
+def _by_savings(savings: int) -> str:
+    return "high" if savings >= 500_000 else "moderate" if savings >= 100_000 else "low"
+
+
+def performance_suggestions(resources: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Specific performance fixes from the audit's resource summary, most valuable first.
+
+    `est_savings_bytes` is a rough estimate (text compresses ~70%, images ~50%) used for ranking.
+    """
+    found: List[Dict[str, Any]] = []
+    blocking = resources.get("render_blocking") or []
+    if blocking:
+        scripts = sum(1 for b in blocking if b.get("type") == "script")
+        fixes = []
+        if scripts:
+            fixes.append(f"add defer/async to {scripts} script(s)")
+        if len(blocking) > scripts:
+            fixes.append(f"inline critical CSS and load {len(blocking) - scripts} stylesheet(s) asynchronously")
+        found.append({
+            "action": f"Unblock first render: {' and '.join(fixes)}.",
+            "priority": "high" if len(blocking) >= 3 else "moderate",
+            "est_savings_bytes": sum(b.get("bytes") or 0 for b in blocking),
+            "evidence": {"urls": [b["url"] for b in blocking[:5]]},
+        })
+    if resources.get("uncompressed"):
+        savings = int(resources.get("uncompressed_bytes", 0) * 0.7)
+        found.append({
+            "action": f"Enable gzip or brotli for {len(resources['uncompressed'])} text response(s), about {_kb(savings)} smaller.",
+            "priority": _by_savings(savings),
+            "est_savings_bytes": savings,
+            "evidence": {"urls": [u["url"] for u in resources["uncompressed"][:5]]},
+        })
+    images = [a for a in resources.get("largest") or [] if a.get("type") == "image" and a["bytes"] >= LARGE_IMAGE_BYTES]
+    if images:
+        savings = int(sum(a["bytes"] for a in images) * 0.5)
+        found.append({
+            "action": f"Resize and re-encode {len(images)} large image(s) (WebP/AVIF, responsive srcset), about {_kb(savings)} smaller.",
+            "priority": _by_savings(savings),
+            "est_savings_bytes": savings,
+            "evidence": {"largest": images[:5]},
+        })
+    total, third_party = resources.get("total_bytes") or 0, resources.get("third_party_bytes") or 0
+    if third_party >= 200_000 and third_party >= 0.3 * total:
+        savings = int(third_party * 0.5)
+        origins = list(resources.get("bytes_by_origin") or {})[:5]
+        found.append({
+            "action": f"Trim third-party resources ({_kb(third_party)}, {round(third_party * 100 / total)}% of the page).",
+            "priority": _by_savings(savings),
+            "est_savings_bytes": savings,
+            "evidence": {"origins": origins},
+        })
+    if resources.get("short_cache_count"):
+        # Only repeat visits benefit, so rank it below first-load savings of the same size
+        savings = int(resources.get("short_cache_bytes", 0) * 0.3)
+        found.append({
+            "action": f"Serve {resources['short_cache_count']} static asset(s) with a long Cache-Control max-age "
+                      "(immutable for fingerprinted files).",
+            "priority": "low",
+            "est_savings_bytes": savings,
+            "evidence": {"urls": [u["url"] for u in resources.get("short_cache", [])[:5]]},
+        })
+    found.sort(key=lambda f: (_PRIORITY_ORDER[f["priority"]], -f["est_savings_bytes"]))
+    return [{"area": "performance", **f} for f in found]
+
+
 def synthesize_suggestions(audit_result: Dict[str, Any]) -> Dict[str, Any]:
     """Return structured suggestions and a simple site plan.
 
@@ -32,16 +106,20 @@ def synthesize_suggestions(audit_result: Dict[str, Any]) -> Dict[str, Any]:
             "reference": v.get("helpUrl"),
         })
 
-    # Performance from PSI
+    # Performance: specific fixes from the resource summary; otherwise a generic hint from the score
+    perf = (audit_result.get("scores") or {}).get("performance")
     cat = psi.get("lighthouseResult", {}).get("categories", {})
-    if cat:
+    if perf is None and cat:
         perf = int(cat.get("performance", {}).get("score", 0) * 100)
-        if perf < 80:
-            suggestions.append({
-                "area": "performance",
-                "action": "Optimize images, enable compression, and reduce render-blocking resources.",
-                "priority": "high" if perf < 60 else "moderate",
-            })
+    resources = artifacts.get("resources")
+    if resources:
+        suggestions.extend(performance_suggestions(resources)[:5])
+    elif perf is not None and perf < 80:
+        suggestions.append({
+            "area": "performance",
+            "action": "Optimize images, enable compression, and reduce render-blocking resources.",
+            "priority": "high" if perf < 60 else "moderate",
+        })
 
     # Baseline layout suggestions
     suggestions.append({
@@ -1,33 +1,134 @@
-import asyncio
+import copy
 import logging
 import json
 import os
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import httpx
 
-from app.models.schemas import AuditOptions
+from app.models.schemas import AuditOptions, AxeOptions
+from app.services.blocklist import TYPICAL_BYTES, blocking_reason
+from app.services.lab import LAB_COLLECT_JS, LAB_INIT_JS, score_lab
+from app.services.resources import RENDER_BLOCKING_JS, resource_entry, summarize_resources
+from app.services.throttling import apply_throttling
 from app.services.psi import get_psi_report
+from app.utils.cancellation import DeadlineExceeded, bounded_timeout, check_cancelled, run_cancellable, within_deadline
+from app.utils.metrics import AUDIT_BLOCKED_REQUESTS, AUDIT_READINESS, BROWSERS_ACTIVE, STAGE_FAILURES, track_stage
+from app.utils.politeness import OriginBusy, origins
+from app.utils.storage import blobs
 from app.utils.security import validate_public_url
 
-try:
-    from playwright.async_api import async_playwright
-except Exception:  # pragma: no cover
-    async_playwright = None  # type: ignore
-
 
 logger = logging.getLogger("ych.audit")
 
-AXE_MIN_JS_URL = (
-    "https://cdnjs.cloudflare.com/ajax/libs/axe-core/4.9.1/axe.min.js"
+AXE_MIN_JS_URL = os.getenv(
+    "AXE_JS_URL", "https://cdnjs.cloudflare.com/ajax/libs/axe-core/4.9.1/axe.min.js"
 )
+# Adaptive readiness: the page is ready once the DOM and layout have been still this long
+READINESS_QUIET_MS = int(os.getenv("AUDIT_READINESS_QUIET_MS", "500"))
+# ... or this many seconds after navigation started, whichever comes first
+READINESS_CAP_S = float(os.getenv("AUDIT_READINESS_CAP", "20"))
+
+# Resolves once no DOM mutation, layout shift or document height change was seen for
+# `quietMs`, or after `capMs`
+_SETTLE_JS = """
+async ({quietMs, capMs}) => {
+  const start = performance.now();
+  let last = start, mutations = 0, shifts = 0;
+  let height = document.documentElement ? document.documentElement.scrollHeight : 0;
+  const observer = new MutationObserver((records) => { mutations += records.length; last = performance.now(); });
+  observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+  let shiftObserver = null;
+  try {
+    shiftObserver = new PerformanceObserver((list) => { shifts += list.getEntries().length; last = performance.now(); });
+    shiftObserver.observe({type: 'layout-shift'});
+  } catch (e) {}
+  return await new Promise((resolve) => {
+    const done = (reason) => {
+      observer.disconnect();
+      if (shiftObserver) shiftObserver.disconnect();
+      resolve({reason, mutations, shifts, settleMs: Math.round(performance.now() - start)});
+    };
+    const tick = () => {
+      const now = performance.now();
+      const h = document.documentElement ? document.documentElement.scrollHeight : 0;
+      if (h !== height) { height = h; last = now; }
+      if (now - last >= quietMs) return done('quiet');
+      if (now - start >= capMs) return done('cap');
+      setTimeout(tick, 50);
+    };
+    tick();
+  });
+}
+"""
+
+
+ProgressCallback = Callable[[Dict[str, Any], Dict[str, str]], None]
+
+# Runs axe with the scoped context/options and compacts the result in the page, so only the
+# requested rule groups and the first `maxNodes` nodes per rule cross the CDP bridge
+_AXE_RUN_JS = """
+async ({context, options, resultTypes, maxNodes}) => {
+  const res = await axe.run(context || document, options);
+  const clip = (s, n) => (s && s.length > n ? s.slice(0, n) + '…' : s || null);
+  const compact = (rules) => rules.map((r) => ({
+    id: r.id,
+    impact: r.impact,
+    description: r.description,
+    help: r.help,
+    helpUrl: r.helpUrl,
+    tags: r.tags,
+    node_count: r.nodes.length,
+    nodes: r.nodes.slice(0, maxNodes).map((n) => ({
+      target: n.target,
+      html: clip(n.html, 300),
+      failureSummary: clip(n.failureSummary, 500),
+    })),
+  }));
+  const out = {
+    engine: res.testEngine && res.testEngine.version,
+    counts: {
+      violations: res.violations.length,
+      incomplete: res.incomplete.length,
+      passes: res.passes.length,
+      inapplicable: res.inapplicable.length,
+    },
+  };
+  for (const type of resultTypes) out[type] = compact(res[type] || []);
+  return out;
+}
+"""
+
+
+def _axe_args(axe: AxeOptions) -> Dict[str, Any]:
+    """Argument for _AXE_RUN_JS: axe context, run options and compaction limits."""
+    context: Optional[Dict[str, Any]] = None
+    if axe.include or axe.exclude:
+        context = {"exclude": axe.exclude or []}
+        if axe.include:
+            context["include"] = axe.include
+    options: Dict[str, Any] = {"resultTypes": axe.result_types}
+    if axe.tags:
+        options["runOnly"] = {"type": "tag", "values": axe.tags}
+    return {"context": context, "options": options, "resultTypes": axe.result_types, "maxNodes": axe.max_nodes}
+
 
+def perform_audit(
+    url: str, options_dict: Dict[str, Any], out_dir: str, progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """Run the audit phases (playwright, axe, psi) and return the combined result.
 
-def perform_audit(url: str, options_dict: Dict[str, Any], out_dir: str) -> Dict[str, Any]:
+    `progress(result, phases)` is called with the partial result whenever a phase starts
+    or ends, so screenshots and the DOM sample are usable before PSI returns.
+    """
     validate_public_url(url)
     options = AuditOptions(**options_dict or {})
-    logger.info("audit.perform | url=%s | mobile=%s | out_dir=%s", url, options.mobile, out_dir)
+    logger.info(
+        "audit.perform | url=%s | mobile=%s | profile=%s | throttling=%s | out_dir=%s",
+        url, options.mobile, options.profile, options.throttling, out_dir,
+    )
 
     result: Dict[str, Any] = {
         "scores": {},
@@ -35,36 +136,61 @@ def perform_audit(url: str, options_dict: Dict[str, Any], out_dir: str) -> Dict[
         "artifacts": {"screenshots": []},
         "url": url,
     }
+    phases = {"playwright": "running", "axe": "pending", "psi": "pending" if options.psi else "skipped"}
+
+    def publish() -> None:
+        if progress is None:
+            return
+        try:
+            progress(copy.deepcopy(result), dict(phases))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("audit.progress_failed | url=%s | err=%s", url, exc)
+
+    def captured(data: Dict[str, Any]) -> None:
+        # Screenshots and DOM are on disk; axe runs next on the same page
+        for key in ("screenshots", "dom_sample_path", "blocking", "readiness", "lab", "resources", "throttling", "blobs"):
+            if data.get(key) is not None:
+                result["artifacts"][key] = data[key]
+        _apply_lab_score(result, options)
+        phases.update(playwright="done", axe="running")
+        publish()
+
+    publish()
 
     # Playwright phase
     try:
-        pw_data = asyncio.run(_render_and_capture(url, options, out_dir))
+        # Waiting for the origin is not part of the phase's latency
+        with origins.acquire(url, resource="page"), track_stage("audit", "playwright"):
+            pw_data = run_cancellable(_render_and_capture(url, options, out_dir, on_captured=captured))
         result["artifacts"]["screenshots"] = pw_data.get("screenshots", [])
         result["artifacts"]["dom_sample_path"] = pw_data.get("dom_sample_path")
         if pw_data.get("axe") is not None:
             result["artifacts"]["axe"] = pw_data["axe"]
-    except Exception as exc:  # noqa: BLE001
+        if pw_data.get("blocking") is not None:
+            result["artifacts"]["blocking"] = pw_data["blocking"]
+        if pw_data.get("readiness") is not None:
+            result["artifacts"]["readiness"] = pw_data["readiness"]
+        for key in ("resources", "har_path", "throttling", "blobs"):
+            if pw_data.get(key) is not None:
+                result["artifacts"][key] = pw_data[key]
+        if pw_data.get("lab") is not None:
+            result["artifacts"]["lab"] = pw_data["lab"]
+            _apply_lab_score(result, options)
+        phases.update(playwright="done", axe="done" if pw_data.get("axe") is not None else "failed")
+    except (Exception, DeadlineExceeded) as exc:  # noqa: BLE001
+        # A stage deadline degrades the audit; a cancel or the job's total deadline ends it
+        check_cancelled()
         result.setdefault("warnings", []).append(f"playwright_failed: {exc}")
         logger.warning("audit.playwright_failed | url=%s | err=%s", url, exc)
+        if phases["playwright"] == "done":
+            phases["axe"] = "failed"
+        else:
+            phases.update(playwright="failed", axe="failed")
+    if options.psi:
+        phases["psi"] = "running"
+        publish()
+        _psi_phase(url, options, result, phases)
 
-    # PSI phase (optional)
-    try:
-        psi = get_psi_report(url, strategy="mobile" if options.mobile else "desktop")
-        if psi is not None:
-            result["artifacts"]["psi"] = psi
-            cat = psi.get("lighthouseResult", {}).get("categories", {})
-            perf = int(cat.get("performance", {}).get("score", 0) * 100) if cat else None
-            acc = int(cat.get("accessibility", {}).get("score", 0) * 100) if cat else None
-            seo = int(cat.get("seo", {}).get("score", 0) * 100) if cat else None
-            result["scores"].update({
-                "performance": perf,
-                "accessibility": acc,
-                "usability": seo,
-            })
-            logger.info("audit.psi | perf=%s acc=%s seo=%s", perf, acc, seo)
-    except Exception as exc:  # noqa: BLE001
-        result.setdefault("warnings", []).append(f"psi_failed: {exc}")
-        logger.warning("audit.psi_failed | url=%s | err=%s", url, exc)
 
     # Simple heuristics to fill in issues list if empty
     if not result.get("issues"):
@@ -88,73 +214,288 @@ def perform_audit(url: str, options_dict: Dict[str, Any], out_dir: str) -> Dict[
             })
         result["issues"] = issues
 
+    publish()
     logger.info("audit.done | url=%s | screenshots=%s | issues=%s", url, len(result.get("artifacts", {}).get("screenshots", [])), len(result.get("issues", [])))
     return result
 
 
-async def _render_and_capture(url: str, options: AuditOptions, out_dir: str) -> Dict[str, Any]:
-    if async_playwright is None:
+def _psi_phase(url: str, options: AuditOptions, result: Dict[str, Any], phases: Dict[str, str]) -> None:
+    """Optional enrichment: accessibility/SEO scores, and performance when the lab has none."""
+    try:
+        with track_stage("audit", "psi"):
+            psi = get_psi_report(url, strategy="mobile" if options.mobile else "desktop")
+        phases["psi"] = "failed" if psi is None else "done"
+        if psi is None:
+            STAGE_FAILURES.inc(kind="audit", stage="psi")
+        else:
+            result["artifacts"]["psi"] = psi
+            cat = psi.get("lighthouseResult", {}).get("categories", {})
+            perf = int(cat.get("performance", {}).get("score", 0) * 100) if cat else None
+            acc = int(cat.get("accessibility", {}).get("score", 0) * 100) if cat else None
+            seo = int(cat.get("seo", {}).get("score", 0) * 100) if cat else None
+            result["scores"].update({"accessibility": acc, "usability": seo})
+            # Lab scores are measured the same way on every run, so they take precedence
+            if result["scores"].get("performance") is None:
+                result["scores"]["performance"] = perf
+            logger.info("audit.psi | perf=%s acc=%s seo=%s", perf, acc, seo)
+    except OriginBusy as exc:
+        # The PSI API answered 429/503 recently; skip rather than wait out its Retry-After
+        phases["psi"] = "deferred"
+        result.setdefault("warnings", []).append(f"psi_deferred: {exc}")
+        logger.info("audit.psi_deferred | url=%s | err=%s", url, exc)
+    except (Exception, DeadlineExceeded) as exc:  # noqa: BLE001
+        check_cancelled()
+        phases["psi"] = "failed"
+        result.setdefault("warnings", []).append(f"psi_failed: {exc}")
+        logger.warning("audit.psi_failed | url=%s | err=%s", url, exc)
+
+
+def _apply_lab_score(result: Dict[str, Any], options: AuditOptions) -> None:
+    lab = result["artifacts"].get("lab")
+    if not lab:
+        return
+    lab["score"] = score_lab(lab, mobile=options.mobile)
+    # Scores are only comparable between runs with the same conditions
+    lab["throttling"] = options.throttling
+    if lab["score"] is not None:
+        result["scores"]["performance"] = lab["score"]
+
+
+async def _render_and_capture(
+    url: str,
+    options: AuditOptions,
+    out_dir: str,
+    on_captured: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    # Imported on first audit so the API process starts without loading playwright
+    try:
+        from playwright.async_api import async_playwright
+    except Exception as exc:  # pragma: no cover
         raise RuntimeError(
             "playwright not available. Install and run `python -m playwright install chromium`."
-        )
+        ) from exc
 
     Path(out_dir).mkdir(parents=True, exist_ok=True)
     screenshots: list[str] = []
     dom_sample_path: Optional[str] = None
     axe_result: Optional[Dict[str, Any]] = None
+    blocking: Optional[Dict[str, Any]] = None
+    readiness: Optional[Dict[str, Any]] = None
+    lab: Optional[Dict[str, Any]] = None
+    resources: Optional[Dict[str, Any]] = None
+    throttling: Optional[Dict[str, Any]] = None
+    digests: Dict[str, str] = {}
+    # HAR is written when the context closes; bodies are omitted, the summary keeps the sizes
+    har_path = str(Path(out_dir) / "page.har") if options.har else None
+    har_options: Dict[str, Any] = {"record_har_path": har_path, "record_har_content": "omit"} if har_path else {}
 
     logger.info("audit.playwright.start | url=%s", url)
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            viewport={
-                "width": options.viewport_width or (390 if options.mobile else 1366),
-                "height": options.viewport_height or (844 if options.mobile else 768),
-            },
-            device_scale_factor=1,
-            is_mobile=options.mobile,
-        )
-        page = await context.new_page()
-        await page.goto(url, wait_until="networkidle", timeout=30000)
-        logger.info("audit.playwright.loaded | url=%s", url)
-
-        # Screenshot above-the-fold
-        path1 = str(Path(out_dir) / "screenshot_above_fold.png")
-        await page.screenshot(path=path1, full_page=False)
-        screenshots.append(path1)
-
-        # Full page screenshot (best-effort)
-        path2 = str(Path(out_dir) / "screenshot_full.png")
+        with track_stage("audit", "launch"):
+            browser = await within_deadline(p.chromium.launch(headless=True))
+        BROWSERS_ACTIVE.inc()
         try:
-            await page.screenshot(path=path2, full_page=True)
-            screenshots.append(path2)
-        except Exception:
-            pass
+            with track_stage("audit", "context"):
+                context = await within_deadline(browser.new_context(
+                    viewport={
+                        "width": options.viewport_width or (390 if options.mobile else 1366),
+                        "height": options.viewport_height or (844 if options.mobile else 768),
+                    },
+                    device_scale_factor=1,
+                    is_mobile=options.mobile,
+                    **har_options,
+                ))
+                if options.profile == "fast":
+                    blocking = await _block_resources(context, options.block_fonts)
+                await context.add_init_script(LAB_INIT_JS)
+                page = await within_deadline(context.new_page())
+                entries = _record_resources(page)
+                throttling = await within_deadline(apply_throttling(context, page, options.throttling))
+            response, readiness = await _navigate(page, url, options)
+            if response is not None and response.status in (429, 503):
+                origins.defer(url, response.status, response.headers.get("retry-after"), resource="page")
+            logger.info(
+                "audit.playwright.loaded | url=%s | reason=%s | ready_s=%s", url, readiness["reason"], readiness["total_s"]
+            )
 
-        # DOM sample
-        html = await page.content()
-        dom_sample_path = str(Path(out_dir) / "dom.html")
-        Path(dom_sample_path).write_text(html[:2_000_000], encoding="utf-8")
+            # Lab metrics are read before screenshots, which scroll and resize the page
+            try:
+                with track_stage("audit", "lab"):
+                    lab = await within_deadline(page.evaluate(LAB_COLLECT_JS))
+                logger.info("audit.lab | url=%s | fcp=%s | lcp=%s | cls=%s | tbt=%s", url, lab["fcp_ms"], lab["lcp_ms"], lab["cls"], lab["tbt_ms"])
+            except (Exception, DeadlineExceeded) as exc:
+                check_cancelled()
+                logger.info("audit.lab.unavailable | url=%s | err=%s", url, exc)
 
-        # Try axe-core
-        try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                r = await client.get(AXE_MIN_JS_URL)
-                r.raise_for_status()
-                axe_js = r.text
-            await page.add_script_tag(content=axe_js)
-            axe_result = await page.evaluate("async () => { return await axe.run(); }")
-            logger.info("audit.axe.ok | url=%s | violations=%s", url, len((axe_result or {}).get("violations", []) if axe_result else 0))
-        except Exception:
-            axe_result = None
-            logger.info("audit.axe.unavailable | url=%s", url)
-
-        await context.close()
-        await browser.close()
+            with track_stage("audit", "screenshots"):
+                # Screenshot above-the-fold
+                path1 = str(Path(out_dir) / "screenshot_above_fold.png")
+                await within_deadline(page.screenshot(path=path1, full_page=False))
+                screenshots.append(path1)
 
+                # Full page screenshot (best-effort)
+                path2 = str(Path(out_dir) / "screenshot_full.png")
+                try:
+                    await within_deadline(page.screenshot(path=path2, full_page=True))
+                    screenshots.append(path2)
+                except Exception:
+                    pass
+
+            # DOM sample
+            html = await page.content()
+            dom_sample_path = str(Path(out_dir) / "dom.html")
+            # Identical captures of unchanged pages share one blob on disk
+            digests = {Path(shot).name: blobs.adopt(shot, kind="audit") for shot in screenshots}
+            digests["dom.html"] = blobs.materialize(dom_sample_path, html[:2_000_000], kind="audit")
+            try:
+                resources = summarize_resources(entries, url, await page.evaluate(RENDER_BLOCKING_JS))
+                logger.info(
+                    "audit.resources | url=%s | requests=%s | bytes=%s | render_blocking=%s",
+                    url, resources["requests"], resources["total_bytes"], len(resources["render_blocking"]),
+                )
+            except Exception as exc:  # noqa: BLE001
+                logger.info("audit.resources.unavailable | url=%s | err=%s", url, exc)
+            if on_captured is not None:
+                on_captured({
+                    "screenshots": list(screenshots),
+                    "dom_sample_path": dom_sample_path,
+                    "blocking": blocking,
+                    "readiness": readiness,
+                    "lab": lab,
+                    "resources": resources,
+                    "throttling": throttling,
+                    "blobs": digests,
+                })
+
+            # Try axe-core
+            try:
+                with track_stage("audit", "axe"):
+                    async with httpx.AsyncClient(timeout=bounded_timeout(10)) as client:
+                        r = await client.get(AXE_MIN_JS_URL)
+                        r.raise_for_status()
+                        axe_js = r.text
+                    await page.add_script_tag(content=axe_js)
+                    axe_result = await within_deadline(page.evaluate(_AXE_RUN_JS, _axe_args(options.axe)))
+                logger.info(
+                    "audit.axe.ok | url=%s | violations=%s | bytes=%s",
+                    url, (axe_result or {}).get("counts", {}).get("violations"), len(json.dumps(axe_result)),
+                )
+            except (Exception, DeadlineExceeded):
+                check_cancelled()
+                axe_result = None
+                logger.info("audit.axe.unavailable | url=%s", url)
+
+            await context.close()
+        finally:
+            await browser.close()
+            BROWSERS_ACTIVE.dec()
+
+    if blocking is not None:
+        logger.info("audit.blocking | url=%s | blocked=%s | by_reason=%s", url, blocking["blocked"], blocking["by_reason"])
     logger.info("audit.playwright.done | url=%s | shots=%s", url, len(screenshots))
     return {
         "screenshots": screenshots,
         "dom_sample_path": dom_sample_path,
         "axe": axe_result,
+        "blocking": blocking,
+        "readiness": readiness,
+        "lab": lab,
+        "resources": resources,
+        "throttling": throttling,
+        "blobs": digests,
+        "har_path": har_path if har_path and Path(har_path).exists() else None,
+    }
+
+
+async def _navigate(page: Any, url: str, options: AuditOptions) -> Tuple[Any, Dict[str, Any]]:
+    """Load `url` and wait until it is ready to capture; returns (response, readiness record).
+
+    ``adaptive``: wait for `load`, then for a quiet window with no DOM mutations or layout
+    changes, all within READINESS_CAP_S. A page whose `load` never fires (long polling,
+    stuck third parties) is captured as-is instead of failing the audit.
+    ``networkidle``: the previous behaviour, failing after 30 s.
+    """
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    start = time.perf_counter()
+    if options.readiness == "networkidle":
+        with track_stage("audit", "goto"):
+            response = await within_deadline(page.goto(url, wait_until="networkidle", timeout=bounded_timeout(30) * 1000))
+        elapsed = round(time.perf_counter() - start, 3)
+        AUDIT_READINESS.inc(reason="networkidle")
+        return response, {"strategy": "networkidle", "reason": "networkidle", "load_s": elapsed, "settle_s": 0.0, "total_s": elapsed}
+
+    load_timed_out = False
+    with track_stage("audit", "goto"):
+        # Inside the stage, so `deadlines["goto"]` bounds navigation as well as the job total
+        cap = bounded_timeout(READINESS_CAP_S)
+        response = await within_deadline(page.goto(url, wait_until="commit", timeout=cap * 1000))
+        try:
+            load_timeout = bounded_timeout(max(cap - (time.perf_counter() - start), 0.001))
+            await within_deadline(page.wait_for_load_state("load", timeout=load_timeout * 1000))
+        except PlaywrightTimeoutError:
+            load_timed_out = True
+    load_s = time.perf_counter() - start
+    with track_stage("audit", "settle"):
+        remaining_ms = max(bounded_timeout(READINESS_CAP_S - load_s), 0.0) * 1000
+        settle = await within_deadline(page.evaluate(_SETTLE_JS, {"quietMs": READINESS_QUIET_MS, "capMs": remaining_ms}))
+    reason = "load_timeout" if load_timed_out else settle["reason"]
+    AUDIT_READINESS.inc(reason=reason)
+    return response, {
+        "strategy": "adaptive",
+        "reason": reason,
+        "load_s": round(load_s, 3),
+        "settle_s": round(time.perf_counter() - start - load_s, 3),
+        "total_s": round(time.perf_counter() - start, 3),
+        "mutations": settle.get("mutations"),
+        "layout_shifts": settle.get("shifts"),
     }
+
+
+def _record_resources(page: Any) -> List[Dict[str, Any]]:
+    """Collect a `resource_entry` for every request the page completes; returns the live list."""
+    entries: List[Dict[str, Any]] = []
+
+    async def _finished(request: Any) -> None:
+        if not request.url.startswith(("http://", "https://")):
+            return
+        try:
+            response = await request.response()
+            sizes = await request.sizes()
+        except Exception:  # noqa: BLE001  (page closed mid-request)
+            return
+        if response is None:
+            return
+        entries.append(resource_entry(
+            request.url, request.resource_type, response.status, response.headers, sizes.get("responseBodySize", 0)
+        ))
+
+    page.on("requestfinished", _finished)
+    return entries
+
+
+def _is_main_frame_navigation(request: Any) -> bool:
+    try:
+        return request.is_navigation_request() and request.frame.parent_frame is None
+    except Exception:  # noqa: BLE001  (service worker requests have no frame)
+        return False
+
+
+async def _block_resources(context: Any, block_fonts: bool) -> Dict[str, Any]:
+    """Route the context's requests through the fast-profile blocklist; returns live stats."""
+    stats: Dict[str, Any] = {"profile": "fast", "blocked": 0, "by_reason": {}, "est_bytes_saved": 0}
+
+    async def _route(route: Any) -> None:
+        request = route.request
+        reason = blocking_reason(request.url, request.resource_type, block_fonts, main_frame=_is_main_frame_navigation(request))
+        if reason is None:
+            await route.continue_()
+            return
+        stats["blocked"] += 1
+        stats["by_reason"][reason] = stats["by_reason"].get(reason, 0) + 1
+        stats["est_bytes_saved"] += TYPICAL_BYTES.get(request.resource_type, TYPICAL_BYTES["other"])
+        AUDIT_BLOCKED_REQUESTS.inc(reason=reason)
+        await route.abort("blockedbyclient")
+
+    await context.route("**/*", _route)
+    return stats
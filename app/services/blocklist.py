@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import logging
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional
+from urllib.parse import urlsplit
+
+
+logger = logging.getLogger("ych.audit.blocklist")
+
+
+# Analytics, tag managers, ad networks, session replay and chat widgets. None of them
+# change the DOM or copy an audit extracts, but they keep the network busy for seconds.
+# Extend with AUDIT_BLOCKLIST_FILE (one domain per line, `#` comments).
+TRACKER_DOMAINS: FrozenSet[str] = frozenset({
+    # analytics / tag managers
+    "google-analytics.com", "googletagmanager.com", "googletagservices.com", "analytics.google.com",
+    "segment.com", "segment.io", "cdn.segment.com", "mixpanel.com", "amplitude.com", "heap.io",
+    "heapanalytics.com", "plausible.io", "matomo.cloud", "statcounter.com", "quantserve.com",
+    "scorecardresearch.com", "chartbeat.com", "newrelic.com", "nr-data.net", "clarity.ms",
+    "bat.bing.com", "snap.licdn.com", "px.ads.linkedin.com", "analytics.tiktok.com",
+    "static.ads-twitter.com", "connect.facebook.net", "facebook.com/tr",
+    # ads
+    "doubleclick.net", "googlesyndication.com", "adservice.google.com", "adnxs.com", "criteo.com",
+    "criteo.net", "taboola.com", "outbrain.com", "amazon-adsystem.com", "adsrvr.org", "rubiconproject.com",
+    # session replay / experimentation
+    "hotjar.com", "hotjar.io", "fullstory.com", "mouseflow.com", "crazyegg.com", "optimizely.com",
+    "luckyorange.com", "smartlook.com", "logrocket.com", "logrocket.io",
+    # chat and support widgets
+    "intercom.io", "intercomcdn.com", "widget.intercom.io", "drift.com", "driftt.com",
+    "js.driftt.com", "zdassets.com", "zopim.com", "tawk.to", "crisp.chat", "livechatinc.com",
+    "hubspot.com", "hs-scripts.com", "hs-analytics.net", "hsadspixel.net",
+})
+
+# Resource types blocked in the fast profile regardless of host
+BLOCKED_TYPES = {"media": "media", "eventsource": "streaming"}
+
+# Typical transfer sizes (bytes) per blocked resource type, to estimate bytes saved:
+# aborted requests never report a size of their own
+TYPICAL_BYTES: Dict[str, int] = {
+    "media": 1_500_000,
+    "font": 40_000,
+    "script": 30_000,
+    "image": 20_000,
+    # Blocked iframes; their own subresources are never requested either
+    "document": 20_000,
+    "xhr": 2_000,
+    "fetch": 2_000,
+    "eventsource": 2_000,
+    "other": 1_000,
+}
+
+
+@lru_cache(maxsize=1)
+def tracker_domains() -> FrozenSet[str]:
+    extra_path = os.getenv("AUDIT_BLOCKLIST_FILE")
+    if not extra_path:
+        return TRACKER_DOMAINS
+    try:
+        lines = Path(extra_path).read_text(encoding="utf-8").splitlines()
+    except OSError as exc:
+        logger.warning("blocklist.load_failed | path=%s | err=%s", extra_path, exc)
+        return TRACKER_DOMAINS
+    extra = {line.split("#", 1)[0].strip().lower() for line in lines}
+    return TRACKER_DOMAINS | {d for d in extra if d}
+
+
+def _is_tracker(url: str) -> bool:
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    domains = tracker_domains()
+    labels = host.split(".")
+    for i in range(len(labels) - 1):
+        if ".".join(labels[i:]) in domains:
+            return True
+    # Path-scoped entries such as "facebook.com/tr" match host + path prefix
+    host_path = f"{host}{parts.path}"
+    return any("/" in d and (host_path.startswith(d) or host_path.startswith(f"www.{d}")) for d in domains)
+
+
+def blocking_reason(
+    url: str, resource_type: str, block_fonts: bool = False, main_frame: bool = False
+) -> Optional[str]:
+    """Why the fast profile blocks this request (tracker, media, streaming, font), or None.
+
+    Only the main-frame navigation (`main_frame`) is exempt: tracker, ad and chat-widget
+    iframes are `document` requests too.
+    """
+    if main_frame:
+        return None
+    if resource_type in BLOCKED_TYPES:
+        return BLOCKED_TYPES[resource_type]
+    if block_fonts and resource_type == "font":
+        return "font"
+    if _is_tracker(url):
+        return "tracker"
+    return None
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import hashlib
 import logging
-from typing import Any, Dict, Optional
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.utils.manifest import changed_paths, content_hash, diff_manifest, load_manifest, save_manifest
+from app.utils.storage import BASE_RUNTIME
 
 
 logger = logging.getLogger("ych.devserver")
@@ -77,11 +83,68 @@ def connect_dev_server(api_key: str, repo_id: str) -> Dict[str, Any]:
     }
 
 
+def open_dev_server(out_dir: str) -> Dict[str, Any]:
+    """Return a Dev Server handle for the backend selected by DEVSERVER_BACKEND.
+
+    - ``freestyle`` (default): connect to FREESTYLE_REPO_ID, or provision from the template.
+    - ``local``: a working directory under LOCAL_DEVSERVER_DIR (default ``<out_dir>/workspace``)
+      seeded from LOCAL_DEVSERVER_TEMPLATE (a directory or git URL).
+    """
+    backend = os.getenv("DEVSERVER_BACKEND", "freestyle").lower()
+    if backend == "local":
+        from app.services.local_devserver import provision_local_dev_server
+
+        work_dir = os.getenv("LOCAL_DEVSERVER_DIR") or str(Path(out_dir) / "workspace")
+        return provision_local_dev_server(work_dir)
+    if backend != "freestyle":
+        raise RuntimeError(f"Unknown DEVSERVER_BACKEND={backend}; expected freestyle or local")
+
+    api_key = os.getenv("FREESTYLE_API_KEY")
+    if not api_key:
+        raise RuntimeError("FREESTYLE_API_KEY not set in environment")
+
+    # If a repo id is provided in env, connect; otherwise, provision from template
+    repo_id = os.getenv("FREESTYLE_REPO_ID")
+    return connect_dev_server(api_key, repo_id) if repo_id else provision_dev_server(api_key)
+
+
 def write_next_homepage(fs: Any, page_tsx: str) -> None:
     """Write the Next.js homepage into the template repo using Dev Server FS."""
     fs.write_file("app/page.tsx", page_tsx)
 
 
+def push_manifest_path(ds: Dict[str, Any]) -> Path:
+    """Location of the manifest of file hashes last pushed to this Dev Server's repo."""
+    key = hashlib.sha1(str(ds.get("repo_id")).encode("utf-8")).hexdigest()[:16]
+    return BASE_RUNTIME / "manifests" / f"{key}.json"
+
+
+def push_files(ds: Dict[str, Any], files: Dict[str, str], message: str) -> Dict[str, List[str]]:
+    """Write files that changed since the last push to the Dev Server and commit them once.
+
+    Unchanged files (by content hash against the repo's push manifest) are skipped, and
+    nothing is committed when no file changed. Returns the manifest diff.
+    """
+    manifest_path = push_manifest_path(ds)
+    old = load_manifest(manifest_path)
+    new = {path: content_hash(content) for path, content in files.items()}
+    diff = diff_manifest({p: h for p, h in old.items() if p in new}, new)
+    changed = changed_paths(diff)
+    for path in changed:
+        ds["fs"].write_file(path, files[path])
+    logger.info("devserver.files.written | count=%s | skipped=%s", len(changed), len(diff["unchanged"]))
+    if changed:
+        ds["commit_and_push"](message)
+        logger.info("devserver.pushed | msg=%s", message)
+        save_manifest(manifest_path, {**old, **new})
+    return diff
+
+
+def forget_pushed_files(ds: Dict[str, Any]) -> None:
+    """Drop the push manifest, e.g. after an agent edited the repo directly."""
+    push_manifest_path(ds).unlink(missing_ok=True)
+
+
 def verify_next_build(process: Any) -> Dict[str, str]:
     """Run npm install and npm run build to ensure code compiles."""
     try:
@@ -94,5 +157,3 @@ def verify_next_build(process: Any) -> Dict[str, str]:
     result_build = process.exec("npm run build")
     logger.info("devserver.npm_build | ok")
     return {"install": str(result_install), "build": str(result_build)}
-
-
@@ -7,6 +7,8 @@ from typing import List, Optional
 
 import dspy  # type: ignore
 
+from app.utils.tracing import traced
+
 from app.models.agents import (
     ContentHierarchy,
     ContentNode,
@@ -179,23 +181,28 @@ class StyleCoT(dspy.Module):  # type: ignore
         return StyleSystem(**data)
 
 
+@traced("dspy.extract_hierarchy")
 def agent_extract_hierarchy(dom_html_path: str, url: Optional[str] = None) -> ContentHierarchy:
     dom_html = Path(dom_html_path).read_text(encoding="utf-8") if dom_html_path else ""
     return ExtractHierarchyCoT()(dom_html=dom_html, url=url)
 
 
+@traced("dspy.copywriter")
 def agent_copywriter(hierarchy: ContentHierarchy, tone: str = "professional") -> CopyPlan:
     return CopywriterCoT()(hierarchy=hierarchy, tone=tone)
 
 
+@traced("dspy.style_system")
 def agent_style_system(criteria: Optional[List[EvaluationCriterion]] = None) -> StyleSystem:
     return StyleCoT()(criteria=criteria)
 
 
+@traced("dspy.content_improver")
 def agent_content_improver(content_text: str, tone: str = "professional") -> CopyPlan:
     return ContentImproverCoT()(content_text=content_text, tone=tone)
 
 
+@traced("dspy.generate_next_page")
 def agent_generate_next_page(style_guide: str, copy_plan: CopyPlan, style: StyleSystem) -> str:
     return NextPageGeneratorCoT()(style_guide=style_guide, copy_plan=copy_plan, style=style)
 
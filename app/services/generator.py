@@ -4,13 +4,14 @@ import json
 import os
 from pathlib import Path
 import logging
-from typing import Any, Dict
-import shutil
+from typing import Any, Dict, List
 
 from app.services.analysis import synthesize_suggestions
 from app.models.agents import CopyPlan, StyleSystem
 from app.services.style_guide import STYLE_GUIDE
 from app.services.dspy_agents import agent_generate_next_page
+from app.utils.manifest import changed_paths, sync_files
+from app.utils.storage import storage
 
 logger = logging.getLogger("ych.generator")
 
@@ -35,26 +36,29 @@ def generate_nextjs_project(
         tokens.update(style.design_tokens)
 
     project_dir = Path(out_dir) / "next_project"
-    project_dir.mkdir(parents=True, exist_ok=True)
 
-    _write_package_json(project_dir)
-    _write_next_config(project_dir)
-    _write_tsconfig(project_dir)
-    _write_tailwind_config(project_dir)
-    _write_postcss_config(project_dir)
-    _write_src(project_dir, tokens, analysis, copy_plan)
-
-    zip_path = shutil.make_archive(str(Path(out_dir) / "next_project"), "zip", project_dir)
-
-    logger.info("gen.done | project_dir=%s", str(project_dir))
+    # Render everything in memory, then write only files whose content hash changed
+    files: Dict[str, str] = {}
+    _write_package_json(files)
+    _write_next_config(files)
+    _write_tsconfig(files)
+    _write_tailwind_config(files)
+    _write_postcss_config(files)
+    _write_src(files, tokens, analysis, copy_plan)
+    diff = sync_files(project_dir, files)
+    storage.set_latest_project(str(project_dir))
+
+    # The zip is built on demand from project_dir (GET /generate/{id}/archive)
+    logger.info("gen.done | project_dir=%s | changed=%s", str(project_dir), len(changed_paths(diff)))
     return {
-        "zip_path": zip_path,
         "project_dir": str(project_dir),
         "analysis": analysis,
+        "manifest_diff": diff,
+        "changed": bool(changed_paths(diff) or diff["removed"]),
     }
 
 
-def _write_package_json(root: Path) -> None:
+def _write_package_json(files: Dict[str, str]) -> None:
     pkg = {
         "name": "ych-generated",
         "private": True,
@@ -76,18 +80,18 @@ def _write_package_json(root: Path) -> None:
             "typescript": "^5.4.5"
         }
     }
-    (root / "package.json").write_text(json.dumps(pkg, indent=2))
+    files["package.json"] = json.dumps(pkg, indent=2)
 
 
-def _write_next_config(root: Path) -> None:
+def _write_next_config(files: Dict[str, str]) -> None:
     content = """/** @type {import('next').NextConfig} */
 const nextConfig = {};
 module.exports = nextConfig;
 """
-    (root / "next.config.js").write_text(content)
+    files["next.config.js"] = content
 
 
-def _write_tsconfig(root: Path) -> None:
+def _write_tsconfig(files: Dict[str, str]) -> None:
     content = {
         "compilerOptions": {
             "target": "ES2020",
@@ -107,10 +111,10 @@ def _write_tsconfig(root: Path) -> None:
         "include": ["next-env.d.ts", "**/*.ts", "**/*.tsx"],
         "exclude": ["node_modules"]
     }
-    (root / "tsconfig.json").write_text(json.dumps(content, indent=2))
+    files["tsconfig.json"] = json.dumps(content, indent=2)
 
 
-def _write_tailwind_config(root: Path) -> None:
+def _write_tailwind_config(files: Dict[str, str]) -> None:
     content = """/** @type {import('tailwindcss').Config} */
 module.exports = {
   content: [
@@ -123,10 +127,10 @@ module.exports = {
   plugins: [],
 };
 """
-    (root / "tailwind.config.js").write_text(content)
+    files["tailwind.config.js"] = content
 
 
-def _write_postcss_config(root: Path) -> None:
+def _write_postcss_config(files: Dict[str, str]) -> None:
     content = """module.exports = {
   plugins: {
     tailwindcss: {},
@@ -134,18 +138,11 @@ def _write_postcss_config(root: Path) -> None:
   },
 };
 """
-    (root / "postcss.config.js").write_text(content)
-
+    files["postcss.config.js"] = content
 
-def _write_src(root: Path, tokens: Dict[str, Any], analysis: Dict[str, Any], copy_plan: CopyPlan | None) -> None:
-    app_dir = root / "app"
-    (app_dir).mkdir(parents=True, exist_ok=True)
-    components_dir = root / "components"
-    components_dir.mkdir(parents=True, exist_ok=True)
-    styles_dir = root / "styles"
-    styles_dir.mkdir(parents=True, exist_ok=True)
 
-    (root / "next-env.d.ts").write_text(
+def _write_src(files: Dict[str, str], tokens: Dict[str, Any], analysis: Dict[str, Any], copy_plan: CopyPlan | None) -> None:
+    files["next-env.d.ts"] = (
         "/// <reference types=\"next\" />\n/// <reference types=\"next/image-types/global\" />\n"
     )
 
@@ -163,9 +160,9 @@ def _write_src(root: Path, tokens: Dict[str, Any], analysis: Dict[str, Any], cop
         "body{font-family: var(--font-sans);}\n"
         "@tailwind base;\n@tailwind components;\n@tailwind utilities;\n"
     )
-    (styles_dir / "globals.css").write_text(globals_css)
+    files["styles/globals.css"] = globals_css
 
-    (app_dir / "layout.tsx").write_text(
+    files["app/layout.tsx"] = (
         """import '../styles/globals.css';
 
 export const metadata = { title: 'Generated Site' };
@@ -187,7 +184,7 @@ export default function RootLayout({ children }: { children: React.ReactNode })
             synthesized_page = None
 
     if synthesized_page:
-        (app_dir / "page.tsx").write_text(synthesized_page)
+        files["app/page.tsx"] = synthesized_page
         # Still write Hero component for potential imports
     
     # Apply improved copy to hero if available (fallback/default homepage if no synthesis)
@@ -204,7 +201,7 @@ export default function RootLayout({ children }: { children: React.ReactNode })
 export default function Hero() {{
   return (
     <section className=\"py-16 bg-[var(--color-primary)] text-white\">\n      <div className=\"mx-auto max-w-6xl px-6\">\n        <h1 className=\"text-4xl font-bold mb-4\">{hero_title}</h1>\n        <p className=\"text-lg\">{hero_subtitle}</p>\n      </div>\n    </section>\n  );\n}}\n"""
-    (components_dir / "Hero.tsx").write_text(hero)
+    files["components/Hero.tsx"] = hero
 
     # Feature cards with optional copy override from CopyPlan
     feature1 = "Fast, accessible, and responsive by default."
@@ -228,7 +225,186 @@ export default function Page() {{
 }}
 """
     if not synthesized_page:
-        (app_dir / "page.tsx").write_text(homepage)
+        files["app/page.tsx"] = homepage
 
     # Include analysis JSON for reference
-    (root / "analysis.json").write_text(json.dumps(analysis, indent=2))
+    files["analysis.json"] = json.dumps(analysis, indent=2)
+
+
+_FALLBACK_FEATURES = [
+    "Fast, accessible, and responsive by default.",
+    "Clear visual hierarchy with Tailwind.",
+    "Easy to extend with components.",
+]
+
+
+def _split_heading(text: str) -> tuple[str, str]:
+    """Split improved copy into a short heading and body (first line / remainder)."""
+    lines = [ln.strip(" #*") for ln in (text or "").strip().splitlines() if ln.strip()]
+    if not lines:
+        return "", ""
+    if len(lines) == 1:
+        return lines[0], ""
+    return lines[0], " ".join(lines[1:])
+
+
+def build_site_content(copy_plan: CopyPlan | None, brand: str | None = None) -> Dict[str, Any]:
+    """Map CopyPlan blocks onto the template component props by block path."""
+    hero: List[str] = []
+    features: List[Dict[str, str]] = []
+    cta: List[str] = []
+    footer: List[str] = []
+    nav: List[str] = []
+    for blk in (copy_plan.blocks if copy_plan is not None else []):
+        text = (blk.improved_text or blk.original_text or "").strip()
+        if not text:
+            continue
+        key = blk.path.lower()
+        if "hero" in key or "headline" in key:
+            hero.append(text)
+        elif "cta" in key or "call-to-action" in key or "contact" in key:
+            cta.append(text)
+        elif "footer" in key:
+            footer.append(text)
+        elif "nav" in key or "header" in key:
+            nav.append(text)
+        else:
+            title, body = _split_heading(text)
+            features.append({"title": title, "body": body})
+
+    hero_title, hero_body = _split_heading(hero[0]) if hero else ("A Better UX", "")
+    if not hero_body:
+        hero_body = hero[1] if len(hero) > 1 else (
+            copy_plan.summary if copy_plan is not None else "Generated from your audit with sensible defaults."
+        )
+    if not features:
+        features = [{"title": "", "body": f} for f in _FALLBACK_FEATURES]
+    cta_title, cta_body = _split_heading(cta[0]) if cta else ("Ready to get started?", "")
+
+    return {
+        "brand": brand or (_split_heading(nav[0])[0] if nav else "Home"),
+        "links": [
+            {"label": "Features", "href": "#features"},
+            {"label": "Contact", "href": "#contact"},
+        ],
+        "hero": {"title": hero_title, "body": hero_body, "cta": {"label": "Get Started", "href": "#contact"}},
+        "features": features[:6],
+        "cta": {"title": cta_title, "body": cta_body, "label": "Contact Us", "href": "#contact"},
+        "footer": footer[0] if footer else "",
+    }
+
+
+_COMPONENT_TEMPLATES: Dict[str, str] = {
+    "Navbar": """type Link = { label: string; href: string };
+
+export default function Navbar({ brand, links }: { brand: string; links: Link[] }) {
+  return (
+    <header className="w-full border-b bg-white">
+      <nav className="mx-auto flex max-w-6xl items-center justify-between px-6 py-4">
+        <a href="/" className="text-lg font-semibold">{brand}</a>
+        <ul className="flex gap-6 text-sm">
+          {links.map((l) => (
+            <li key={l.href}><a href={l.href} className="hover:underline">{l.label}</a></li>
+          ))}
+        </ul>
+      </nav>
+    </header>
+  );
+}
+""",
+    "Hero": """type Cta = { label: string; href: string };
+
+export default function Hero({ title, body, cta, color }: { title: string; body: string; cta: Cta; color: string }) {
+  return (
+    <section className="py-20 text-white" style={{ backgroundColor: color }}>
+      <div className="mx-auto max-w-6xl px-6">
+        <h1 className="mb-4 text-4xl font-bold md:text-5xl">{title}</h1>
+        <p className="mb-8 max-w-2xl text-lg">{body}</p>
+        <a href={cta.href} className="inline-block rounded-md bg-white px-6 py-3 font-semibold" style={{ color }}>{cta.label}</a>
+      </div>
+    </section>
+  );
+}
+""",
+    "FeatureGrid": """type Feature = { title: string; body: string };
+
+export default function FeatureGrid({ features }: { features: Feature[] }) {
+  return (
+    <section id="features" className="mx-auto grid max-w-6xl gap-6 px-6 py-16 md:grid-cols-3">
+      {features.map((f, i) => (
+        <div key={i} className="rounded-lg border p-6">
+          {f.title ? <h2 className="mb-2 text-xl font-semibold">{f.title}</h2> : null}
+          {f.body ? <p className="text-gray-700">{f.body}</p> : null}
+        </div>
+      ))}
+    </section>
+  );
+}
+""",
+    "CTASection": """export default function CTASection({ title, body, label, href, color }: { title: string; body: string; label: string; href: string; color: string }) {
+  return (
+    <section id="contact" className="py-16" style={{ backgroundColor: color }}>
+      <div className="mx-auto max-w-6xl px-6 text-center text-white">
+        <h2 className="mb-3 text-3xl font-bold">{title}</h2>
+        {body ? <p className="mb-6 text-lg">{body}</p> : null}
+        <a href={href} className="inline-block rounded-md bg-white px-6 py-3 font-semibold text-gray-900">{label}</a>
+      </div>
+    </section>
+  );
+}
+""",
+    "Footer": """export default function Footer({ brand, text }: { brand: string; text: string }) {
+  return (
+    <footer className="border-t py-8 text-sm text-gray-600">
+      <div className="mx-auto max-w-6xl px-6">
+        {text ? <p className="mb-2">{text}</p> : null}
+        <p>&copy; {new Date().getFullYear()} {brand}</p>
+      </div>
+    </footer>
+  );
+}
+""",
+}
+
+# Page order and the JSX used to mount each component from the `content` constant
+_COMPONENT_USAGE: Dict[str, str] = {
+    "Navbar": "<Navbar brand={content.brand} links={content.links} />",
+    "Hero": "<Hero {...content.hero} color={content.colors.primary} />",
+    "FeatureGrid": "<FeatureGrid features={content.features} />",
+    "CTASection": "<CTASection {...content.cta} color={content.colors.secondary} />",
+    "Footer": "<Footer brand={content.brand} text={content.footer} />",
+}
+
+
+def render_template_site(copy_plan: CopyPlan | None, style: StyleSystem, brand: str | None = None) -> Dict[str, str]:
+    """Render a deterministic homepage from the template component library.
+
+    Uses only the copy plan and design tokens (no LM calls). Returns a mapping of
+    repo-relative path -> file content for `app/page.tsx` and `components/*.tsx`.
+    """
+    content = build_site_content(copy_plan, brand=brand)
+    content["colors"] = {
+        "primary": style.design_tokens.get("color_primary", "#0ea5e9"),
+        "secondary": style.design_tokens.get("color_secondary", "#111827"),
+    }
+    used = [name for name in _COMPONENT_USAGE if name in style.components]
+    if "Hero" not in used:
+        used.insert(0, "Hero")
+
+    files: Dict[str, str] = {f"components/{name}.tsx": _COMPONENT_TEMPLATES[name] for name in used}
+    imports = "\n".join(f"import {name} from '../components/{name}';" for name in used)
+    body = "\n".join(f"      {_COMPONENT_USAGE[name]}" for name in used)
+    # JSON is valid JS, so copy text is embedded without any JSX escaping concerns
+    files["app/page.tsx"] = (
+        f"{imports}\n\n"
+        f"const content = {json.dumps(content, indent=2, ensure_ascii=False)};\n\n"
+        "export default function Page() {\n"
+        "  return (\n"
+        "    <main>\n"
+        f"{body}\n"
+        "    </main>\n"
+        "  );\n"
+        "}\n"
+    )
+    logger.info("gen.template | components=%s | files=%s", ",".join(used), len(files))
+    return files
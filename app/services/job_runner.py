@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from app.utils.cancellation import DeadlineExceeded, JobCancelled, cancellations, job_scope
+from app.utils.dspy_config import ensure_configured as ensure_dspy_configured
+from app.utils.jobs import batch_limits_from_env, jobs
+from app.utils.storage import create_job_dir, storage
+from app.utils.tracing import SpanContext, span
+
+
+logger = logging.getLogger("ych.jobs.runner")
+
+
+def _log_dropped(kind: str, job_id: str, outcome: str) -> None:
+    """The job left `running` while it ran (reaped by the supervisor, or cancelled)."""
+    status = (jobs.get_job(kind, job_id) or {}).get("status")
+    logger.warning("[%s:%s] %s dropped | job already %s", kind, job_id, outcome, status)
+
+
+def run_audit_job(audit_id: str, payload: Dict[str, Any]) -> None:
+    """Run a queued audit and record its outcome in the job store.
+
+    payload: {"url": str, "options": dict, "deadlines": dict | None}
+    """
+    jobs.start_job("audit", audit_id)
+    try:
+        # Imported on first use: pulls in playwright
+        from app.services.audit import perform_audit
+
+        out_dir = create_job_dir("audit", audit_id)
+        logger.info("[audit:%s] started | out_dir=%s", audit_id, out_dir)
+        result = perform_audit(
+            payload["url"],
+            payload.get("options") or {},
+            out_dir,
+            progress=lambda partial, phases: jobs.update_progress("audit", audit_id, partial, phases),
+        )
+        if not jobs.complete_job("audit", audit_id, result):
+            _log_dropped("audit", audit_id, "result")
+        storage.refresh("audit", audit_id)
+        logger.info("[audit:%s] completed | screenshots=%s", audit_id, len(result.get("artifacts", {}).get("screenshots", [])))
+    except Exception as exc:  # noqa: BLE001
+        if not jobs.fail_job("audit", audit_id, {
+            "error": str(exc),
+            "traceback": traceback.format_exc(),
+        }):
+            _log_dropped("audit", audit_id, "error")
+        logger.exception("[audit:%s] failed: %s", audit_id, exc)
+
+
+def run_generate_job(gen_id: str, payload: Dict[str, Any]) -> None:
+    """Run a queued generation and record its outcome in the job store.
+
+    payload: {"audit_id": str | None, "content": str | None, "tone": str, "mode": str, "deadlines": dict | None}
+    """
+    jobs.start_job("generate", gen_id)
+    try:
+        # Imported on first use: pulls in dspy and the dev server SDKs
+        from app.services.pipeline import run_full_generation
+
+        ensure_dspy_configured()
+        audit_result: Dict[str, Any] = {}
+        if payload.get("audit_id"):
+            audit_job = jobs.get_job("audit", payload["audit_id"]) or {}
+            audit_result = audit_job.get("result") or {}
+        out_dir = create_job_dir("generate", gen_id)
+        logger.info("[generate:%s] started | out_dir=%s", gen_id, out_dir)
+        result = run_full_generation(
+            audit_results=audit_result,
+            out_dir=out_dir,
+            tone=payload.get("tone") or "professional",
+            criteria=None,
+            content=payload.get("content"),
+            mode=payload.get("mode", "agentic"),
+        )
+        if not jobs.complete_job("generate", gen_id, result):
+            _log_dropped("generate", gen_id, "result")
+        storage.refresh("generate", gen_id)
+        if result.get("project_dir"):
+            storage.set_latest_project(result["project_dir"])
+        dev = result.get("dev_server", {})
+        logger.info("[generate:%s] completed | dev_url=%s", gen_id, dev.get("ephemeral_url"))
+    except Exception as exc:  # noqa: BLE001
+        if not jobs.fail_job("generate", gen_id, {
+            "error": str(exc),
+            "traceback": traceback.format_exc(),
+        }):
+            _log_dropped("generate", gen_id, "error")
+        logger.exception("[generate:%s] failed: %s", gen_id, exc)
+
+
+RUNNERS: Dict[str, Callable[[str, Dict[str, Any]], None]] = {
+    "audit": run_audit_job,
+    "generate": run_generate_job,
+}
+
+
+def run_job(kind: str, job_id: str, payload: Dict[str, Any], parent: Optional[SpanContext] = None) -> None:
+    """Run one job under a `job.<kind>` span parented to the request that enqueued it.
+
+    The job runs under a cancel token (see app.utils.cancellation) reachable through
+    `cancellations.cancel(kind, job_id, ...)`; its `deadlines` come from the payload.
+    """
+    # Registered before the checks below so a DELETE racing with the start still reaches the job;
+    # one that landed after the claim but before registering only left `cancel_requested`
+    token = cancellations.register(kind, job_id, payload.get("deadlines"))
+    job = jobs.get_job(kind, job_id)
+    cancelled = job is not None and job.get("status") == "cancelled"
+    if not cancelled and jobs.is_cancel_requested(kind, job_id):
+        jobs.cancel_job(kind, job_id, "cancelled by client")
+        cancelled = True
+    if cancelled:
+        cancellations.release(kind, job_id)
+        token.close()
+        logger.info("[%s:%s] skipped | cancelled before start", kind, job_id)
+        return
+    try:
+        with span(f"job.{kind}", parent=parent, job_id=job_id), job_scope(token):
+            RUNNERS[kind](job_id, payload)
+    except DeadlineExceeded as exc:
+        if not jobs.fail_job(kind, job_id, {"error": f"deadline exceeded: {exc}", "deadline_exceeded": True}):
+            _log_dropped(kind, job_id, "deadline error")
+        logger.warning("[%s:%s] deadline exceeded | %s", kind, job_id, exc)
+    except JobCancelled as exc:
+        if not jobs.cancel_job(kind, job_id, str(exc) or "cancelled"):
+            _log_dropped(kind, job_id, "cancellation")
+        logger.info("[%s:%s] cancelled | %s", kind, job_id, exc)
+    finally:
+        cancellations.release(kind, job_id)
+
+
+class _Dispatcher:
+    """Runs queued jobs on a fixed number of threads per kind when the queue is in-process.
+
+    Slots pick jobs through `jobs.claim`, so priority classes and per-tenant fair sharing
+    apply the same way as for `python -m app.worker`. Unless JOB_BATCH_MAX_RUNNING_<KIND>
+    says otherwise, one slot per kind is kept free of batch jobs.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._wake = {kind: threading.Condition() for kind in RUNNERS}
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+
+    def _slots(self) -> Dict[str, int]:
+        return {
+            "audit": int(os.getenv("JOB_AUDIT_CONCURRENCY", "2")),
+            "generate": int(os.getenv("JOB_GENERATE_CONCURRENCY", "4")),
+        }
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._stopping = False
+            for kind, count in self._slots().items():
+                limits = batch_limits_from_env([kind], default=max(count - 1, 1))
+                for index in range(count):
+                    thread = threading.Thread(
+                        target=self._run_slot, args=(kind, index, limits), name=f"ych-jobs-{kind}-{index}", daemon=True
+                    )
+                    thread.start()
+                    self._threads.append(thread)
+            logger.info("dispatcher.started | slots=%s", self._slots())
+
+    def notify(self, kind: str) -> None:
+        self.start()
+        with self._wake[kind]:
+            self._wake[kind].notify()
+
+    def stop(self) -> None:
+        """Stop claiming new jobs; running jobs finish on their (daemon) threads."""
+        with self._lock:
+            self._stopping = True
+            self._threads = []
+        for cond in self._wake.values():
+            with cond:
+                cond.notify_all()
+
+    def _run_slot(self, kind: str, index: int, limits: Dict[str, Optional[int]]) -> None:
+        worker = f"in-process:{kind}:{index}"
+        wake = self._wake[kind]
+        while not self._stopping:
+            # Claiming under the condition means a notify cannot slip in before wait()
+            with wake:
+                job = jobs.claim([kind], worker, limits)
+                if job is None:
+                    wake.wait(1.0)
+                    continue
+            parent = SpanContext(job["trace_id"], job["parent_span_id"]) if job["trace_id"] else None
+            try:
+                run_job(kind, job["id"], job["payload"], parent)
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("dispatcher.slot_error | %s:%s | err=%s", kind, job["id"], exc)
+
+
+dispatcher = _Dispatcher()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import logging
+import math
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger("ych.audit.lab")
+
+
+# Installed before navigation: buffers paint, LCP, layout-shift and long-task entries
+# that are not all retrievable after the fact
+LAB_INIT_JS = """
+(() => {
+  const lab = window.__ychLab = {fcp: null, lcp: null, cls: 0, longTasks: []};
+  let session = 0, sessionStart = 0, sessionLast = 0;
+  const observe = (type, cb) => {
+    try { new PerformanceObserver((list) => list.getEntries().forEach(cb)).observe({type, buffered: true}); } catch (e) {}
+  };
+  observe('paint', (e) => { if (e.name === 'first-contentful-paint') lab.fcp = e.startTime; });
+  observe('largest-contentful-paint', (e) => { lab.lcp = e.renderTime || e.loadTime || e.startTime; });
+  // CLS: largest session window (shifts < 1 s apart, window <= 5 s)
+  observe('layout-shift', (e) => {
+    if (e.hadRecentInput) return;
+    if (session && e.startTime - sessionLast < 1000 && e.startTime - sessionStart < 5000) {
+      session += e.value;
+    } else {
+      session = e.value;
+      sessionStart = e.startTime;
+    }
+    sessionLast = e.startTime;
+    lab.cls = Math.max(lab.cls, session);
+  });
+  observe('longtask', (e) => { lab.longTasks.push([e.startTime, e.duration]); });
+})();
+"""
+
+# Read once the page is ready: navigation timing, buffered vitals and transfer sizes
+LAB_COLLECT_JS = """
+() => {
+  const lab = window.__ychLab || {fcp: null, lcp: null, cls: null, longTasks: []};
+  const nav = performance.getEntriesByType('navigation')[0];
+  const fcp = lab.fcp;
+  // TBT: blocking part (> 50 ms) of long tasks after FCP
+  const tbt = lab.longTasks
+    .filter(([start]) => fcp === null || start >= fcp)
+    .reduce((sum, [, duration]) => sum + Math.max(duration - 50, 0), 0);
+  const bytes = {};
+  let requests = 0;
+  for (const r of performance.getEntriesByType('resource')) {
+    requests += 1;
+    bytes[r.initiatorType] = (bytes[r.initiatorType] || 0) + (r.transferSize || 0);
+  }
+  if (nav) bytes.document = nav.transferSize || 0;
+  const round = (v) => (v === null || v === undefined ? null : Math.round(v));
+  return {
+    ttfb_ms: nav ? round(nav.responseStart) : null,
+    dom_content_loaded_ms: nav ? round(nav.domContentLoadedEventEnd) : null,
+    load_ms: nav && nav.loadEventEnd ? round(nav.loadEventEnd) : null,
+    fcp_ms: round(fcp),
+    lcp_ms: round(lab.lcp),
+    cls: lab.cls === null ? null : Math.round(lab.cls * 1000) / 1000,
+    tbt_ms: round(tbt),
+    long_tasks: lab.longTasks.length,
+    requests: requests + (nav ? 1 : 0),
+    transfer_bytes: Object.values(bytes).reduce((a, b) => a + b, 0),
+    transfer_bytes_by_type: bytes,
+  };
+}
+"""
+
+# Lighthouse v10 scoring curves (p10, median) and weights. Speed Index needs a filmstrip,
+# so its weight is spread over the other metrics.
+CURVES: Dict[str, Dict[str, tuple]] = {
+    "mobile": {"fcp_ms": (1800, 3000), "lcp_ms": (2500, 4000), "tbt_ms": (200, 600), "cls": (0.1, 0.25)},
+    "desktop": {"fcp_ms": (934, 1600), "lcp_ms": (1200, 2400), "tbt_ms": (150, 350), "cls": (0.1, 0.25)},
+}
+WEIGHTS = {"fcp_ms": 10, "lcp_ms": 25, "tbt_ms": 30, "cls": 25}
+
+_INVERSE_ERFC_ONE_FIFTH = 0.9061938024368232
+
+
+def metric_score(value: float, p10: float, median: float) -> float:
+    """Lighthouse's log-normal metric score: 0.9 at `p10`, 0.5 at `median`."""
+    if value <= 0:
+        return 1.0
+    standardized = math.log(value / median) * _INVERSE_ERFC_ONE_FIFTH / -math.log(p10 / median)
+    score = math.erfc(standardized) / 2
+    # Clamp so rounding never moves a value across the p10/median bands
+    if value <= p10:
+        return max(0.9, min(1.0, score))
+    if value <= median:
+        return max(0.5, min(0.8999999999999999, score))
+    return max(0.0, min(0.49999999999999994, score))
+
+
+def score_lab(metrics: Dict[str, Any], mobile: bool = True) -> Optional[int]:
+    """0-100 performance score from lab metrics; None when no metric was measured."""
+    curves = CURVES["mobile" if mobile else "desktop"]
+    total = weight = 0.0
+    for name, (p10, median) in curves.items():
+        value = metrics.get(name)
+        if value is None:
+            continue
+        total += metric_score(float(value), p10, median) * WEIGHTS[name]
+        weight += WEIGHTS[name]
+    if not weight:
+        return None
+    return int(round(total / weight * 100))
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import shutil
+import signal
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from app.utils.cancellation import bounded_timeout, check_cancelled, current_token
+from app.utils.storage import BASE_RUNTIME
+
+
+logger = logging.getLogger("ych.devserver.local")
+
+
+DEFAULT_NPM_CACHE = BASE_RUNTIME / "npm-cache"
+DEFAULT_EXEC_TIMEOUT = 900
+
+
+class LocalDevServerFilesystem:
+    """Filesystem operations on a local working directory (mirrors the Freestyle `fs` handle)."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def _resolve(self, path: str) -> Path:
+        target = (self.root / path.lstrip("/")).resolve()
+        if target != self.root and self.root not in target.parents:
+            raise ValueError(f"Path escapes working directory: {path}")
+        return target
+
+    def ls(self, path: str = "") -> List[str]:
+        target = self._resolve(path)
+        if not target.is_dir():
+            return []
+        return sorted(p.name for p in target.iterdir())
+
+    def read_file(self, path: str, encoding: str = "utf-8") -> str:
+        target = self._resolve(path)
+        if not target.is_file():
+            raise FileNotFoundError(f"File not found or not a file: {path}")
+        return target.read_text(encoding=encoding)
+
+    def write_file(self, path: str, content: Union[str, bytes], encoding: str = "utf-8") -> None:
+        target = self._resolve(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, bytes):
+            target.write_bytes(content)
+        else:
+            target.write_text(content, encoding=encoding)
+
+
+class LocalDevServerProcess:
+    """Run shell commands in the working directory (mirrors the Freestyle `process` handle)."""
+
+    def __init__(self, root: Path, npm_cache: Path, timeout: int = DEFAULT_EXEC_TIMEOUT) -> None:
+        self.root = root
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._background: Dict[str, subprocess.Popen] = {}
+        self.env = os.environ.copy()
+        # Shared cache across workspaces so repeat installs resolve from disk
+        self.env["npm_config_cache"] = str(npm_cache)
+        self.env["npm_config_prefer_offline"] = "true"
+        self.env.setdefault("NEXT_TELEMETRY_DISABLED", "1")
+
+    def exec(self, cmd: str, background: bool = False) -> Dict:
+        exec_id = str(next(self._ids))
+        if background:
+            proc = subprocess.Popen(
+                cmd, shell=True, cwd=str(self.root), env=self.env,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            self._background[exec_id] = proc
+            return {"id": exec_id, "isNew": True, "stdout": None, "stderr": None, "exitCode": None}
+        # Own process group so a cancel or timeout also stops npm's child processes
+        proc = subprocess.Popen(
+            cmd, shell=True, cwd=str(self.root), env=self.env,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, start_new_session=True,
+        )
+        token = current_token()
+        unregister = token.on_cancel(lambda: _kill_group(proc)) if token is not None else (lambda: None)
+        timeout = bounded_timeout(self.timeout)
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill_group(proc)
+            stdout, _ = proc.communicate()
+            check_cancelled()
+            return {
+                "id": exec_id,
+                "isNew": True,
+                "stdout": stdout or "",
+                "stderr": f"timed out after {timeout:g}s",
+                "exitCode": None,
+            }
+        finally:
+            unregister()
+        check_cancelled()
+        return {
+            "id": exec_id,
+            "isNew": True,
+            "stdout": stdout,
+            "stderr": stderr,
+            "exitCode": proc.returncode,
+        }
+
+    def shutdown(self) -> None:
+        for proc in self._background.values():
+            if proc.poll() is None:
+                proc.terminate()
+        self._background.clear()
+
+
+def _kill_group(proc: subprocess.Popen) -> None:
+    if proc.poll() is None:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def _git(root: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        ["git", "-c", "user.name=ych", "-c", "user.email=ych@localhost", *args],
+        cwd=str(root), capture_output=True, text=True,
+    )
+
+
+def _prepare_workspace(root: Path, template: Optional[str]) -> bool:
+    """Populate `root` from a local template directory or git URL; returns True if new."""
+    if (root / "package.json").exists():
+        return False
+    root.parent.mkdir(parents=True, exist_ok=True)
+    source = template or os.getenv("LOCAL_DEVSERVER_TEMPLATE")
+    if source and Path(source).is_dir():
+        shutil.copytree(
+            source, root, dirs_exist_ok=True,
+            ignore=shutil.ignore_patterns("node_modules", ".next", ".git"),
+        )
+        logger.info("devserver.local.copied | src=%s", source)
+    else:
+        from app.services.devserver import DEFAULT_TEMPLATE_REPO
+
+        url = source or DEFAULT_TEMPLATE_REPO
+        res = subprocess.run(
+            ["git", "clone", "--depth", "1", url, str(root)], capture_output=True, text=True,
+        )
+        if res.returncode != 0:
+            raise RuntimeError(f"git clone failed for {url}: {res.stderr.strip()}")
+        logger.info("devserver.local.cloned | url=%s", url)
+    if not (root / ".git").exists():
+        _git(root, "init", "-q")
+        _git(root, "add", "-A")
+        _git(root, "commit", "-q", "-m", "Initial template")
+    return True
+
+
+def provision_local_dev_server(
+    work_dir: str,
+    template: Optional[str] = None,
+    npm_cache_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Create (or reuse) a local working directory exposing the Dev Server handle interface.
+
+    Returns the same keys as `devserver.provision_dev_server`. `commit_and_push` commits to
+    the local git repository only; URLs are None since nothing is served remotely. The extra
+    `project_dir` key points at the working directory.
+    """
+    root = Path(work_dir).resolve()
+    is_new = _prepare_workspace(root, template)
+    npm_cache = Path(npm_cache_dir or os.getenv("NPM_CACHE_DIR") or DEFAULT_NPM_CACHE).resolve()
+    npm_cache.mkdir(parents=True, exist_ok=True)
+
+    fs = LocalDevServerFilesystem(root)
+    process = LocalDevServerProcess(root, npm_cache)
+
+    def commit_and_push(message: str) -> None:
+        _git(root, "add", "-A")
+        res = _git(root, "commit", "-q", "-m", message)
+        if res.returncode != 0 and "nothing to commit" not in (res.stdout + res.stderr):
+            raise RuntimeError(f"git commit failed: {res.stderr.strip()}")
+        logger.info("devserver.local.committed | root=%s | msg=%s", root, message)
+
+    def shutdown() -> Dict[str, Union[bool, str]]:
+        process.shutdown()
+        return {"success": True, "message": "local dev server stopped"}
+
+    logger.info("devserver.local.ready | root=%s | new=%s | npm_cache=%s", root, is_new, npm_cache)
+    return {
+        "repo_id": str(root),
+        "ephemeral_url": None,
+        "mcp_ephemeral_url": None,
+        "code_server_url": None,
+        "commit_and_push": commit_and_push,
+        "fs": fs,
+        "process": process,
+        "shutdown": shutdown,
+        "project_dir": str(root),
+        "_dev_server": None,
+    }
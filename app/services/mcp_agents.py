@@ -2,11 +2,16 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any, Dict
+from threading import RLock
+from typing import Any, Dict, List, Optional
 
 import dspy  # type: ignore
 
 from app.models.agents import CopyPlan
+from app.services.tool_output import ToolOutputLog, normalize_exec_result
+from app.utils.cancellation import check_cancelled
+from app.utils.metrics import track_stage
+from app.utils.tracing import span, traced
 
 
 logger = logging.getLogger("ych.mcp.react")
@@ -15,6 +20,51 @@ logger = logging.getLogger("ych.mcp.react")
 # Note: We rely on the ReAct agent end-to-end; no local fallbacks or hardcoded TSX are used.
 
 
+class SessionFileCache:
+    """Read-through cache over a dev server ``fs`` handle for one agent session.
+
+    Reads are served from memory after the first remote fetch, and writes update the
+    cache so later reads of the same path never hit the remote FS again.
+    """
+
+    def __init__(self, fs: Any) -> None:
+        self._fs = fs
+        self._lock = RLock()
+        self._files: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def read_file(self, path: str) -> str:
+        with self._lock:
+            if path in self._files:
+                self.hits += 1
+                return self._files[path]
+        content = self._fs.read_file(path) or ""
+        with self._lock:
+            self.misses += 1
+            self._files[path] = content
+        return content
+
+    def write_file(self, path: str, content: str) -> None:
+        self._fs.write_file(path, content)
+        with self._lock:
+            self._files[path] = content
+
+    def read_files(self, paths: List[str]) -> Dict[str, str]:
+        return {path: self.read_file(path) for path in paths}
+
+    def write_files(self, files: Dict[str, str]) -> None:
+        for path, content in files.items():
+            self.write_file(path, content)
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._files.clear()
+            else:
+                self._files.pop(path, None)
+
+
 class NextPageTaskSig(dspy.Signature):  # type: ignore
     """Update or create app/page.tsx using available tools.
 
@@ -34,43 +84,92 @@ class NextPageTaskSig(dspy.Signature):  # type: ignore
     status: str = dspy.OutputField()
 
 
-def react_generate_and_build(ds: Dict[str, Any], copy_plan: CopyPlan, style_guide: str) -> Dict[str, Any]:
+def react_generate_and_build(
+    ds: Dict[str, Any],
+    copy_plan: CopyPlan,
+    style_guide: str,
+    log_dir: Optional[str] = None,
+) -> Dict[str, Any]:
     """Run a DSPy ReAct agent using Freestyle dev server tools to edit code and verify build.
 
     Tools mirror the Freestyle MCP toolset (readFile, writeFile, exec, npmInstall, commitAndPush)
     as Python callables, per DSPy ReAct docs (`https://dspy.ai/api/modules/ReAct/?h=react`).
+    File tools go through a per-session read-through cache; batch variants let the agent
+    read or write several files in a single step. Process output is returned to the agent
+    as a bounded digest; full logs are kept under ``log_dir`` when provided.
     """
-
+    fs_cache = SessionFileCache(ds["fs"])
+    tool_log = ToolOutputLog(log_dir=log_dir)
+
+    def _exec(command: str) -> Any:
+        check_cancelled()
+        with span("devserver.exec", cmd=command) as s:
+            try:
+                res = ds["process"].exec(command)
+            finally:
+                # Shell commands (exec, npm install, lint --fix) may touch any file; drop cached contents
+                fs_cache.invalidate()
+            # Remote backends cannot be interrupted mid-command; stop before the agent sees output
+            check_cancelled()
+            out = normalize_exec_result(res)
+            s.set_attribute("bytes", len(out["stdout"]) + len(out["stderr"]))
+            if out["exit_code"] is not None:
+                s.set_attribute("exit_code", out["exit_code"])
+            return res
+
+    @traced("react.tool.read_file")
     def tool_read_file(path: str) -> str:
         logger.info("mcp.readFile | path=%s", path)
-        content = ds["fs"].read_file(path)
+        content = fs_cache.read_file(path)
         logger.info("mcp.readFile.done | bytes=%s", len(content or ""))
         return content
 
+    @traced("react.tool.write_file")
     def tool_write_file(path: str, content: str) -> str:
         logger.info("mcp.writeFile | path=%s | size=%s", path, len(content or ""))
-        ds["fs"].write_file(path, content)
+        fs_cache.write_file(path, content)
         logger.info("mcp.writeFile.done | path=%s", path)
         return "ok"
 
+    @traced("react.tool.read_files")
+    def tool_read_files(paths: List[str]) -> str:
+        """Read several files at once; returns a JSON object mapping path to content."""
+        logger.info("mcp.readFiles | count=%s", len(paths))
+        contents = fs_cache.read_files(paths)
+        logger.info("mcp.readFiles.done | bytes=%s", sum(len(c) for c in contents.values()))
+        return json.dumps(contents)
+
+    @traced("react.tool.write_files")
+    def tool_write_files(files: Dict[str, str]) -> str:
+        """Write several files at once; `files` maps path to full file content."""
+        logger.info("mcp.writeFiles | count=%s | size=%s", len(files), sum(len(c or "") for c in files.values()))
+        fs_cache.write_files(files)
+        logger.info("mcp.writeFiles.done | paths=%s", ",".join(files))
+        return "ok"
+
+    @traced("react.tool.exec")
     def tool_exec(command: str) -> str:
         logger.info("mcp.exec | cmd=%s", command)
-        res = ds["process"].exec(command)
+        res = _exec(command)
         logger.info("mcp.exec.done | cmd=%s", command)
-        return str(res)
+        return tool_log.digest("exec", command, res)
 
+    @traced("react.tool.npm_install")
     def tool_npm_install() -> str:
         logger.info("mcp.npmInstall | start")
-        ds["process"].exec("npm ci || npm install")
+        res = _exec("npm ci || npm install")
+        tool_log.record("npm_install", "npm ci || npm install", res)
         logger.info("mcp.npmInstall.done")
         return "ok"
 
+    @traced("react.tool.npm_lint")
     def tool_npm_lint() -> str:
         logger.info("mcp.npmLint | start")
-        res = ds["process"].exec("npm run lint")
+        res = _exec("npm run lint")
         logger.info("mcp.npmLint.done")
-        return str(res)
+        return tool_log.digest("npm_lint", "npm run lint", res)
 
+    @traced("react.tool.commit_and_push")
     def tool_commit_and_push(message: str) -> str:
         logger.info("mcp.commitAndPush | msg=%s", message)
         ds["commit_and_push"](message)
@@ -80,6 +179,8 @@ def react_generate_and_build(ds: Dict[str, Any], copy_plan: CopyPlan, style_guid
     tools = [
         dspy.Tool(tool_read_file),
         dspy.Tool(tool_write_file),
+        dspy.Tool(tool_read_files),
+        dspy.Tool(tool_write_files),
         dspy.Tool(tool_exec),
         dspy.Tool(tool_npm_install),
         dspy.Tool(tool_npm_lint),
@@ -88,25 +189,32 @@ def react_generate_and_build(ds: Dict[str, Any], copy_plan: CopyPlan, style_guid
 
     react = dspy.ReAct(signature=NextPageTaskSig, tools=tools, max_iters=12)
     logger.info("react.start | target=app/page.tsx")
-    prediction = react(
-        target_path="app/page.tsx",
-        style_guide=style_guide,
-        copy_plan_json=json.dumps(copy_plan.model_dump()),
+    with track_stage("generate", "react"):
+        prediction = react(
+            target_path="app/page.tsx",
+            style_guide=style_guide,
+            copy_plan_json=json.dumps(copy_plan.model_dump()),
+        )
+    logger.info(
+        "react.done | status=%s | fs_cache_hits=%s | fs_cache_misses=%s",
+        getattr(prediction, "status", ""), fs_cache.hits, fs_cache.misses,
     )
-    logger.info("react.done | status=%s", getattr(prediction, "status", ""))
 
     # Ensure lint and build before pushing
     lint_ok = True
     build_ok = True
     try:
-        tool_npm_install()
-        tool_npm_lint()
+        with track_stage("generate", "lint"):
+            tool_npm_install()
+            tool_npm_lint()
     except Exception as exc:
         lint_ok = False
         logger.exception("mcp.lint.failed: %s", exc)
     try:
         logger.info("mcp.build | npm run build")
-        ds["process"].exec("npm run build")
+        with track_stage("generate", "build"):
+            res = _exec("npm run build")
+        tool_log.record("npm_build", "npm run build", res)
         logger.info("mcp.build.done")
     except Exception as exc:
         build_ok = False
@@ -114,7 +222,8 @@ def react_generate_and_build(ds: Dict[str, Any], copy_plan: CopyPlan, style_guid
 
     if lint_ok and build_ok:
         try:
-            tool_commit_and_push("Apply copy updates via DSPy ReAct")
+            with track_stage("generate", "push"):
+                tool_commit_and_push("Apply copy updates via DSPy ReAct")
         except Exception as exc:
             logger.exception("mcp.commit.failed: %s", exc)
 
@@ -122,6 +231,7 @@ def react_generate_and_build(ds: Dict[str, Any], copy_plan: CopyPlan, style_guid
         "status": getattr(prediction, "status", "done"),
         "lint": "ok" if lint_ok else "failed",
         "build": "ok" if build_ok else "failed",
+        "tool_logs": list(tool_log.paths),
     }
 
 
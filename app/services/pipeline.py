@@ -9,7 +9,11 @@ from pathlib import Path
 from app.models.agents import EvaluationCriterion, CopyPlan, StyleSystem, ContentHierarchy
 from app.services.dspy_agents import agent_content_improver, agent_generate_next_page
 from app.services.style_guide import default_style, STYLE_GUIDE
-from app.services.devserver import connect_dev_server, provision_dev_server
+from app.services.devserver import forget_pushed_files, open_dev_server, push_files
+from app.services.generator import render_template_site
+from app.utils.cancellation import JobCancelled
+from app.utils.manifest import sync_files
+from app.utils.metrics import track_stage
 from app.services.mcp_agents import react_generate_and_build
 
 
@@ -22,34 +26,70 @@ def run_full_generation(
     tone: str = "professional",
     criteria: Optional[List[EvaluationCriterion]] = None,
     content: str | None = None,
+    mode: str = "agentic",
 ) -> Dict[str, Any]:
+    """Improve copy, then build the homepage on a dev server.
+
+    ``mode="agentic"`` runs the DSPy ReAct agent to write code and verify lint/build;
+    ``mode="fast"`` renders the template component library from the copy plan and
+    design tokens with no further LM calls and pushes the files in one batch.
+    """
     artifacts = audit_results.get("artifacts", {})
     dom_path = artifacts.get("dom_sample_path")
 
     # a) copy: if content provided, improve directly from hierarchical text; else extract from DOM first
-    if content is not None:
-        copy_plan: CopyPlan = agent_content_improver(content_text=content, tone=tone)
-    else:
-        html = Path(dom_path).read_text(encoding="utf-8") if dom_path else ""
-        # If no explicit content, pass HTML snapshot to content improver which understands hierarchy-like text
-        copy_plan = agent_content_improver(content_text=html, tone=tone)
+    with track_stage("generate", "copy_llm"):
+        if content is not None:
+            copy_plan: CopyPlan = agent_content_improver(content_text=content, tone=tone)
+        else:
+            html = Path(dom_path).read_text(encoding="utf-8") if dom_path else ""
+            # If no explicit content, pass HTML snapshot to content improver which understands hierarchy-like text
+            copy_plan = agent_content_improver(content_text=html, tone=tone)
 
     # b) style
     style: StyleSystem = default_style()
 
     # c) generate a Next.js homepage using Dev Server and verify build
-    # Provision dev server (requires FREESTYLE_API_KEY)
-    import os
-    api_key = os.getenv("FREESTYLE_API_KEY")
-    if not api_key:
-        raise RuntimeError("FREESTYLE_API_KEY not set in environment")
-
-    # If a repo id is provided in env, connect; otherwise, provision from template
-    repo_id = os.getenv("FREESTYLE_REPO_ID")
-    ds = connect_dev_server(api_key, repo_id) if repo_id else provision_dev_server(api_key)
+    # Backend is chosen by DEVSERVER_BACKEND (Freestyle requires FREESTYLE_API_KEY)
+    with track_stage("generate", "dev_server"):
+        ds = open_dev_server(out_dir)
+    # Local copy of the generated sources, served by GET /generate/{id}/archive
+    project_dir = ds.get("project_dir")
 
-    # Use DSPy React-style agent to write code via MCP tools and verify
-    outcome = react_generate_and_build(ds=ds, copy_plan=copy_plan, style_guide=STYLE_GUIDE)
+    try:
+        if mode == "fast":
+            files = render_template_site(copy_plan, style)
+            # Only files whose content changed since the last push are written and committed
+            with track_stage("generate", "push"):
+                diff = push_files(ds, files, "Apply template homepage (fast mode)")
+            if project_dir is None:
+                project_dir = str(Path(out_dir) / "next_project")
+                sync_files(project_dir, files)
+            # Template output is fixed and known to compile; skip the lint/build round trips
+            outcome: Dict[str, Any] = {
+                "lint": "skipped",
+                "build": "skipped",
+                "files": sorted(files),
+                "manifest_diff": diff,
+            }
+            logger.info("pipeline.fast.done | files=%s | pushed=%s", len(files), len(diff["added"]) + len(diff["changed"]))
+        else:
+            # The agent may edit any file, so previously pushed hashes no longer describe the repo
+            forget_pushed_files(ds)
+            # Use DSPy React-style agent to write code via MCP tools and verify
+            outcome = react_generate_and_build(
+                ds=ds,
+                copy_plan=copy_plan,
+                style_guide=STYLE_GUIDE,
+                log_dir=str(Path(out_dir) / "tool_logs"),
+            )
+    except JobCancelled:
+        # Nobody will use this dev server; release it (and its processes) before unwinding
+        try:
+            ds["shutdown"]()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("pipeline.dev_server.shutdown_failed | err=%s", exc)
+        raise
 
     return {
         "dev_server": {
@@ -60,6 +100,10 @@ def run_full_generation(
             "lint": outcome.get("lint"),
             "build": outcome.get("build"),
         },
+        "mode": mode,
+        "project_dir": project_dir,
+        "artifacts": {"tool_logs": outcome.get("tool_logs", []), "files": outcome.get("files", [])},
+        "manifest_diff": outcome.get("manifest_diff"),
         "copy_plan": copy_plan.model_dump(),
         "style_system": style.model_dump(),
     }
@@ -5,32 +5,58 @@ import logging
 from typing import Any, Dict, Optional
 import httpx
 
+from app.utils.cancellation import bounded_timeout, current_token
+from app.utils.politeness import OriginBusy, origins
+
 
 logger = logging.getLogger("ych.psi")
 
 
+# PSI is optional enrichment: give up on the slot rather than hold an audit for a Retry-After
+PSI_MAX_WAIT = float(os.getenv("PSI_MAX_WAIT", "10"))
+
+
 def get_psi_report(url: str, strategy: str = "mobile") -> Optional[Dict[str, Any]]:
+    """PSI report for `url`, or None on errors; raises OriginBusy when the API is deferred."""
     api_key = os.getenv("PAGESPEED_API_KEY")
     params = {
         "url": url,
         "category": ["PERFORMANCE", "ACCESSIBILITY", "SEO"],
         "strategy": strategy,
     }
-    base = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
+    # Overridable so benchmarks can point at a local stand-in
+    base = os.getenv("PAGESPEED_API_URL", "https://www.googleapis.com/pagespeedonline/v5/runPagespeed")
 
     # Without API key, Google still serves some limited requests with quota; we attempt once.
     if api_key:
         params["key"] = api_key
 
     try:
-        with httpx.Client(timeout=30) as client:
-            resp = client.get(base, params=params)
+        # The PSI API gets its own, wider limits; its quota errors come back as 429 + Retry-After.
+        # The timeout is capped by the stage/job deadline and a cancel closes the client.
+        with origins.acquire(
+            base,
+            resource="psi",
+            max_concurrent=int(os.getenv("PSI_MAX_CONCURRENCY", "8")),
+            min_interval=float(os.getenv("PSI_MIN_INTERVAL", "0.25")),
+            max_wait=PSI_MAX_WAIT,
+        ), httpx.Client(timeout=bounded_timeout(30)) as client:
+            token = current_token()
+            unregister = token.on_cancel(client.close) if token is not None else (lambda: None)
+            try:
+                resp = client.get(base, params=params)
+            finally:
+                unregister()
+            if resp.status_code in (429, 503):
+                origins.defer(base, resp.status_code, resp.headers.get("retry-after"), resource="psi")
             if resp.status_code >= 400:
                 logger.info("psi.http_error | status=%s", resp.status_code)
                 return None
             data = resp.json()
             logger.info("psi.ok | strategy=%s", strategy)
             return data
+    except OriginBusy:
+        raise
     except Exception:
         logger.warning("psi.error | url=%s", url)
         return None
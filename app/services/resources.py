@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import logging
+import re
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+
+logger = logging.getLogger("ych.audit.resources")
+
+
+# Entries kept in each ranked list of the summary
+TOP_N = 10
+# Text responses smaller than this fit in one packet; compressing them saves nothing
+MIN_COMPRESSIBLE_BYTES = 1400
+# Static assets cached for less than this (seconds) are reported as short-lived
+MIN_CACHE_TTL = 7 * 24 * 3600
+
+_TEXT_TYPE = re.compile(r"^(text/|application/(javascript|x-javascript|json|ld\+json|xml|manifest\+json)|image/svg\+xml)")
+_STATIC_TYPES = {"script", "stylesheet", "image", "font", "media"}
+_MAX_AGE = re.compile(r"max-age\s*=\s*(\d+)")
+
+# Stylesheets and classic scripts that block first render: Chromium's renderBlockingStatus
+# where available, else <head> scripts without async/defer/module and non-print stylesheets
+RENDER_BLOCKING_JS = """
+() => {
+  const urls = new Set();
+  for (const r of performance.getEntriesByType('resource')) {
+    if (r.renderBlockingStatus === 'blocking') urls.add(r.name);
+  }
+  if (!urls.size) {
+    document.querySelectorAll('head script[src]:not([async]):not([defer]):not([type="module"])')
+      .forEach((s) => urls.add(s.src));
+    document.querySelectorAll('link[rel="stylesheet"][href]')
+      .forEach((l) => { if (!l.media || l.media === 'all' || window.matchMedia(l.media).matches) urls.add(l.href); });
+  }
+  return [...urls];
+}
+"""
+
+
+def resource_entry(url: str, resource_type: str, status: int, headers: Dict[str, str], size: int) -> Dict[str, Any]:
+    """One finished request as read by the summary; `headers` are lowercased response headers."""
+    return {
+        "url": url,
+        "type": resource_type,
+        "status": status,
+        "bytes": size,
+        "content_type": (headers.get("content-type") or "").split(";")[0].strip().lower(),
+        "content_encoding": (headers.get("content-encoding") or "").lower(),
+        "cache_control": headers.get("cache-control"),
+    }
+
+
+def _cache_ttl(cache_control: Optional[str]) -> Optional[int]:
+    """Seconds a response may be reused; 0 when it must not be, None without Cache-Control."""
+    if not cache_control:
+        return None
+    value = cache_control.lower()
+    if "no-store" in value or "no-cache" in value:
+        return 0
+    match = _MAX_AGE.search(value)
+    return int(match.group(1)) if match else None
+
+
+def _origin(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def summarize_resources(
+    entries: List[Dict[str, Any]], page_url: str, render_blocking: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Compact summary of a page load: bytes by type and origin, largest assets, uncompressed
+    text, render-blocking scripts/CSS and short cache lifetimes."""
+    by_type: Dict[str, int] = {}
+    by_origin: Dict[str, int] = {}
+    uncompressed: List[Dict[str, Any]] = []
+    short_cache: List[Dict[str, Any]] = []
+    sizes = {e["url"]: e for e in entries}
+    for e in entries:
+        by_type[e["type"]] = by_type.get(e["type"], 0) + e["bytes"]
+        origin = _origin(e["url"])
+        by_origin[origin] = by_origin.get(origin, 0) + e["bytes"]
+        if (
+            e["status"] < 300
+            and e["bytes"] >= MIN_COMPRESSIBLE_BYTES
+            and _TEXT_TYPE.match(e["content_type"])
+            and e["content_encoding"] in ("", "identity")
+        ):
+            uncompressed.append({"url": e["url"], "type": e["type"], "bytes": e["bytes"]})
+        if e["type"] in _STATIC_TYPES and e["status"] < 300:
+            ttl = _cache_ttl(e["cache_control"])
+            if ttl is None or ttl < MIN_CACHE_TTL:
+                short_cache.append({"url": e["url"], "type": e["type"], "bytes": e["bytes"], "cache_control": e["cache_control"]})
+
+    blocking = [
+        {"url": u, "type": sizes[u]["type"] if u in sizes else None, "bytes": sizes[u]["bytes"] if u in sizes else None}
+        for u in (render_blocking or [])
+    ]
+    page_origin = _origin(page_url)
+    total = sum(by_type.values())
+
+    def top(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return sorted(items, key=lambda i: i["bytes"], reverse=True)[:TOP_N]
+
+    return {
+        "requests": len(entries),
+        "total_bytes": total,
+        "bytes_by_type": dict(sorted(by_type.items(), key=lambda kv: kv[1], reverse=True)),
+        "bytes_by_origin": dict(sorted(by_origin.items(), key=lambda kv: kv[1], reverse=True)[:TOP_N]),
+        "third_party_bytes": total - by_origin.get(page_origin, 0),
+        "largest": top([{"url": e["url"], "type": e["type"], "bytes": e["bytes"]} for e in entries]),
+        "uncompressed": top(uncompressed),
+        "uncompressed_bytes": sum(i["bytes"] for i in uncompressed),
+        "render_blocking": blocking,
+        "short_cache": top(short_cache),
+        "short_cache_count": len(short_cache),
+        "short_cache_bytes": sum(i["bytes"] for i in short_cache),
+    }
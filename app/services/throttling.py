@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger("ych.audit.throttling")
+
+
+# Named network/CPU conditions applied through CDP, so lab metrics from different runs and
+# hosts are comparable. CDP throttles each request rather than simulating a connection, so
+# network values are the devtools-adjusted ones (request latency = RTT x 3.75, throughput x 0.9).
+# Throughput is in 1024-bit kbps; cpu_slowdown multiplies the host's CPU time.
+PROFILES: Dict[str, Optional[Dict[str, float]]] = {
+    "none": None,
+    # Lighthouse mobileSlow4G (150 ms RTT, 1.6 Mbps / 750 Kbps), devtools throttling values
+    "slow-4g-midtier": {"latency_ms": 562.5, "download_kbps": 1474.56, "upload_kbps": 675, "cpu_slowdown": 4},
+    # Chrome DevTools' "Fast 3G" network preset (0.9 x 1.6 Mbps / 750 Kbps, decimal units), network only
+    "fast-3g": {"latency_ms": 562.5, "download_kbps": 1406.25, "upload_kbps": 659.1796875, "cpu_slowdown": 1},
+    # Lighthouse desktopDense4G. Lighthouse has no devtools-adjusted desktop values (it does not
+    # throttle desktop in devtools mode), so its simulated RTT/throughput are applied as-is
+    "desktop-cable": {"latency_ms": 40, "download_kbps": 10240, "upload_kbps": 10240, "cpu_slowdown": 1},
+}
+
+
+async def apply_throttling(context: Any, page: Any, name: str) -> Dict[str, Any]:
+    """Emulate profile `name` on `page` before navigation; returns the record stored with the audit."""
+    settings = PROFILES[name]
+    if settings is None:
+        return {"profile": name}
+    cdp = await context.new_cdp_session(page)
+    await cdp.send("Network.enable")
+    await cdp.send("Network.emulateNetworkConditions", {
+        "offline": False,
+        "latency": settings["latency_ms"],
+        # CDP takes bytes per second
+        "downloadThroughput": settings["download_kbps"] * 1024 / 8,
+        "uploadThroughput": settings["upload_kbps"] * 1024 / 8,
+    })
+    if settings["cpu_slowdown"] > 1:
+        await cdp.send("Emulation.setCPUThrottlingRate", {"rate": settings["cpu_slowdown"]})
+    logger.info("throttling.applied | profile=%s | %s", name, settings)
+    return {"profile": name, **settings}
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import logging
+import re
+from collections import deque
+from pathlib import Path
+from threading import RLock
+from typing import Any, Deque, Dict, List, Optional
+
+
+logger = logging.getLogger("ych.tool_output")
+
+
+DEFAULT_TAIL_LINES = 30
+DEFAULT_MAX_ERRORS = 20
+MAX_LINE_CHARS = 300
+
+# tsc: app/page.tsx(12,5): error TS2322: Type 'x' is not assignable ...
+_TSC_PAREN_RE = re.compile(r"^(?P<file>[^\s(]+)\((?P<line>\d+),(?P<col>\d+)\):\s*error\s+(?P<code>TS\d+):\s*(?P<msg>.*)$")
+# tsc --pretty / next build: ./app/page.tsx:12:5 [- error TS2322: ...] | Type error: ...
+_FILE_POS_RE = re.compile(r"^(?P<file>\.{0,2}/?[\w@./\[\]()-]+\.(?:[cm]?[jt]sx?)):(?P<line>\d+):(?P<col>\d+)(?:\s*-\s*error\s+(?P<code>TS\d+):\s*(?P<msg>.*))?$")
+# ESLint stylish / next lint: "  12:5  Error: Missing alt  jsx-a11y/alt-text"
+_ESLINT_ROW_RE = re.compile(r"^\s*(?P<line>\d+):(?P<col>\d+)\s+(?P<level>[Ee]rror|[Ww]arning):?\s+(?P<msg>.*?)(?:\s{2,}(?P<rule>[\w@/-]+))?$")
+_ESLINT_FILE_RE = re.compile(r"^(?P<file>\.{0,2}/?[\w@./\[\]()-]+\.(?:[cm]?[jt]sx?))\s*$")
+_TYPE_ERROR_RE = re.compile(r"^\s*(?:Type error|Error):\s*(?P<msg>.+)$")
+
+
+def _as_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return "\n".join(str(v) for v in value)
+    return str(value)
+
+
+def _clip(line: str) -> str:
+    return line if len(line) <= MAX_LINE_CHARS else line[:MAX_LINE_CHARS] + "…"
+
+
+def normalize_exec_result(res: Any) -> Dict[str, Any]:
+    """Map a dev server ``process.exec`` return value to stdout/stderr/exit_code."""
+    if isinstance(res, dict):
+        exit_code = res.get("exitCode", res.get("exit_code", res.get("returncode")))
+        return {
+            "stdout": _as_text(res.get("stdout")),
+            "stderr": _as_text(res.get("stderr")),
+            "exit_code": exit_code,
+        }
+    return {"stdout": _as_text(res), "stderr": "", "exit_code": None}
+
+
+def extract_errors(text: str, max_errors: int = DEFAULT_MAX_ERRORS) -> List[Dict[str, Any]]:
+    """Pull TypeScript and ESLint diagnostics (file, line, message) out of build/lint output."""
+    errors: List[Dict[str, Any]] = []
+    current_file: Optional[str] = None
+    pending: Optional[Dict[str, Any]] = None
+
+    for raw in text.splitlines():
+        line = raw.rstrip()
+        if len(errors) >= max_errors:
+            break
+        m = _TSC_PAREN_RE.match(line.strip())
+        if m:
+            errors.append({
+                "file": m.group("file"),
+                "line": int(m.group("line")),
+                "code": m.group("code"),
+                "message": _clip(m.group("msg")),
+            })
+            pending = None
+            continue
+        m = _FILE_POS_RE.match(line.strip())
+        if m:
+            entry = {"file": m.group("file"), "line": int(m.group("line"))}
+            if m.group("code"):
+                entry.update({"code": m.group("code"), "message": _clip(m.group("msg") or "")})
+                errors.append(entry)
+                pending = None
+            else:
+                # next build prints the message on the following line
+                pending = entry
+            continue
+        if pending is not None:
+            m = _TYPE_ERROR_RE.match(line)
+            if m:
+                pending["message"] = _clip(m.group("msg"))
+                errors.append(pending)
+                pending = None
+                continue
+        m = _ESLINT_FILE_RE.match(line.strip())
+        if m:
+            current_file = m.group("file")
+            continue
+        m = _ESLINT_ROW_RE.match(line)
+        if m and current_file and m.group("level").lower() == "error":
+            entry = {
+                "file": current_file,
+                "line": int(m.group("line")),
+                "message": _clip(m.group("msg")),
+            }
+            if m.group("rule"):
+                entry["rule"] = m.group("rule")
+            errors.append(entry)
+    return errors
+
+
+def summarize_exec_result(
+    res: Any,
+    tail_lines: int = DEFAULT_TAIL_LINES,
+    max_errors: int = DEFAULT_MAX_ERRORS,
+    log_path: Optional[str] = None,
+) -> str:
+    """Return a bounded digest of a process result suitable for feeding back to the LM."""
+    out = normalize_exec_result(res)
+    combined = "\n".join(t for t in (out["stdout"], out["stderr"]) if t)
+    lines = combined.splitlines()
+    errors = extract_errors(combined, max_errors=max_errors)
+
+    parts = [f"exit_code: {out['exit_code'] if out['exit_code'] is not None else 'unknown'}"]
+    parts.append(f"output_lines: {len(lines)} ({len(combined)} bytes)")
+    if errors:
+        parts.append(f"errors ({len(errors)}):")
+        for e in errors:
+            loc = f"{e['file']}:{e['line']}"
+            tag = e.get("code") or e.get("rule")
+            parts.append(f"- {loc} {'[' + tag + '] ' if tag else ''}{e.get('message', '')}".rstrip())
+    tail = lines[-tail_lines:] if tail_lines > 0 else []
+    if tail:
+        parts.append(f"last {len(tail)} lines:")
+        parts.extend(_clip(t) for t in tail)
+    if log_path:
+        parts.append(f"full log: {log_path}")
+    return "\n".join(parts)
+
+
+class ToolOutputLog:
+    """Ring buffer of recent tool results; full logs optionally persisted under ``log_dir``."""
+
+    def __init__(self, log_dir: Optional[str] = None, capacity: int = 50) -> None:
+        self._lock = RLock()
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._seq = 0
+        self._log_dir = Path(log_dir) if log_dir else None
+        self.paths: List[str] = []
+
+    def record(self, tool: str, command: str, res: Any) -> Dict[str, Any]:
+        out = normalize_exec_result(res)
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        log_path: Optional[str] = None
+        if self._log_dir is not None:
+            try:
+                self._log_dir.mkdir(parents=True, exist_ok=True)
+                path = self._log_dir / f"{seq:03d}_{re.sub(r'[^A-Za-z0-9_-]+', '_', tool)}.log"
+                path.write_text(
+                    f"$ {command}\n"
+                    f"# exit_code: {out['exit_code']}\n"
+                    f"--- stdout ---\n{out['stdout']}\n"
+                    f"--- stderr ---\n{out['stderr']}\n",
+                    encoding="utf-8",
+                )
+                log_path = str(path)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("tool_output.persist_failed | tool=%s | err=%s", tool, exc)
+        entry = {"seq": seq, "tool": tool, "command": command, "log_path": log_path, **out}
+        with self._lock:
+            self._entries.append(entry)
+            if log_path:
+                self.paths.append(log_path)
+        return entry
+
+    def digest(self, tool: str, command: str, res: Any) -> str:
+        """Record the raw result and return the bounded digest for the agent."""
+        entry = self.record(tool, command, res)
+        digest = summarize_exec_result(res, log_path=entry["log_path"])
+        logger.info(
+            "tool_output.digest | tool=%s | raw_bytes=%s | digest_bytes=%s",
+            tool, len(entry["stdout"]) + len(entry["stderr"]), len(digest),
+        )
+        return digest
+
+    def recent(self, n: int = 10) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._entries)[-n:]
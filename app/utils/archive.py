@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from threading import RLock
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from app.utils.manifest import MANIFEST_NAME, content_hash
+
+
+DEFAULT_COMPRESSION_LEVEL = int(os.getenv("ARCHIVE_COMPRESSION_LEVEL", "6"))
+EXCLUDED_DIRS = {"node_modules", ".next", ".git"}
+CHUNK_SIZE = 64 * 1024
+# Fixed metadata so identical content always produces identical bytes
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+_FILE_MODE = 0o100644 << 16
+
+
+def project_paths(project_dir: str) -> Dict[str, Path]:
+    """Files of a generated project, keyed by POSIX relative path."""
+    root = Path(project_dir)
+    paths: Dict[str, Path] = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDED_DIRS)
+        for name in filenames:
+            if name == MANIFEST_NAME and Path(dirpath) == root:
+                continue
+            path = Path(dirpath) / name
+            paths[path.relative_to(root).as_posix()] = path
+    return paths
+
+
+def collect_project_files(project_dir: str) -> Dict[str, bytes]:
+    """Read a generated project into memory, keyed by POSIX relative path."""
+    return {name: path.read_bytes() for name, path in project_paths(project_dir).items()}
+
+
+def archive_etag(digests: Mapping[str, str], compresslevel: int) -> str:
+    """ETag over per-file content hashes (path -> sha256 hex) and the compression level."""
+    h = hashlib.sha256(f"level={compresslevel}".encode())
+    for name in sorted(digests):
+        h.update(name.encode("utf-8") + b"\0" + digests[name].encode("ascii") + b"\n")
+    return f'"{h.hexdigest()[:32]}"'
+
+
+class _DigestCache:
+    """sha256 of files on disk, reused while (size, mtime, inode) are unchanged."""
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self._lock = RLock()
+        self._max = max_entries
+        self._store: "OrderedDict[str, Tuple[Tuple[int, int, int], str]]" = OrderedDict()
+
+    def digest(self, path: Path) -> str:
+        st = path.stat()
+        key = (st.st_size, st.st_mtime_ns, st.st_ino)
+        with self._lock:
+            hit = self._store.get(str(path))
+            if hit is not None and hit[0] == key:
+                self._store.move_to_end(str(path))
+                return hit[1]
+        value = content_hash(path.read_bytes())
+        with self._lock:
+            self._store[str(path)] = (key, value)
+            while len(self._store) > self._max:
+                self._store.popitem(last=False)
+        return value
+
+
+file_digests = _DigestCache()
+
+
+def project_digests(project_dir: str) -> Tuple[Dict[str, str], Dict[str, Path]]:
+    """Return per-file hashes of exactly the files `iter_zip` will archive, plus their paths.
+
+    Hashes come from the files on disk (not the generation manifest), so files edited or
+    added after generation change the ETag; unchanged files are not re-read.
+    """
+    paths = project_paths(project_dir)
+    return {name: file_digests.digest(path) for name, path in paths.items()}, paths
+
+
+class _ChunkSink:
+    """Write-only, unseekable file object: zipfile emits data descriptors instead of seeking back."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(
+    files: Mapping[str, Union[bytes, Path]], compresslevel: int = DEFAULT_COMPRESSION_LEVEL
+) -> Iterator[bytes]:
+    """Yield a deterministic zip (sorted entries, fixed timestamps and modes) entry by entry.
+
+    `Path` values are read only when their entry is written, so a download starts after the
+    first file is compressed rather than after the whole archive is built.
+    """
+    sink = _ChunkSink()
+    method = zipfile.ZIP_STORED if compresslevel == 0 else zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(sink, "w") as zf:  # type: ignore[arg-type]
+        for name in sorted(files):
+            info = zipfile.ZipInfo(name, date_time=_ZIP_EPOCH)
+            info.create_system = 3
+            info.external_attr = _FILE_MODE
+            info.compress_type = method
+            content = files[name]
+            data = content.read_bytes() if isinstance(content, Path) else content
+            zf.writestr(info, data, compresslevel=None if method == zipfile.ZIP_STORED else compresslevel)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    # Central directory
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
+
+
+def build_zip(files: Mapping[str, Union[bytes, Path]], compresslevel: int = DEFAULT_COMPRESSION_LEVEL) -> bytes:
+    """The bytes `iter_zip` streams, built in memory (cache fills and Range requests)."""
+    return b"".join(iter_zip(files, compresslevel))
+
+
+class _ArchiveCache:
+    """Small LRU of built archives keyed by ETag."""
+
+    def __init__(self, max_entries: int = 8) -> None:
+        self._lock = RLock()
+        self._max = max_entries
+        self._store: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def get(self, etag: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._store.get(etag)
+            if data is not None:
+                self._store.move_to_end(etag)
+            return data
+
+    def put(self, etag: str, data: bytes) -> None:
+        with self._lock:
+            self._store[etag] = data
+            while len(self._store) > self._max:
+                self._store.popitem(last=False)
+
+
+archives = _ArchiveCache()
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single `bytes=` range into inclusive (start, end).
+
+    Returns None when no usable range is given; raises ValueError if unsatisfiable.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    spec = header[len("bytes="):].strip()
+    start_s, _, end_s = spec.partition("-")
+    try:
+        if start_s == "":
+            length = int(end_s)
+            if length <= 0:
+                raise ValueError("empty suffix range")
+            return max(size - length, 0), size - 1
+        start = int(start_s)
+        end = int(end_s) if end_s else size - 1
+    except ValueError as exc:
+        raise ValueError(f"invalid range: {header}") from exc
+    if start >= size or end < start:
+        raise ValueError(f"unsatisfiable range: {header}")
+    return start, min(end, size - 1)
+
+
+def iter_chunks(data: bytes, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+    view = memoryview(data)
+    stop = len(data) if end is None else end + 1
+    for offset in range(start, stop, CHUNK_SIZE):
+        yield bytes(view[offset:min(offset + CHUNK_SIZE, stop)])
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import uuid
+from pathlib import Path
+from threading import RLock
+from typing import Dict, Iterable, Set, Tuple, Union
+
+from app.utils.metrics import ARTIFACT_BYTES
+
+
+logger = logging.getLogger("ych.blobs")
+
+
+Content = Union[str, bytes]
+
+
+def _tmp_sibling(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+
+class _BlobStore:
+    """Content-addressed artifact files (`<root>/<sha[:2]>/<sha256>`), shared by hard link.
+
+    Job directories keep their usual file names, but each name is a hard link to a blob,
+    so identical screenshots or DOM samples occupy disk once. Only store artifacts nobody
+    edits: a write through a job's name would change the blob for every job.
+    A blob's link count is its reference count: removing a job directory drops its links,
+    and `release`/`collect_garbage` delete blobs no job links to any more. Blobs are never
+    written in place; replacing a job file swaps the link instead.
+    """
+
+    def __init__(self, root: Path, enabled: bool = True) -> None:
+        self._lock = RLock()
+        self.root = root
+        self.enabled = enabled
+        # inode -> (blob path, size), for releasing the blobs of a deleted job directory
+        self._index: Dict[int, Tuple[Path, int]] = {}
+        self._scanned = False
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def _scan(self) -> None:
+        """Index blobs on disk, including ones created by other (worker) processes."""
+        index: Dict[int, Tuple[Path, int]] = {}
+        if self.root.is_dir():
+            for blob in self.root.glob("??/*"):
+                if blob.name.endswith(".tmp"):
+                    continue
+                try:
+                    st = blob.stat()
+                except OSError:
+                    continue
+                index[st.st_ino] = (blob, st.st_size)
+        with self._lock:
+            self._index = index
+            self._scanned = True
+
+    def _ensure_scanned(self) -> None:
+        if not self._scanned:
+            self._scan()
+
+    def _store(self, digest: str, data: bytes) -> Tuple[Path, bool]:
+        """Blob for `data`; returns (path, True) when it already existed."""
+        blob = self._path(digest)
+        if blob.exists():
+            return blob, True
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _tmp_sibling(blob)
+        tmp.write_bytes(data)
+        os.chmod(tmp, 0o444)
+        os.replace(tmp, blob)
+        with self._lock:
+            self._index[blob.stat().st_ino] = (blob, len(data))
+        return blob, False
+
+    def _link(self, blob: Path, dest: Path) -> None:
+        tmp = _tmp_sibling(dest)
+        os.link(blob, tmp)
+        os.replace(tmp, dest)
+
+    def materialize(self, dest: Union[str, Path], content: Content, kind: str) -> str:
+        """Write `content` to `dest` as a link to its blob; returns the sha256 digest."""
+        dest = Path(dest)
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if not self.enabled:
+            _replace_bytes(dest, data)
+            ARTIFACT_BYTES.inc(len(data), kind=kind, outcome="copied")
+            return digest
+        self._ensure_scanned()
+        try:
+            blob, existed = self._store(digest, data)
+            self._link(blob, dest)
+        except OSError as exc:
+            # e.g. job directories on another filesystem: keep a private copy
+            logger.warning("blobs.link_failed | dest=%s | err=%s", dest, exc)
+            _replace_bytes(dest, data)
+            ARTIFACT_BYTES.inc(len(data), kind=kind, outcome="copied")
+            return digest
+        ARTIFACT_BYTES.inc(len(data), kind=kind, outcome="deduplicated" if existed else "stored")
+        return digest
+
+    def adopt(self, path: Union[str, Path], kind: str) -> str:
+        """Move a file written by someone else (e.g. a browser screenshot) into the store."""
+        path = Path(path)
+        data = path.read_bytes()
+        return self.materialize(path, data, kind)
+
+    def shared_inodes(self, tree: Union[str, Path]) -> Set[int]:
+        """Inodes under `tree` that are blob links; pass them to `release` after deleting it."""
+        inodes: Set[int] = set()
+        for dirpath, _dirnames, filenames in os.walk(tree):
+            for name in filenames:
+                try:
+                    st = (Path(dirpath) / name).lstat()
+                except OSError:
+                    continue
+                if st.st_nlink > 1:
+                    inodes.add(st.st_ino)
+        return inodes
+
+    def release(self, inodes: Iterable[int]) -> int:
+        """Delete the blobs among `inodes` that no job links to any more; returns bytes freed."""
+        inodes = set(inodes)
+        if not inodes:
+            return 0
+        self._ensure_scanned()
+        with self._lock:
+            missing = inodes - self._index.keys()
+        if missing:
+            self._scan()
+        freed = 0
+        for ino in inodes:
+            with self._lock:
+                entry = self._index.get(ino)
+            if entry is not None:
+                freed += self._drop_if_unreferenced(ino, *entry)
+        return freed
+
+    def _drop_if_unreferenced(self, ino: int, blob: Path, size: int) -> int:
+        try:
+            if blob.stat().st_nlink > 1:
+                return 0
+            blob.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            logger.warning("blobs.unlink_failed | blob=%s | err=%s", blob, exc)
+            return 0
+        with self._lock:
+            self._index.pop(ino, None)
+        return size
+
+    def collect_garbage(self) -> int:
+        """Delete every blob without job links (e.g. after directories were removed by hand)."""
+        self._scan()
+        with self._lock:
+            entries = list(self._index.items())
+        freed = sum(self._drop_if_unreferenced(ino, blob, size) for ino, (blob, size) in entries)
+        if freed:
+            logger.info("blobs.gc | freed=%s bytes | blobs=%s", freed, len(self._index))
+        return freed
+
+    def stats(self) -> Dict[str, float]:
+        """Stored (unique) bytes, logical bytes as linked from job directories, and their ratio."""
+        self._ensure_scanned()
+        with self._lock:
+            entries = list(self._index.values())
+        stored = logical = 0
+        for blob, size in entries:
+            try:
+                refs = blob.stat().st_nlink - 1
+            except OSError:
+                continue
+            stored += size
+            logical += size * refs
+        return {
+            "blobs": len(entries),
+            "stored_bytes": stored,
+            "logical_bytes": logical,
+            "dedup_ratio": logical / stored if stored else 1.0,
+        }
+
+    def total_bytes(self) -> int:
+        self._ensure_scanned()
+        with self._lock:
+            return sum(size for _, size in self._index.values())
+
+
+def _replace_bytes(dest: Path, data: bytes) -> None:
+    # Never write through an existing name: it may be a link to a shared blob
+    tmp = _tmp_sibling(dest)
+    tmp.write_bytes(data)
+    os.replace(tmp, dest)
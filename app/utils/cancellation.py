@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock, Timer
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Iterator, List, Optional, Tuple, Type, TypeVar
+
+
+logger = logging.getLogger("ych.cancel")
+
+T = TypeVar("T")
+
+
+class JobCancelled(BaseException):
+    """Raised at the next checkpoint after a job is cancelled.
+
+    Derives from BaseException (like asyncio.CancelledError) so the many
+    ``except Exception`` fallbacks in the pipeline, DSPy's ReAct tool loop and DSPy's
+    callback runner do not swallow it.
+    """
+
+
+class DeadlineExceeded(JobCancelled):
+    """A stage (or the whole job) ran past its configured deadline."""
+
+
+class CancelToken:
+    """Cancellation state for a job or one of its stages.
+
+    Cancelling a token cancels its children and runs `on_cancel` callbacks (close a
+    browser, kill a subprocess, ...). A token's deadline is the earlier of its own and
+    its parent's.
+    """
+
+    def __init__(
+        self,
+        parent: Optional["CancelToken"] = None,
+        timeout: Optional[float] = None,
+        deadlines: Optional[Dict[str, float]] = None,
+        name: str = "job",
+    ) -> None:
+        self.name = name
+        self.parent = parent
+        self.deadlines = dict(deadlines or (parent.deadlines if parent else {}))
+        self.reason: Optional[str] = None
+        self._exc_type: Type[JobCancelled] = JobCancelled
+        self._lock = Lock()
+        self._callbacks: List[Callable[[], Any]] = []
+        self._children: List["CancelToken"] = []
+        self._deadline = time.monotonic() + timeout if timeout is not None else None
+        self._timer: Optional[Timer] = None
+        if timeout is not None:
+            self._timer = Timer(max(timeout, 0.0), self.cancel, args=(f"{name} exceeded {timeout:g}s deadline", DeadlineExceeded))
+            self._timer.daemon = True
+            self._timer.start()
+        if parent is not None:
+            parent._adopt(self)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.reason is not None
+
+    def _adopt(self, child: "CancelToken") -> None:
+        with self._lock:
+            if self.reason is None:
+                self._children.append(child)
+                return
+        child.cancel(self.reason, self._exc_type)
+
+    def cancel(self, reason: str = "cancelled", exc_type: Type[JobCancelled] = JobCancelled) -> None:
+        with self._lock:
+            if self.reason is not None:
+                return
+            self.reason = reason
+            self._exc_type = exc_type
+            callbacks, self._callbacks = self._callbacks, []
+            children = list(self._children)
+        logger.info("cancel | %s | reason=%s", self.name, reason)
+        for child in children:
+            child.cancel(reason, exc_type)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("cancel.callback_failed | %s | err=%s", self.name, exc)
+
+    def on_cancel(self, callback: Callable[[], Any]) -> Callable[[], None]:
+        """Run `callback` on cancellation (immediately if already cancelled); returns an unregister fn."""
+        with self._lock:
+            if self.reason is None:
+                self._callbacks.append(callback)
+                return lambda: self._discard(callback)
+        callback()
+        return lambda: None
+
+    def _discard(self, callback: Callable[[], Any]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the nearest deadline (this token or an ancestor), or None."""
+        own = self._deadline - time.monotonic() if self._deadline is not None else None
+        inherited = self.parent.remaining() if self.parent is not None else None
+        candidates = [v for v in (own, inherited) if v is not None]
+        return max(min(candidates), 0.0) if candidates else None
+
+    def raise_if_cancelled(self) -> None:
+        if self.reason is not None:
+            raise self._exc_type(self.reason)
+
+    def close(self) -> None:
+        """Stop the deadline timer and detach from the parent (end of stage/job)."""
+        if self._timer is not None:
+            self._timer.cancel()
+        if self.parent is not None:
+            with self.parent._lock:
+                if self in self.parent._children:
+                    self.parent._children.remove(self)
+
+
+_current: ContextVar[Optional[CancelToken]] = ContextVar("ych_cancel_token", default=None)
+
+
+def current_token() -> Optional[CancelToken]:
+    return _current.get()
+
+
+def check_cancelled() -> None:
+    """Checkpoint: raise JobCancelled/DeadlineExceeded if the current job or stage was cancelled."""
+    token = _current.get()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+def bounded_timeout(default: float) -> float:
+    """`default` seconds, shortened to the current job/stage's remaining time."""
+    token = _current.get()
+    remaining = token.remaining() if token is not None else None
+    return default if remaining is None else max(min(default, remaining), 0.001)
+
+
+@contextmanager
+def job_scope(token: CancelToken) -> Iterator[CancelToken]:
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+        token.close()
+
+
+@contextmanager
+def stage_scope(stage: str) -> Iterator[Optional[CancelToken]]:
+    """Run a stage under a child token honouring the job's `deadlines[stage]`.
+
+    Outside a job (tests, scripts) this is a no-op.
+    """
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    parent.raise_if_cancelled()
+    token = CancelToken(parent, timeout=parent.deadlines.get(stage), name=f"stage {stage}")
+    reset = _current.set(token)
+    try:
+        yield token
+        token.raise_if_cancelled()
+    finally:
+        _current.reset(reset)
+        token.close()
+
+
+def run_cancellable(coro: Coroutine[Any, Any, T]) -> T:
+    """`asyncio.run(coro)`, cancelling the coroutine's task when the current token is cancelled.
+
+    The task unwinds through its `finally`/`async with` blocks (closing browsers and
+    clients) before JobCancelled or DeadlineExceeded is raised here.
+    """
+    token = _current.get()
+    if token is None:
+        return asyncio.run(coro)
+
+    async def _main() -> T:
+        task = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        unregister = token.on_cancel(lambda: loop.call_soon_threadsafe(task.cancel))  # type: ignore[union-attr]
+        try:
+            return await coro
+        finally:
+            unregister()
+
+    try:
+        return asyncio.run(_main())
+    except asyncio.CancelledError:
+        token.raise_if_cancelled()
+        raise
+
+
+async def within_deadline(aw: Awaitable[T]) -> T:
+    """Await `aw`, giving up with DeadlineExceeded once the current stage runs out of time."""
+    token = _current.get()
+    remaining = token.remaining() if token is not None else None
+    if remaining is None:
+        return await aw
+    try:
+        return await asyncio.wait_for(aw, timeout=max(remaining, 0.001))
+    except asyncio.TimeoutError:
+        token.raise_if_cancelled()  # type: ignore[union-attr]
+        raise DeadlineExceeded(f"{token.name} exceeded its deadline") from None  # type: ignore[union-attr]
+
+
+class _CancelRegistry:
+    """Tokens of jobs running in this process, so DELETE can reach them."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._tokens: Dict[Tuple[str, str], CancelToken] = {}
+
+    def register(self, kind: str, job_id: str, deadlines: Optional[Dict[str, float]] = None) -> CancelToken:
+        deadlines = {k: float(v) for k, v in (deadlines or {}).items() if v}
+        token = CancelToken(timeout=deadlines.get("total"), deadlines=deadlines, name=f"{kind}:{job_id}")
+        with self._lock:
+            self._tokens[(kind, job_id)] = token
+        return token
+
+    def release(self, kind: str, job_id: str) -> None:
+        with self._lock:
+            self._tokens.pop((kind, job_id), None)
+
+    def cancel(self, kind: str, job_id: str, reason: str) -> bool:
+        with self._lock:
+            token = self._tokens.get((kind, job_id))
+        if token is None:
+            return False
+        token.cancel(reason)
+        return True
+
+
+cancellations = _CancelRegistry()
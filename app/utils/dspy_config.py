@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import logging
 import os
+import time
+from threading import Lock
+from typing import Any, Dict
 
 from dotenv import load_dotenv
 
@@ -17,6 +20,42 @@ PROVIDER_DEFAULTS = {
 }
 
 
+def _lm_metrics_callback() -> Any:
+    """DSPy callback recording every LM call's latency (metrics) and an `lm.call` span.
+
+    It is also the cancellation checkpoint before each LM call: JobCancelled is a
+    BaseException, so it escapes DSPy's callback error handling and aborts the module.
+    """
+    from dspy.utils.callback import BaseCallback  # type: ignore
+
+    from app.utils.cancellation import check_cancelled
+
+    from app.utils.metrics import LM_CALL_SECONDS, STAGE_FAILURES
+    from app.utils.tracing import start_span
+
+    class LMMetricsCallback(BaseCallback):  # type: ignore[misc]
+        def __init__(self) -> None:
+            self._started: Dict[str, tuple[float, str, Any]] = {}
+
+        def on_lm_start(self, call_id: str, instance: Any, inputs: Dict[str, Any]) -> None:
+            check_cancelled()
+            model = str(getattr(instance, "model", "unknown"))
+            self._started[call_id] = (time.perf_counter(), model, start_span("lm.call", model=model))
+
+        def on_lm_end(self, call_id: str, outputs: Dict[str, Any] | None, exception: BaseException | None = None) -> None:
+            started = self._started.pop(call_id, None)
+            if started is None:
+                return
+            t0, model, lm_span = started
+            LM_CALL_SECONDS.observe(time.perf_counter() - t0, model=model)
+            if exception is not None:
+                STAGE_FAILURES.inc(kind="generate", stage="lm_call")
+                lm_span.set_error(exception)
+            lm_span.end()
+
+    return LMMetricsCallback()
+
+
 def configure_from_env() -> None:
     # Import dspy lazily to avoid hard import error during module import
     try:
@@ -27,6 +66,15 @@ def configure_from_env() -> None:
     provider = os.getenv("LLM_PROVIDER", "gemini").lower()
     model = os.getenv("LLM_MODEL", "gemini/gemini-2.5-pro")
 
+    if provider == "replay":
+        from app.utils.lm_cassette import DEFAULT_CASSETTE_PATH, ReplayLM
+
+        path = os.getenv("LM_CASSETTE", str(DEFAULT_CASSETTE_PATH))
+        lm = ReplayLM(path, latency=os.getenv("LM_REPLAY_LATENCY", "original").lower())
+        dspy.configure(lm=lm, adapter=dspy.TwoStepAdapter(lm), callbacks=[_lm_metrics_callback()])
+        logger.info("DSPy configured | provider=replay | cassette=%s", path)
+        return
+
     if provider not in PROVIDER_DEFAULTS:
         logger.warning("Unknown LLM_PROVIDER=%s; defaulting to openai", provider)
         provider = "openai"
@@ -39,16 +87,43 @@ def configure_from_env() -> None:
         logger.error("Missing API key for provider=%s (expected %s)", provider, key_env)
         return
 
-    lm = dspy.LM(model, api_key=api_key, max_tokens=100000)  # type: ignore[arg-type]
+    record_path = os.getenv("LM_RECORD_CASSETTE")
+    # Recording bypasses the DSPy cache so every call (and its real latency) is captured
+    lm = dspy.LM(model, api_key=api_key, max_tokens=100000, cache=not record_path)  # type: ignore[arg-type]
+    if record_path:
+        from app.utils.lm_cassette import RecordingLM
+
+        lm = RecordingLM(lm, record_path)
+        logger.info("DSPy recording LM calls | cassette=%s", record_path)
     adapter = dspy.TwoStepAdapter(lm)
-    dspy.configure(lm=lm, adapter=adapter)
+    dspy.configure(lm=lm, adapter=adapter, callbacks=[_lm_metrics_callback()])
     logger.info("DSPy configured | provider=%s | model=%s", provider, model)
 
 
-# Configure at import
-try:
-    configure_from_env()
-except Exception as exc:  # pragma: no cover
-    logger.exception("Failed to configure DSPy: %s", exc)
+_configure_lock = Lock()
+_configured = False
+
+
+def ensure_configured() -> None:
+    """Configure DSPy from the environment exactly once per process.
+
+    Called from the API lifespan hook (in-process job runner only) and before generation
+    jobs (workers, scripts). An LM configured by the embedding program (tests, benchmarks)
+    is left untouched.
+    """
+    global _configured
+    if _configured:
+        return
+    with _configure_lock:
+        if _configured:
+            return
+        try:
+            import dspy  # type: ignore
+
+            if dspy.settings.lm is None:
+                configure_from_env()
+        except Exception as exc:  # pragma: no cover
+            logger.exception("Failed to configure DSPy: %s", exc)
+        _configured = True
 
 
@@ -1,14 +1,72 @@
 from __future__ import annotations
 
-from threading import RLock
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from threading import RLock, local
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.utils.metrics import JOB_QUEUE_WAIT_SECONDS
+from app.utils.tenants import PRIORITIES
 
 
 logger = logging.getLogger("ych.jobs")
 
 
+# Fields returned by get_job (status API); the rest is scheduling bookkeeping
+PUBLIC_FIELDS = ("status", "result", "error", "trace_id", "phases")
+# Seconds of recent service time that count towards a tenant's fair share
+FAIR_SHARE_WINDOW = float(os.getenv("JOB_FAIR_SHARE_WINDOW", "600"))
+
+
+def batch_limits_from_env(kinds: Iterable[str], default: Optional[int] = None) -> Dict[str, Optional[int]]:
+    """Max concurrently running batch jobs per kind (JOB_BATCH_MAX_RUNNING_<KIND>); None = no cap."""
+    limits: Dict[str, Optional[int]] = {}
+    for kind in kinds:
+        raw = os.getenv(f"JOB_BATCH_MAX_RUNNING_{kind.upper()}")
+        limits[kind] = int(raw) if raw else default
+    return limits
+
+
+def _choose(
+    heads: List[Dict[str, Any]],
+    usage: Dict[Tuple[str, str, str], Tuple[float, float]],
+    batch_running: Dict[str, int],
+    batch_limits: Optional[Dict[str, Optional[int]]],
+) -> Optional[Dict[str, Any]]:
+    """Pick the next job among the oldest queued job of each (kind, tenant, priority).
+
+    Interactive jobs always go before batch jobs, and batch jobs never occupy more than
+    `batch_limits[kind]` running slots, so a backfill leaves room for interactive work.
+    Within a class, tenants are served weighted-fair: fewest running jobs per unit of
+    weight first, then least recent service time per weight (whole seconds), then FIFO.
+    `usage` maps (kind, tenant, priority) to (running jobs, service seconds in the window).
+    """
+    limits = batch_limits or {}
+    eligible = [
+        h for h in heads
+        if h["priority"] != "batch" or limits.get(h["kind"]) is None or batch_running.get(h["kind"], 0) < limits[h["kind"]]
+    ]
+    if not eligible:
+        return None
+
+    def rank(h: Dict[str, Any]) -> Tuple[int, float, int, float]:
+        running, seconds = usage.get((h["kind"], h["tenant"], h["priority"]), (0, 0.0))
+        weight = max(float(h["weight"] or 1.0), 0.01)
+        priority = PRIORITIES.index(h["priority"]) if h["priority"] in PRIORITIES else len(PRIORITIES)
+        return priority, running / weight, int(seconds / weight), h["created_at"]
+
+    return min(eligible, key=rank)
+
+
 class _Jobs:
+    """In-process job store; jobs run on dispatcher threads in the API process."""
+
+    out_of_process = False
+
     def __init__(self) -> None:
         self._lock = RLock()
         self._store: Dict[str, Dict[str, Dict[str, Any]]] = {
@@ -16,32 +74,448 @@ class _Jobs:
             "generate": {},
         }
 
-    def create_job(self, kind: str, job_id: str) -> None:
+    def create_job(
+        self,
+        kind: str,
+        job_id: str,
+        trace_id: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        parent_span_id: Optional[str] = None,
+        tenant: str = "anonymous",
+        priority: str = "interactive",
+        weight: float = 1.0,
+    ) -> None:
+        with self._lock:
+            self._store[kind][job_id] = {
+                "status": "queued", "result": None, "error": None, "trace_id": trace_id, "phases": None,
+                "payload": payload or {}, "parent_span_id": parent_span_id,
+                "tenant": tenant, "priority": priority, "weight": weight,
+                "created_at": time.time(), "started_at": None, "finished_at": None,
+            }
+        logger.info("job.create | %s:%s | tenant=%s | priority=%s", kind, job_id, tenant, priority)
+
+    def claim(
+        self, kinds: Iterable[str], worker: str, batch_limits: Optional[Dict[str, Optional[int]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Move the next queued job of `kinds` (see `_choose`) to running."""
+        now = time.time()
+        since = now - FAIR_SHARE_WINDOW
         with self._lock:
-            self._store[kind][job_id] = {"status": "queued", "result": None, "error": None}
-        logger.info("job.create | %s:%s", kind, job_id)
+            heads: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+            usage: Dict[Tuple[str, str, str], Tuple[float, float]] = {}
+            batch_running: Dict[str, int] = {}
+            for kind in kinds:
+                for job_id, job in self._store[kind].items():
+                    if job["status"] == "queued":
+                        key = (kind, job["tenant"], job["priority"])
+                        if key not in heads or job["created_at"] < heads[key]["created_at"]:
+                            heads[key] = {**job, "kind": kind, "id": job_id}
+                        continue
+                    if job["started_at"] is None or (job["finished_at"] is not None and job["finished_at"] <= since):
+                        continue
+                    running = job["status"] == "running"
+                    seconds = min(job["finished_at"] or now, now) - max(job["started_at"], since)
+                    key = (kind, job["tenant"], job["priority"])
+                    prev = usage.get(key, (0, 0.0))
+                    usage[key] = (prev[0] + running, prev[1] + seconds)
+                    if running and job["priority"] == "batch":
+                        batch_running[kind] = batch_running.get(kind, 0) + 1
+            head = _choose(list(heads.values()), usage, batch_running, batch_limits)
+            if head is None:
+                return None
+            job = self._store[head["kind"]][head["id"]]
+            job["status"] = "running"
+            job["started_at"] = now
+        JOB_QUEUE_WAIT_SECONDS.observe(now - head["created_at"], kind=head["kind"], priority=head["priority"])
+        logger.info("job.claim | %s:%s | worker=%s | tenant=%s | priority=%s", head["kind"], head["id"], worker, head["tenant"], head["priority"])
+        return {k: head[k] for k in ("kind", "id", "payload", "trace_id", "parent_span_id")}
 
-    def complete_job(self, kind: str, job_id: str, result: Dict[str, Any]) -> None:
+    def start_job(self, kind: str, job_id: str) -> None:
         with self._lock:
             job = self._store[kind].get(job_id)
             if job is not None:
-                job["status"] = "done"
+                job["status"] = "running"
+                job["started_at"] = job["started_at"] or time.time()
+        logger.info("job.start | %s:%s", kind, job_id)
+
+    def update_progress(self, kind: str, job_id: str, result: Dict[str, Any], phases: Dict[str, str]) -> None:
+        """Publish a running job's partial result and per-phase status; ignored once it has finished."""
+        with self._lock:
+            job = self._store[kind].get(job_id)
+            if job is not None and job["status"] == "running":
                 job["result"] = result
-                job["error"] = None
+                job["phases"] = phases
+        logger.debug("job.progress | %s:%s | %s", kind, job_id, phases)
+
+    def _finish(self, kind: str, job_id: str, **fields: Any) -> bool:
+        """Move a running job to a terminal state; False if it already left `running`."""
+        with self._lock:
+            job = self._store[kind].get(job_id)
+            if job is None or job["status"] != "running":
+                return False
+            job.update(fields, finished_at=time.time())
+            return True
+
+    def complete_job(self, kind: str, job_id: str, result: Dict[str, Any]) -> bool:
+        if not self._finish(kind, job_id, status="done", result=result, error=None):
+            logger.info("job.done.ignored | %s:%s | no longer running", kind, job_id)
+            return False
         logger.info("job.done | %s:%s", kind, job_id)
+        return True
 
-    def fail_job(self, kind: str, job_id: str, error: Dict[str, Any]) -> None:
+    def fail_job(self, kind: str, job_id: str, error: Dict[str, Any]) -> bool:
+        if not self._finish(kind, job_id, status="error", error=error):
+            logger.info("job.error.ignored | %s:%s | no longer running", kind, job_id)
+            return False
+        logger.info("job.error | %s:%s | %s", kind, job_id, (error or {}).get("error"))
+        return True
+
+    def request_cancel(self, kind: str, job_id: str) -> Optional[str]:
+        """Cancel a queued job outright, or flag a running one; returns the resulting status."""
+        with self._lock:
+            job = self._store[kind].get(job_id)
+            if job is None:
+                return None
+            if job["status"] == "queued":
+                job["status"] = "cancelled"
+                job["error"] = {"error": "cancelled before start"}
+                job["finished_at"] = time.time()
+                logger.info("job.cancelled | %s:%s | before start", kind, job_id)
+            elif job["status"] == "running":
+                job["cancel_requested"] = True
+                logger.info("job.cancel_requested | %s:%s", kind, job_id)
+                return "cancelling"
+            return job["status"]
+
+    def is_cancel_requested(self, kind: str, job_id: str) -> bool:
+        with self._lock:
+            return bool((self._store[kind].get(job_id) or {}).get("cancel_requested"))
+
+    def cancel_job(self, kind: str, job_id: str, reason: str) -> bool:
+        if not self._finish(kind, job_id, status="cancelled", error={"error": reason}):
+            logger.info("job.cancelled.ignored | %s:%s | no longer running", kind, job_id)
+            return False
+        logger.info("job.cancelled | %s:%s | %s", kind, job_id, reason)
+        return True
+
+    def expire_job(self, kind: str, job_id: str, reason: str) -> None:
+        """Mark a job whose artifacts were evicted from disk."""
         with self._lock:
             job = self._store[kind].get(job_id)
             if job is not None:
-                job["status"] = "error"
-                job["error"] = error
-        logger.info("job.error | %s:%s | %s", kind, job_id, (error or {}).get("error"))
+                job["status"] = "expired"
+                job["error"] = {"error": f"artifacts evicted ({reason})"}
+        logger.info("job.expired | %s:%s | %s", kind, job_id, reason)
 
     def get_job(self, kind: str, job_id: str) -> Optional[Dict[str, Any]]:
         with self._lock:
             job = self._store.get(kind, {}).get(job_id)
-            return dict(job) if job is not None else None
+            if job is None:
+                return None
+            return {k: job[k] for k in PUBLIC_FIELDS}
+
+    def status_counts(self) -> Dict[Tuple[str, str], int]:
+        counts: Dict[Tuple[str, str], int] = {}
+        with self._lock:
+            for kind, store in self._store.items():
+                for job in store.values():
+                    key = (kind, job["status"])
+                    counts[key] = counts.get(key, 0) + 1
+        return counts
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT,
+    result TEXT,
+    error TEXT,
+    trace_id TEXT,
+    parent_span_id TEXT,
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    tenant TEXT NOT NULL DEFAULT 'anonymous',
+    priority TEXT NOT NULL DEFAULT 'interactive',
+    weight REAL NOT NULL DEFAULT 1,
+    phases TEXT,
+    PRIMARY KEY (kind, id)
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (kind, status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_by_start ON jobs (started_at);
+"""
+
+# Columns added after the first release, for queue files created by older versions
+_ADDED_COLUMNS = {
+    "cancel_requested": "INTEGER NOT NULL DEFAULT 0",
+    "tenant": "TEXT NOT NULL DEFAULT 'anonymous'",
+    "priority": "TEXT NOT NULL DEFAULT 'interactive'",
+    "weight": "REAL NOT NULL DEFAULT 1",
+    "phases": "TEXT",
+}
+
+
+def _loads(value: Optional[str]) -> Any:
+    return json.loads(value) if value else None
+
+
+class _SqliteJobs:
+    """Job store and queue in a local SQLite file shared by the API and worker processes.
+
+    The API only enqueues and reads status; `python -m app.worker` claims queued jobs.
+    Claiming is a single IMMEDIATE transaction, so concurrent workers never share a job.
+    """
+
+    out_of_process = True
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._local = local()
+        # Claims already fed into JOB_QUEUE_WAIT_SECONDS (see observe_queue_waits)
+        self._waits_seen = time.time()
+        self._waits_lock = RLock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {r["name"] for r in conn.execute("PRAGMA table_info(jobs)")}
+            for name, ddl in _ADDED_COLUMNS.items():
+                if name not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {ddl}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _update(self, kind: str, job_id: str, **fields: Any) -> None:
+        cols = ", ".join(f"{k} = ?" for k in fields)
+        self._connect().execute(f"UPDATE jobs SET {cols} WHERE kind = ? AND id = ?", (*fields.values(), kind, job_id))
+
+    def create_job(
+        self,
+        kind: str,
+        job_id: str,
+        trace_id: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        parent_span_id: Optional[str] = None,
+        tenant: str = "anonymous",
+        priority: str = "interactive",
+        weight: float = 1.0,
+    ) -> None:
+        self._connect().execute(
+            "INSERT INTO jobs (kind, id, status, payload, trace_id, parent_span_id, tenant, priority, weight, created_at) "
+            "VALUES (?, ?, 'queued', ?, ?, ?, ?, ?, ?, ?)",
+            (kind, job_id, json.dumps(payload or {}), trace_id, parent_span_id, tenant, priority, weight, time.time()),
+        )
+        logger.info("job.create | %s:%s | queue=sqlite | tenant=%s | priority=%s", kind, job_id, tenant, priority)
+
+    def claim(
+        self, kinds: Iterable[str], worker: str, batch_limits: Optional[Dict[str, Optional[int]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Atomically move the next queued job of `kinds` (see `_choose`) to running for `worker`."""
+        kinds = tuple(kinds)
+        marks = ",".join("?" * len(kinds))
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            since = now - FAIR_SHARE_WINDOW
+            heads = [dict(r) for r in conn.execute(
+                "SELECT kind, id, payload, trace_id, parent_span_id, tenant, priority, weight, created_at FROM ("
+                "  SELECT *, ROW_NUMBER() OVER (PARTITION BY kind, tenant, priority ORDER BY created_at, rowid) AS rn"
+                f"  FROM jobs WHERE status = 'queued' AND kind IN ({marks})"
+                ") WHERE rn = 1",
+                kinds,
+            )]
+            head = None
+            if heads:
+                usage: Dict[Tuple[str, str, str], Tuple[float, float]] = {}
+                batch_running: Dict[str, int] = {}
+                for r in conn.execute(
+                    "SELECT kind, tenant, priority, SUM(status = 'running') AS running, "
+                    "SUM(MIN(COALESCE(finished_at, ?), ?) - MAX(started_at, ?)) AS seconds FROM jobs "
+                    f"WHERE kind IN ({marks}) AND started_at IS NOT NULL AND (finished_at IS NULL OR finished_at > ?) "
+                    "GROUP BY kind, tenant, priority",
+                    (now, now, since, *kinds, since),
+                ):
+                    usage[(r["kind"], r["tenant"], r["priority"])] = (r["running"], r["seconds"] or 0.0)
+                    if r["priority"] == "batch":
+                        batch_running[r["kind"]] = batch_running.get(r["kind"], 0) + r["running"]
+                head = _choose(heads, usage, batch_running, batch_limits)
+            if head is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', worker = ?, started_at = ?, heartbeat_at = ?, "
+                    "attempts = attempts + 1 WHERE kind = ? AND id = ?",
+                    (worker, now, now, head["kind"], head["id"]),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if head is None:
+            return None
+        # Queue wait is observed by the API from the shared queue (observe_queue_waits): worker
+        # processes expose no /metrics
+        logger.info("job.claim | %s:%s | worker=%s | tenant=%s | priority=%s", head["kind"], head["id"], worker, head["tenant"], head["priority"])
+        return {
+            "kind": head["kind"],
+            "id": head["id"],
+            "payload": _loads(head["payload"]) or {},
+            "trace_id": head["trace_id"],
+            "parent_span_id": head["parent_span_id"],
+        }
+
+    def observe_queue_waits(self) -> int:
+        """Record the queue wait of jobs any worker claimed since the last call; returns how many."""
+        with self._waits_lock:
+            rows = self._connect().execute(
+                "SELECT kind, priority, created_at, started_at FROM jobs WHERE started_at > ? ORDER BY started_at",
+                (self._waits_seen,),
+            ).fetchall()
+            for r in rows:
+                JOB_QUEUE_WAIT_SECONDS.observe(r["started_at"] - r["created_at"], kind=r["kind"], priority=r["priority"])
+            if rows:
+                self._waits_seen = rows[-1]["started_at"]
+        return len(rows)
+
+    def heartbeat(self, kind: str, job_id: str) -> None:
+        self._update(kind, job_id, heartbeat_at=time.time())
+
+    def start_job(self, kind: str, job_id: str) -> None:
+        now = time.time()
+        self._connect().execute(
+            "UPDATE jobs SET status = 'running', started_at = COALESCE(started_at, ?), heartbeat_at = ? WHERE kind = ? AND id = ?",
+            (now, now, kind, job_id),
+        )
+        logger.info("job.start | %s:%s", kind, job_id)
+
+    def update_progress(self, kind: str, job_id: str, result: Dict[str, Any], phases: Dict[str, str]) -> None:
+        """Publish a running job's partial result and per-phase status; ignored once it has finished."""
+        self._connect().execute(
+            "UPDATE jobs SET result = ?, phases = ? WHERE kind = ? AND id = ? AND status = 'running'",
+            (json.dumps(result, default=str), json.dumps(phases), kind, job_id),
+        )
+        logger.debug("job.progress | %s:%s | %s", kind, job_id, phases)
+
+    def _finish(self, kind: str, job_id: str, **fields: Any) -> bool:
+        """Move a running job to a terminal state; False if it was already reaped or cancelled."""
+        cols = ", ".join(f"{k} = ?" for k in fields)
+        cur = self._connect().execute(
+            f"UPDATE jobs SET {cols}, finished_at = ? WHERE kind = ? AND id = ? AND status = 'running'",
+            (*fields.values(), time.time(), kind, job_id),
+        )
+        return cur.rowcount > 0
+
+    def complete_job(self, kind: str, job_id: str, result: Dict[str, Any]) -> bool:
+        if not self._finish(kind, job_id, status="done", result=json.dumps(result, default=str), error=None):
+            logger.info("job.done.ignored | %s:%s | no longer running", kind, job_id)
+            return False
+        logger.info("job.done | %s:%s", kind, job_id)
+        return True
+
+    def fail_job(self, kind: str, job_id: str, error: Dict[str, Any]) -> bool:
+        if not self._finish(kind, job_id, status="error", error=json.dumps(error, default=str)):
+            logger.info("job.error.ignored | %s:%s | no longer running", kind, job_id)
+            return False
+        logger.info("job.error | %s:%s | %s", kind, job_id, (error or {}).get("error"))
+        return True
+
+    def request_cancel(self, kind: str, job_id: str) -> Optional[str]:
+        """Cancel a queued job outright, or flag a running one for its worker; returns the resulting status."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT status FROM jobs WHERE kind = ? AND id = ?", (kind, job_id)).fetchone()
+            status = row["status"] if row is not None else None
+            if status == "queued":
+                conn.execute(
+                    "UPDATE jobs SET status = 'cancelled', error = ?, finished_at = ? WHERE kind = ? AND id = ?",
+                    (json.dumps({"error": "cancelled before start"}), time.time(), kind, job_id),
+                )
+                status = "cancelled"
+            elif status == "running":
+                conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE kind = ? AND id = ?", (kind, job_id))
+                status = "cancelling"
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if status in ("cancelled", "cancelling"):
+            logger.info("job.cancel_requested | %s:%s | status=%s", kind, job_id, status)
+        return status
+
+    def is_cancel_requested(self, kind: str, job_id: str) -> bool:
+        row = self._connect().execute(
+            "SELECT cancel_requested FROM jobs WHERE kind = ? AND id = ?", (kind, job_id)
+        ).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def cancel_job(self, kind: str, job_id: str, reason: str) -> bool:
+        if not self._finish(kind, job_id, status="cancelled", error=json.dumps({"error": reason})):
+            logger.info("job.cancelled.ignored | %s:%s | no longer running", kind, job_id)
+            return False
+        logger.info("job.cancelled | %s:%s | %s", kind, job_id, reason)
+        return True
+
+    def expire_job(self, kind: str, job_id: str, reason: str) -> None:
+        """Mark a job whose artifacts were evicted from disk."""
+        self._update(kind, job_id, status="expired", error=json.dumps({"error": f"artifacts evicted ({reason})"}))
+        logger.info("job.expired | %s:%s | %s", kind, job_id, reason)
+
+    def fail_running(self, error: str, worker: Optional[str] = None, stale_after: Optional[float] = None) -> int:
+        """Fail running jobs owned by `worker` and/or whose heartbeat is older than `stale_after` seconds."""
+        clauses, params = ["status = 'running'"], []  # type: ignore[var-annotated]
+        if worker is not None:
+            clauses.append("worker = ?")
+            params.append(worker)
+        if stale_after is not None:
+            clauses.append("heartbeat_at < ?")
+            params.append(time.time() - stale_after)
+        cur = self._connect().execute(
+            f"UPDATE jobs SET status = 'error', error = ?, finished_at = ? WHERE {' AND '.join(clauses)}",
+            (json.dumps({"error": error}), time.time(), *params),
+        )
+        if cur.rowcount:
+            logger.warning("job.reaped | count=%s | worker=%s | reason=%s", cur.rowcount, worker, error)
+        return cur.rowcount
+
+    def get_job(self, kind: str, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            "SELECT status, result, error, trace_id, phases FROM jobs WHERE kind = ? AND id = ?", (kind, job_id)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "status": row["status"],
+            "result": _loads(row["result"]),
+            "error": _loads(row["error"]),
+            "trace_id": row["trace_id"],
+            "phases": _loads(row["phases"]),
+        }
+
+    def status_counts(self) -> Dict[Tuple[str, str], int]:
+        rows = self._connect().execute("SELECT kind, status, COUNT(*) AS n FROM jobs GROUP BY kind, status").fetchall()
+        return {(r["kind"], r["status"]): r["n"] for r in rows}
+
+
+def _jobs_from_env() -> Any:
+    backend = os.getenv("JOB_QUEUE", "memory").lower()
+    if backend == "sqlite":
+        return _SqliteJobs(Path(os.getenv("JOB_QUEUE_PATH", "./runtime/jobs.db")).resolve())
+    if backend != "memory":
+        logger.warning("Unknown JOB_QUEUE=%s; using in-memory jobs", backend)
+    return _Jobs()
 
 
-jobs = _Jobs()
+jobs = _jobs_from_env()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import dspy  # type: ignore
+
+
+logger = logging.getLogger("ych.dspy.cassette")
+
+
+DEFAULT_CASSETTE_PATH = Path("./runtime/cassettes/lm.jsonl").resolve()
+
+
+def prompt_key(prompt: Optional[str], messages: Optional[List[Dict[str, Any]]]) -> str:
+    """Stable hash of an LM request's prompt/messages (model and sampling kwargs excluded)."""
+    payload = json.dumps({"prompt": prompt, "messages": messages}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _usage_dict(usage: Any) -> Dict[str, int]:
+    if usage is None:
+        return {}
+    if isinstance(usage, dict):
+        source = usage
+    else:
+        source = {k: getattr(usage, k, None) for k in ("prompt_tokens", "completion_tokens", "total_tokens")}
+    return {k: int(v) for k, v in source.items() if k in ("prompt_tokens", "completion_tokens", "total_tokens") and v is not None}
+
+
+def _response(model: str, outputs: List[Dict[str, Any]], usage: Dict[str, int]) -> Any:
+    """OpenAI-shaped response object as returned by a legacy `forward()`."""
+    choices = [
+        SimpleNamespace(
+            index=i,
+            message=SimpleNamespace(content=o.get("content"), tool_calls=None),
+            finish_reason=o.get("finish_reason", "stop"),
+        )
+        for i, o in enumerate(outputs)
+    ]
+    return SimpleNamespace(choices=choices, usage=dict(usage), model=model)
+
+
+class RecordingLM(dspy.BaseLM):  # type: ignore[misc]
+    """Wraps a live LM and appends every request/response to a JSONL cassette.
+
+    Each entry holds the prompt hash, outputs, latency and token usage, in call order.
+    """
+
+    def __init__(self, inner: Any, path: str) -> None:
+        super().__init__(model=inner.model, model_type=getattr(inner, "model_type", "chat"), cache=False)
+        self.inner = inner
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def forward(self, prompt: Optional[str] = None, messages: Optional[List[Dict[str, Any]]] = None, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        response = self.inner.forward(prompt=prompt, messages=messages, **kwargs)
+        latency = time.perf_counter() - start
+        entry = {
+            "key": prompt_key(prompt, messages),
+            "model": self.model,
+            "outputs": [
+                {"content": getattr(c.message, "content", None), "finish_reason": getattr(c, "finish_reason", "stop")}
+                for c in response.choices
+            ],
+            "usage": _usage_dict(getattr(response, "usage", None)),
+            "latency_s": round(latency, 4),
+            "recorded_at": time.time(),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write(line)
+        logger.debug("cassette.record | key=%s | latency=%.3fs", entry["key"][:12], latency)
+        return response
+
+
+class ReplayLM(dspy.BaseLM):  # type: ignore[misc]
+    """Serves responses from a cassette recorded by RecordingLM, with no network access.
+
+    Repeated prompts are answered in recorded order (the last answer repeats once exhausted).
+    With ``latency="original"`` each call sleeps for the recorded latency; ``"zero"`` returns
+    immediately. A prompt missing from the cassette raises LookupError.
+    """
+
+    def __init__(self, path: str, latency: str = "original") -> None:
+        if latency not in ("original", "zero"):
+            raise ValueError(f"latency must be 'original' or 'zero', got {latency!r}")
+        self.path = Path(path)
+        self.latency = latency
+        self.calls = 0
+        self.misses = 0
+        self._entries: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._cursor: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        model = "replay/unknown"
+        with self.path.open(encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]].append(entry)
+                    model = entry.get("model") or model
+        super().__init__(model=model, cache=False)
+        logger.info("cassette.loaded | path=%s | prompts=%s | latency=%s", self.path, len(self._entries), latency)
+
+    def forward(self, prompt: Optional[str] = None, messages: Optional[List[Dict[str, Any]]] = None, **kwargs: Any) -> Any:
+        key = prompt_key(prompt, messages)
+        with self._lock:
+            self.calls += 1
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                raise LookupError(f"LM cassette miss: no recorded response for prompt {key[:12]} in {self.path}")
+            idx = min(self._cursor[key], len(entries) - 1)
+            self._cursor[key] += 1
+        entry = entries[idx]
+        if self.latency == "original" and entry.get("latency_s"):
+            time.sleep(float(entry["latency_s"]))
+        return _response(entry.get("model") or self.model, entry["outputs"], entry.get("usage") or {})
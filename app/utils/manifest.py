@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, List, Mapping, Union
+
+
+logger = logging.getLogger("ych.manifest")
+
+
+MANIFEST_NAME = ".ych-manifest.json"
+
+Content = Union[str, bytes]
+
+
+def content_hash(content: Content) -> str:
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_manifest(path: Union[str, Path]) -> Dict[str, str]:
+    """Load a path -> sha256 manifest; `path` may be the manifest file or its project dir."""
+    p = Path(path)
+    if p.is_dir():
+        p = p / MANIFEST_NAME
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+        return {str(k): str(v) for k, v in (data.get("files") or {}).items()}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path: Union[str, Path], manifest: Mapping[str, str]) -> None:
+    p = Path(path)
+    if p.is_dir():
+        p = p / MANIFEST_NAME
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(json.dumps({"files": dict(sorted(manifest.items()))}, indent=2), encoding="utf-8")
+
+
+def diff_manifest(old: Mapping[str, str], new: Mapping[str, str]) -> Dict[str, List[str]]:
+    """Compare two manifests; lists are sorted paths."""
+    return {
+        "added": sorted(p for p in new if p not in old),
+        "changed": sorted(p for p in new if p in old and old[p] != new[p]),
+        "removed": sorted(p for p in old if p not in new),
+        "unchanged": sorted(p for p in new if old.get(p) == new[p]),
+    }
+
+
+def changed_paths(diff: Mapping[str, List[str]]) -> List[str]:
+    return sorted([*diff.get("added", []), *diff.get("changed", [])])
+
+
+def sync_files(root: Union[str, Path], files: Mapping[str, Content]) -> Dict[str, List[str]]:
+    """Write only files whose content hash differs from the project's manifest.
+
+    Files that dropped out of the generated set are deleted. The manifest is stored
+    inside `root` and describes exactly the files this function owns there. Files are
+    private copies (tools such as `next dev` edit them in place), and a changed file is
+    replaced rather than written through, so a hard link left by an older run is broken.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    old = load_manifest(root)
+    new = {rel: content_hash(content) for rel, content in files.items()}
+    diff = diff_manifest(old, new)
+    # A file deleted or edited out-of-band is rewritten even if the manifest matches
+    for rel in list(diff["unchanged"]):
+        path = root / rel
+        if not path.is_file() or content_hash(path.read_bytes()) != new[rel]:
+            diff["unchanged"].remove(rel)
+            diff["changed"].append(rel)
+    diff["changed"].sort()
+
+    for rel in changed_paths(diff):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        content = files[rel]
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_bytes(content.encode("utf-8") if isinstance(content, str) else content)
+        os.replace(tmp, path)
+    for rel in diff["removed"]:
+        (root / rel).unlink(missing_ok=True)
+    if diff["added"] or diff["changed"] or diff["removed"] or not (root / MANIFEST_NAME).exists():
+        save_manifest(root, new)
+    logger.info(
+        "manifest.sync | root=%s | added=%s changed=%s removed=%s unchanged=%s",
+        root, len(diff["added"]), len(diff["changed"]), len(diff["removed"]), len(diff["unchanged"]),
+    )
+    return diff
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.utils.cancellation import DeadlineExceeded, JobCancelled, stage_scope
+from app.utils.tracing import span
+
+
+# Seconds; spans sub-second browser steps up to multi-minute builds and ReAct loops
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+LabelValues = Tuple[str, ...]
+
+
+def _fmt(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _samples(self) -> List[str]:  # pragma: no cover - overridden
+        return []
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Settable gauge; with `collect`, values are computed at scrape time instead."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        collect: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._collect = collect
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        if self._collect is not None:
+            return self._collect().get(self._key(labels), 0.0)
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        if self._collect is not None:
+            items = sorted(self._collect().items())
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [bucket counts..., +Inf count], sum
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[key] = series
+            series[0][idx] += 1
+            series[1][0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return sum(series[0]) if series else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(c), s[0])) for k, (c, s) in self._series.items())
+        lines: List[str] = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip((*self.buckets, math.inf), counts):
+                cumulative += n
+                le = 'le="' + _fmt(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+REGISTRY: List[_Metric] = []
+
+
+def render_metrics() -> str:
+    """Prometheus text exposition format (0.0.4) for every registered metric."""
+    _observe_queue_waits()
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _job_counts() -> Dict[LabelValues, float]:
+    from app.utils.jobs import jobs
+
+    return {(kind, status): float(n) for (kind, status), n in jobs.status_counts().items()}
+
+
+def _observe_queue_waits() -> None:
+    """With a shared queue, jobs are claimed in worker processes; read their waits from it."""
+    from app.utils.jobs import jobs
+
+    if jobs.out_of_process:
+        jobs.observe_queue_waits()
+
+
+def _artifact_stats() -> Dict[str, float]:
+    from app.utils.storage import blobs
+
+    return blobs.stats()
+
+
+AUDIT_PHASE_SECONDS = Histogram(
+    "ych_audit_phase_seconds", "Audit phase latency (launch, goto, settle, lab, screenshots, axe, psi)", ["phase"]
+)
+GENERATE_STAGE_SECONDS = Histogram(
+    "ych_generate_stage_seconds", "Generation stage latency (copy_llm, dev_server, react, lint, build, push)", ["stage"]
+)
+LM_CALL_SECONDS = Histogram("ych_lm_call_seconds", "Latency of individual LM calls", ["model"])
+STAGE_FAILURES = Counter("ych_stage_failures_total", "Failures by job kind and stage", ["kind", "stage"])
+JOBS = Gauge("ych_jobs", "Jobs in the store by kind and status (queued, running, done, error, cancelled, expired)", ["kind", "status"], collect=_job_counts)
+JOB_QUEUE_WAIT_SECONDS = Histogram(
+    "ych_job_queue_wait_seconds", "Time jobs spent queued before a slot claimed them", ["kind", "priority"]
+)
+ORIGIN_WAIT_SECONDS = Histogram(
+    "ych_origin_wait_seconds", "Time spent waiting for a per-origin politeness slot", ["resource"]
+)
+ORIGIN_DEFERRALS = Counter(
+    "ych_origin_deferrals_total", "429/503 responses that deferred later requests to the origin", ["resource", "status"]
+)
+ORIGIN_LOADS_ACTIVE = Gauge("ych_origin_loads_active", "Page loads and PSI calls holding an origin slot", ["resource"])
+AUDIT_BLOCKED_REQUESTS = Counter(
+    "ych_audit_blocked_requests_total", "Requests aborted by the fast audit profile", ["reason"]
+)
+AUDIT_READINESS = Counter(
+    "ych_audit_readiness_total", "How audited pages were judged ready (quiet, cap, load_timeout, networkidle)", ["reason"]
+)
+ARTIFACT_BYTES = Counter(
+    "ych_artifact_bytes_total",
+    "Artifact bytes written to job directories, by outcome (stored, deduplicated, copied)",
+    ["kind", "outcome"],
+)
+ARTIFACT_STORE_BYTES = Gauge(
+    "ych_artifact_store_bytes",
+    "Artifact store size: stored (unique blobs) and logical (as linked from job directories)",
+    ["measure"],
+    collect=lambda: {(m,): _artifact_stats()[f"{m}_bytes"] for m in ("stored", "logical")},
+)
+ARTIFACT_DEDUP_RATIO = Gauge(
+    "ych_artifact_dedup_ratio", "Logical artifact bytes per stored byte",
+    collect=lambda: {(): _artifact_stats()["dedup_ratio"]},
+)
+BROWSERS_ACTIVE = Gauge("ych_browsers_active", "Chromium instances currently launched for audits")
+BROWSERS_ACTIVE.set(0)
+
+_STAGE_HISTOGRAMS = {"audit": AUDIT_PHASE_SECONDS, "generate": GENERATE_STAGE_SECONDS}
+
+
+@contextmanager
+def track_stage(kind: str, stage: str) -> Iterator[None]:
+    """Time a stage into the kind's histogram and a trace span; count it as failed if it raises.
+
+    The stage also runs under the job's cancel token, with `deadlines[stage]` if one was requested.
+    """
+    histogram = _STAGE_HISTOGRAMS[kind]
+    label = "phase" if kind == "audit" else "stage"
+    start = time.perf_counter()
+    try:
+        with span(f"{kind}.{stage}"), stage_scope(stage):
+            yield
+    except JobCancelled as exc:
+        # A missed deadline is a stage failure; a cancel requested by the client is not
+        if isinstance(exc, DeadlineExceeded):
+            STAGE_FAILURES.inc(kind=kind, stage=stage)
+        raise
+    except BaseException:
+        STAGE_FAILURES.inc(kind=kind, stage=stage)
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - start, **{label: stage})
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from threading import RLock, local
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from app.utils.cancellation import check_cancelled
+from app.utils.metrics import ORIGIN_DEFERRALS, ORIGIN_LOADS_ACTIVE, ORIGIN_WAIT_SECONDS
+
+
+logger = logging.getLogger("ych.politeness")
+
+
+# Longest Retry-After we honour; anything beyond is treated as this many seconds
+MAX_RETRY_AFTER = 300.0
+# Poll step while waiting for a slot (also how fast a cancel interrupts the wait)
+_WAIT_STEP = 0.25
+
+
+class OriginBusy(Exception):
+    """No slot on the origin within the caller's `max_wait` (e.g. it is deferred by a 429)."""
+
+    def __init__(self, origin: str, wait: float) -> None:
+        super().__init__(f"{origin} not available for another {wait:.0f}s")
+        self.origin = origin
+        self.wait = wait
+
+
+def origin_of(url: str) -> str:
+    """Limiter key: lowercased host[:port] of `url`."""
+    parts = urlsplit(url)
+    return (parts.netloc or parts.path).lower()
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP-date), capped at MAX_RETRY_AFTER."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - (now or time.time())
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+class _MemoryOrigins:
+    """Per-origin slots and next-allowed times for one process."""
+
+    def __init__(self) -> None:
+        self._lock = RLock()
+        self._active: Dict[str, int] = {}
+        self._next_at: Dict[str, float] = {}
+
+    def try_acquire(self, origin: str, holder: str, max_concurrent: int, min_interval: float) -> Optional[float]:
+        """Take a slot and return None, or return how long to wait before trying again."""
+        now = time.time()
+        with self._lock:
+            not_before = self._next_at.get(origin, 0.0)
+            if now < not_before:
+                return not_before - now
+            if self._active.get(origin, 0) >= max_concurrent:
+                return _WAIT_STEP
+            self._active[origin] = self._active.get(origin, 0) + 1
+            self._next_at[origin] = now + min_interval
+            return None
+
+    def release(self, origin: str, holder: str) -> None:
+        with self._lock:
+            active = self._active.get(origin, 0) - 1
+            if active > 0:
+                self._active[origin] = active
+            else:
+                self._active.pop(origin, None)
+
+    def defer(self, origin: str, until: float) -> None:
+        with self._lock:
+            self._next_at[origin] = max(self._next_at.get(origin, 0.0), until)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS origin_leases (
+    origin TEXT NOT NULL,
+    holder TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (origin, holder)
+);
+CREATE TABLE IF NOT EXISTS origin_schedule (
+    origin TEXT PRIMARY KEY,
+    next_at REAL NOT NULL
+);
+"""
+
+
+class _SqliteOrigins:
+    """Per-origin slots shared by the API and worker processes through the queue database.
+
+    A slot is a lease row that expires after `lease_ttl` seconds, so a crashed worker
+    cannot hold an origin forever.
+    """
+
+    def __init__(self, path: Path, lease_ttl: float) -> None:
+        self.path = path
+        self.lease_ttl = lease_ttl
+        self._local = local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def try_acquire(self, origin: str, holder: str, max_concurrent: int, min_interval: float) -> Optional[float]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            conn.execute("DELETE FROM origin_leases WHERE expires_at < ?", (now,))
+            row = conn.execute("SELECT next_at FROM origin_schedule WHERE origin = ?", (origin,)).fetchone()
+            active = conn.execute("SELECT COUNT(*) FROM origin_leases WHERE origin = ?", (origin,)).fetchone()[0]
+            wait: Optional[float] = None
+            if row is not None and now < row["next_at"]:
+                wait = row["next_at"] - now
+            elif active >= max_concurrent:
+                wait = _WAIT_STEP
+            else:
+                conn.execute(
+                    "INSERT OR REPLACE INTO origin_leases (origin, holder, expires_at) VALUES (?, ?, ?)",
+                    (origin, holder, now + self.lease_ttl),
+                )
+                conn.execute(
+                    "INSERT INTO origin_schedule (origin, next_at) VALUES (?, ?) "
+                    "ON CONFLICT(origin) DO UPDATE SET next_at = MAX(next_at, excluded.next_at)",
+                    (origin, now + min_interval),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+    def release(self, origin: str, holder: str) -> None:
+        self._connect().execute("DELETE FROM origin_leases WHERE origin = ? AND holder = ?", (origin, holder))
+
+    def defer(self, origin: str, until: float) -> None:
+        self._connect().execute(
+            "INSERT INTO origin_schedule (origin, next_at) VALUES (?, ?) "
+            "ON CONFLICT(origin) DO UPDATE SET next_at = MAX(next_at, excluded.next_at)",
+            (origin, until),
+        )
+
+
+class OriginLimiter:
+    """Politeness limits per target host: concurrent loads, spacing between loads, Retry-After.
+
+    ORIGIN_MAX_CONCURRENCY (default 2) page loads or API calls may hold an origin at once,
+    each start is at least ORIGIN_MIN_INTERVAL seconds (default 1) after the previous one,
+    and a 429/503 pushes the next start out by its Retry-After (ORIGIN_DEFAULT_BACKOFF,
+    default 30, when the header is missing).
+    """
+
+    def __init__(self, backend: Any, max_concurrent: int, min_interval: float, default_backoff: float) -> None:
+        self.backend = backend
+        self.max_concurrent = max(max_concurrent, 1)
+        self.min_interval = max(min_interval, 0.0)
+        self.default_backoff = default_backoff
+
+    @contextmanager
+    def acquire(
+        self,
+        url: str,
+        resource: str = "page",
+        max_concurrent: Optional[int] = None,
+        min_interval: Optional[float] = None,
+        max_wait: Optional[float] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Hold a slot on `url`'s origin for the duration of the block; waits (cancellably) for one.
+
+        With `max_wait`, raises OriginBusy instead of waiting longer than that, and at once
+        when the origin is deferred past it.
+        """
+        origin = origin_of(url)
+        max_concurrent = max(max_concurrent or self.max_concurrent, 1)
+        min_interval = self.min_interval if min_interval is None else min_interval
+        holder = f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}:{uuid.uuid4().hex[:8]}"
+        start = time.perf_counter()
+        while True:
+            check_cancelled()
+            wait = self.backend.try_acquire(origin, holder, max_concurrent, min_interval)
+            if wait is None:
+                break
+            if max_wait is not None and time.perf_counter() - start + wait > max_wait:
+                ORIGIN_WAIT_SECONDS.observe(time.perf_counter() - start, resource=resource)
+                raise OriginBusy(origin, wait)
+            time.sleep(min(wait, _WAIT_STEP))
+        waited = time.perf_counter() - start
+        ORIGIN_WAIT_SECONDS.observe(waited, resource=resource)
+        if waited >= 0.5:
+            logger.info("origin.waited | origin=%s | resource=%s | waited=%.2fs", origin, resource, waited)
+        ORIGIN_LOADS_ACTIVE.inc(resource=resource)
+        try:
+            yield {"origin": origin, "waited_s": round(waited, 3)}
+        finally:
+            ORIGIN_LOADS_ACTIVE.dec(resource=resource)
+            self.backend.release(origin, holder)
+
+    def defer(self, url: str, status: int, retry_after: Optional[str], resource: str = "page") -> float:
+        """Record a 429/503 from `url`; later acquires for its origin wait out the Retry-After."""
+        seconds = parse_retry_after(retry_after)
+        if seconds is None:
+            seconds = self.default_backoff
+        self.backend.defer(origin_of(url), time.time() + seconds)
+        ORIGIN_DEFERRALS.inc(resource=resource, status=str(status))
+        logger.warning("origin.deferred | origin=%s | status=%s | retry_after=%.0fs", origin_of(url), status, seconds)
+        return seconds
+
+
+def _limiter_from_env() -> OriginLimiter:
+    from app.utils.jobs import jobs
+
+    # Workers on the shared queue must see each other's loads, so share the queue database
+    if jobs.out_of_process:
+        backend: Any = _SqliteOrigins(jobs.path, lease_ttl=float(os.getenv("ORIGIN_LEASE_TTL", "600")))
+    else:
+        backend = _MemoryOrigins()
+    return OriginLimiter(
+        backend,
+        max_concurrent=int(os.getenv("ORIGIN_MAX_CONCURRENCY", "2")),
+        min_interval=float(os.getenv("ORIGIN_MIN_INTERVAL", "1.0")),
+        default_backoff=float(os.getenv("ORIGIN_DEFAULT_BACKOFF", "30")),
+    )
+
+
+origins = _limiter_from_env()
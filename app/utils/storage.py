@@ -1,11 +1,269 @@
 from __future__ import annotations
 
+import logging
+import os
+import shutil
+import time
+from collections import OrderedDict
 from pathlib import Path
+from threading import Event, RLock, Thread
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.blobs import _BlobStore
+from app.utils.jobs import jobs
 
 BASE_RUNTIME = Path("./runtime").resolve()
+JOB_KINDS = ("audit", "generate")
+LATEST_PROJECT_FILE = BASE_RUNTIME / "latest_project"
+
+logger = logging.getLogger("ych.storage")
+
+
+def _dir_size(path: Path) -> int:
+    """Bytes owned by `path` alone; files linked to shared blobs are counted by the blob store."""
+    total = 0
+    for dirpath, _dirnames, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                st = (Path(dirpath) / name).lstat()
+            except OSError:
+                continue
+            if st.st_nlink == 1:
+                total += st.st_size
+    return total
+
+
+class _StorageManager:
+    """Index of runtime job directories with TTL + quota (LRU) garbage collection.
+
+    Entries are kept in least-recently-accessed order. Evicting a directory marks the
+    matching job record as expired so clients never see results pointing at missing files.
+    """
+
+    def __init__(
+        self, base: Path, ttl_seconds: float, quota_bytes: int, interval_seconds: float, dedup: bool = True
+    ) -> None:
+        self._lock = RLock()
+        self._base = base
+        # Content-addressed files linked from job directories (see app.utils.blobs)
+        self.blobs = _BlobStore(base / "blobs", enabled=dedup)
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._scanned = False
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+        self.ttl_seconds = ttl_seconds
+        self.quota_bytes = quota_bytes
+        self.interval_seconds = interval_seconds
+
+    # Index maintenance
+    def _ensure_scanned(self) -> None:
+        with self._lock:
+            if self._scanned:
+                return
+            self._scanned = True
+            self._scan()
+
+    def _scan(self) -> None:
+        """Index job directories not yet known (at startup, and ones created by worker processes)."""
+        with self._lock:
+            found = []
+            for kind in JOB_KINDS:
+                kind_dir = self._base / kind
+                if not kind_dir.is_dir():
+                    continue
+                for job_dir in kind_dir.iterdir():
+                    if job_dir.is_dir() and (kind, job_dir.name) not in self._entries:
+                        st = job_dir.stat()
+                        found.append((st.st_mtime, kind, job_dir.name, job_dir))
+            for mtime, kind, job_id, job_dir in sorted(found, key=lambda f: f[0]):
+                # Status first: a size measured after the job finished is final
+                settled = self._job_finished(kind, job_id)
+                self._entries[(kind, job_id)] = {
+                    "path": str(job_dir),
+                    "size": _dir_size(job_dir),
+                    "created": mtime,
+                    "last_accessed": mtime,
+                    "settled": settled,
+                }
+            if found:
+                logger.info("storage.scan | dirs=%s | bytes=%s", len(found), self.total_bytes())
+
+    @staticmethod
+    def _job_finished(kind: str, job_id: str) -> bool:
+        job = jobs.get_job(kind, job_id)
+        return job is None or job.get("status") not in ("queued", "running")
+
+    def _remeasure_unsettled(self) -> None:
+        """Re-size directories whose job was still running when last measured.
+
+        Worker processes refresh sizes only in their own index, so in out-of-process mode
+        the API keeps measuring a directory on each pass until its job has finished.
+        """
+        with self._lock:
+            pending = [(key, e) for key, e in self._entries.items() if not e.get("settled")]
+        for (kind, job_id), entry in pending:
+            settled = self._job_finished(kind, job_id)
+            size = _dir_size(Path(entry["path"]))
+            with self._lock:
+                entry["size"] = size
+                entry["settled"] = settled
+
+    def register(self, kind: str, job_id: str, path: Path) -> None:
+        self._ensure_scanned()
+        now = time.time()
+        with self._lock:
+            self._entries[(kind, job_id)] = {"path": str(path), "size": 0, "created": now, "last_accessed": now}
+            self._entries.move_to_end((kind, job_id))
+
+    def touch(self, kind: str, job_id: str) -> None:
+        with self._lock:
+            entry = self._entries.get((kind, job_id))
+            if entry is not None:
+                entry["last_accessed"] = time.time()
+                self._entries.move_to_end((kind, job_id))
+
+    def refresh(self, kind: str, job_id: str) -> None:
+        """Recompute a job directory's size (call after the job wrote its artifacts)."""
+        with self._lock:
+            entry = self._entries.get((kind, job_id))
+        if entry is None:
+            return
+        size = _dir_size(Path(entry["path"]))
+        with self._lock:
+            entry["size"] = size
+            entry["last_accessed"] = time.time()
+            if (kind, job_id) in self._entries:
+                self._entries.move_to_end((kind, job_id))
+
+    def get(self, kind: str, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get((kind, job_id))
+            return dict(entry) if entry is not None else None
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            private = sum(e["size"] for e in self._entries.values())
+        # Span exports are size-capped (TRACE_JSONL_MAX_BYTES) but share the quota
+        return private + self.blobs.total_bytes() + _dir_size(self._base / "traces")
+
+    # Latest generated project (read by scripts/render_generated.py)
+    def set_latest_project(self, project_dir: str) -> None:
+        """Record the most recent runnable project; ignored unless it has a package.json."""
+        if not (Path(project_dir) / "package.json").exists():
+            return
+        try:
+            LATEST_PROJECT_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp = LATEST_PROJECT_FILE.with_suffix(".tmp")
+            tmp.write_text(str(Path(project_dir).resolve()), encoding="utf-8")
+            tmp.replace(LATEST_PROJECT_FILE)
+        except OSError as exc:
+            logger.warning("storage.latest.write_failed | err=%s", exc)
+
+    def latest_project(self) -> Optional[str]:
+        try:
+            path = LATEST_PROJECT_FILE.read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        return path if path and (Path(path) / "package.json").exists() else None
+
+    # Garbage collection
+    def _evict(self, key: Tuple[str, str], reason: str) -> Optional[Dict[str, Any]]:
+        kind, job_id = key
+        job = jobs.get_job(kind, job_id)
+        if job is not None and job.get("status") in ("queued", "running"):
+            return None
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        shared = self.blobs.shared_inodes(entry["path"])
+        shutil.rmtree(entry["path"], ignore_errors=True)
+        freed = self.blobs.release(shared)
+        jobs.expire_job(kind, job_id, reason)
+        latest = self.latest_project()
+        if latest is None or latest.startswith(entry["path"] + os.sep):
+            self._repoint_latest()
+        logger.info("storage.evict | %s:%s | bytes=%s | blob_bytes=%s | reason=%s", kind, job_id, entry["size"], freed, reason)
+        return entry
+
+    def _repoint_latest(self) -> None:
+        with self._lock:
+            candidates = sorted(
+                ((e["created"], e["path"]) for (kind, _), e in self._entries.items() if kind == "generate"),
+                reverse=True,
+            )
+        for _, path in candidates:
+            project = Path(path) / "next_project"
+            if (project / "package.json").exists():
+                self.set_latest_project(str(project))
+                return
+        LATEST_PROJECT_FILE.unlink(missing_ok=True)
+
+    def collect_garbage(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Evict entries idle past the TTL, then least-recently-accessed ones over quota."""
+        self._ensure_scanned()
+        if jobs.out_of_process:
+            self._scan()
+            self._remeasure_unsettled()
+        now = now or time.time()
+        evicted: List[Dict[str, Any]] = []
+        if self.ttl_seconds > 0:
+            with self._lock:
+                stale = [k for k, e in self._entries.items() if now - e["last_accessed"] > self.ttl_seconds]
+            for key in stale:
+                entry = self._evict(key, "ttl")
+                if entry is not None:
+                    evicted.append(entry)
+        if self.quota_bytes > 0:
+            with self._lock:
+                lru_order = list(self._entries)
+            for key in lru_order:
+                if self.total_bytes() <= self.quota_bytes:
+                    break
+                entry = self._evict(key, "quota")
+                if entry is not None:
+                    evicted.append(entry)
+        # Blobs whose job directories were removed outside the GC
+        self.blobs.collect_garbage()
+        if evicted:
+            logger.info("storage.gc | evicted=%s | bytes=%s", len(evicted), self.total_bytes())
+        return evicted
+
+    def start(self) -> None:
+        """Start the background GC thread (no-op if disabled or already running)."""
+        if self.interval_seconds <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+
+        def _loop() -> None:
+            while not self._stop.wait(self.interval_seconds):
+                try:
+                    self.collect_garbage()
+                except Exception as exc:  # noqa: BLE001
+                    logger.exception("storage.gc.failed: %s", exc)
+
+        self._thread = Thread(target=_loop, name="runtime-gc", daemon=True)
+        self._thread.start()
+        logger.info(
+            "storage.gc.started | ttl=%ss | quota=%s bytes | interval=%ss",
+            self.ttl_seconds, self.quota_bytes, self.interval_seconds,
+        )
+
+    def stop(self) -> None:
+        self._stop.set()
+
+storage = _StorageManager(
+    BASE_RUNTIME,
+    ttl_seconds=float(os.getenv("RUNTIME_TTL_SECONDS", str(7 * 24 * 3600))),
+    quota_bytes=int(os.getenv("RUNTIME_QUOTA_BYTES", str(10 * 1024 ** 3))),
+    interval_seconds=float(os.getenv("RUNTIME_GC_INTERVAL_SECONDS", "600")),
+    dedup=os.getenv("ARTIFACT_DEDUP", "1").lower() not in ("0", "false", "no"),
+)
+blobs = storage.blobs
 
 
 def create_job_dir(kind: str, job_id: str) -> str:
     path = BASE_RUNTIME / kind / job_id
     path.mkdir(parents=True, exist_ok=True)
+    storage.register(kind, job_id, path)
     return str(path)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from threading import RLock
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger("ych.tenants")
+
+
+PRIORITIES = ("interactive", "batch")
+ANONYMOUS = {"tenant": "anonymous", "priority": "interactive", "weight": 1.0}
+
+
+class _Tenants:
+    """API key → tenant settings used to schedule jobs.
+
+    Keys come from API_KEYS (inline JSON) or API_KEYS_FILE (a JSON file), e.g.
+    ``{"k-123": {"tenant": "acme", "priority": "batch", "weight": 2}}``. `priority` is the
+    highest class the key may use; `weight` is the tenant's share relative to others.
+    Requests without a (known) key are scheduled as the ``anonymous`` tenant.
+    """
+
+    def __init__(self) -> None:
+        self._lock = RLock()
+        self._keys: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            if self._keys is None:
+                raw = os.getenv("API_KEYS")
+                path = os.getenv("API_KEYS_FILE")
+                try:
+                    data = json.loads(raw) if raw else json.loads(Path(path).read_text(encoding="utf-8")) if path else {}
+                except Exception as exc:  # noqa: BLE001
+                    logger.error("tenants.load_failed | err=%s", exc)
+                    data = {}
+                self._keys = {
+                    key: {
+                        "tenant": str(cfg.get("tenant") or key[:8]),
+                        "priority": cfg.get("priority") if cfg.get("priority") in PRIORITIES else "interactive",
+                        "weight": max(float(cfg.get("weight", 1.0)), 0.01),
+                    }
+                    for key, cfg in data.items()
+                }
+                logger.info("tenants.loaded | keys=%s", len(self._keys))
+            return self._keys
+
+    def reload(self) -> None:
+        with self._lock:
+            self._keys = None
+
+    def resolve(self, api_key: Optional[str], requested: Optional[str] = None) -> Dict[str, Any]:
+        """Return {tenant, priority, weight} for a request; a key's priority caps the requested one."""
+        tenant = dict(self._load().get(api_key or "", ANONYMOUS))
+        if requested in PRIORITIES and PRIORITIES.index(requested) >= PRIORITIES.index(tenant["priority"]):
+            tenant["priority"] = requested
+        return tenant
+
+
+tenants = _Tenants()
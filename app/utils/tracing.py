@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import os
+import queue
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+
+logger = logging.getLogger("ych.tracing")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span:
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.status = "ok"
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, exc: BaseException) -> None:
+        self.status = "error"
+        self.attributes["error"] = f"{type(exc).__name__}: {exc}"[:500]
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            _export(self)
+
+    def context(self) -> "SpanContext":
+        return SpanContext(self.trace_id, self.span_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(((self.end_ns or self.start_ns) - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class SpanContext:
+    """Trace/span ids of a span, used to parent work that runs after it ended (background jobs)."""
+
+    def __init__(self, trace_id: str, span_id: Optional[str]) -> None:
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+
+_current: ContextVar[Optional[SpanContext]] = ContextVar("ych_current_span", default=None)
+
+
+def current_context() -> Optional[SpanContext]:
+    return _current.get()
+
+
+def current_trace_id() -> Optional[str]:
+    ctx = _current.get()
+    return ctx.trace_id if ctx is not None else None
+
+
+def start_span(name: str, parent: Optional[SpanContext] = None, **attributes: Any) -> Span:
+    """Create a span (child of `parent` or the current span) without activating it."""
+    parent = parent or _current.get()
+    trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+    return Span(name, trace_id, parent.span_id if parent is not None else None, attributes)
+
+
+@contextmanager
+def span(name: str, parent: Optional[SpanContext] = None, **attributes: Any) -> Iterator[Span]:
+    """Open a span, make it current for the block, and export it on exit."""
+    s = start_span(name, parent=parent, **attributes)
+    token = _current.set(s.context())
+    try:
+        yield s
+    except BaseException as exc:
+        s.set_error(exc)
+        raise
+    finally:
+        _current.reset(token)
+        s.end()
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator form of `span`; keeps the wrapped signature (DSPy tools introspect it)."""
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+# Exporters
+class JsonlExporter:
+    """Appends spans to `path`; past `max_bytes` the file is rotated to `<path>.1` (one backup)."""
+
+    def __init__(self, path: str, max_bytes: int = 0) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(s.to_dict(), default=str) + "\n" for s in spans)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.max_bytes > 0:
+                try:
+                    size = self.path.stat().st_size
+                except FileNotFoundError:
+                    size = 0
+                if size and size + len(lines) > self.max_bytes:
+                    os.replace(self.path, self.path.with_name(self.path.name + ".1"))
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write(lines)
+
+
+class OtlpHttpExporter:
+    """OTLP/HTTP JSON exporter (POST {endpoint}/v1/traces)."""
+
+    def __init__(self, endpoint: str, service_name: str = "ych-api", headers: Optional[Dict[str, str]] = None) -> None:
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.headers = headers or {}
+
+    @staticmethod
+    def _attr(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def export(self, spans: List[Span]) -> None:
+        import httpx
+
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [self._attr("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "ych"},
+                    "spans": [{
+                        "traceId": s.trace_id,
+                        "spanId": s.span_id,
+                        **({"parentSpanId": s.parent_id} if s.parent_id else {}),
+                        "name": s.name,
+                        "kind": 1,
+                        "startTimeUnixNano": str(s.start_ns),
+                        "endTimeUnixNano": str(s.end_ns or s.start_ns),
+                        "attributes": [self._attr(k, v) for k, v in s.attributes.items()],
+                        "status": {"code": 2 if s.status == "error" else 1},
+                    } for s in spans],
+                }],
+            }],
+        }
+        httpx.post(self.url, json=payload, headers=self.headers, timeout=5)
+
+
+class _BatchProcessor:
+    """Hands finished spans to exporters on a background thread so callers never block on I/O."""
+
+    def __init__(self, exporters: List[Any], max_batch: int = 256, interval: float = 2.0) -> None:
+        self.exporters = exporters
+        self.max_batch = max_batch
+        self.interval = interval
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=10000)
+        self._thread: Optional[Thread] = None
+        self._lock = Lock()
+
+    def submit(self, s: Span) -> None:
+        if not self.exporters:
+            return
+        try:
+            self._queue.put_nowait(s)
+        except queue.Full:
+            return
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = Thread(target=self._loop, name="trace-export", daemon=True)
+                    self._thread.start()
+
+    def _drain(self, first: Optional[Span] = None) -> List[Span]:
+        batch = [first] if first is not None else []
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self.interval)
+            except queue.Empty:
+                continue
+            self._write(self._drain(first))
+
+    def _write(self, batch: List[Span]) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(batch)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("tracing.export_failed | exporter=%s | err=%s", type(exporter).__name__, exc)
+
+    def flush(self) -> None:
+        """Synchronously export whatever is queued (used at shutdown and in tests)."""
+        while True:
+            batch = self._drain()
+            if not batch:
+                return
+            self._write(batch)
+
+
+def _exporters_from_env() -> List[Any]:
+    exporters: List[Any] = []
+    names = {n.strip().lower() for n in os.getenv("TRACE_EXPORTERS", "jsonl").split(",") if n.strip()}
+    if "jsonl" in names:
+        exporters.append(JsonlExporter(
+            os.getenv("TRACE_JSONL_PATH", str(Path("./runtime/traces/spans.jsonl").resolve())),
+            max_bytes=int(os.getenv("TRACE_JSONL_MAX_BYTES", str(64 * 1024 ** 2))),
+        ))
+    endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+    if "otlp" in names or endpoint:
+        if endpoint:
+            exporters.append(OtlpHttpExporter(endpoint, os.getenv("OTEL_SERVICE_NAME", "ych-api")))
+        else:
+            logger.warning("tracing.otlp_disabled | OTEL_EXPORTER_OTLP_ENDPOINT not set")
+    return exporters
+
+
+processor = _BatchProcessor(_exporters_from_env())
+
+
+def _export(s: Span) -> None:
+    processor.submit(s)
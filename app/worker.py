@@ -0,0 +1,179 @@
+"""Out-of-process job worker.
+
+    JOB_QUEUE=sqlite python -m app.worker --audit 1 --generate 2
+
+Consumes jobs that the API (started with the same JOB_QUEUE / JOB_QUEUE_PATH) enqueued in
+the shared SQLite queue. Each slot is a separate process, so a crashed browser or a CPU-heavy
+job never blocks API request handling; dead slots are restarted and their job marked failed.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger("ych.worker")
+
+LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+# How quickly a DELETE on a running job reaches the slot running it
+CANCEL_POLL_INTERVAL = 1.0
+
+
+def _worker_id(pid: Optional[int] = None) -> str:
+    return f"{socket.gethostname()}:{pid or os.getpid()}"
+
+
+def _heartbeat(kind: str, job_id: str, done: threading.Event, interval: float) -> None:
+    """Refresh the job's heartbeat every `interval` and relay cancel requests to its token."""
+    from app.utils.cancellation import cancellations
+    from app.utils.jobs import jobs
+
+    last_beat = time.monotonic()
+    cancelled = False
+    while not done.wait(min(interval, CANCEL_POLL_INTERVAL)):
+        try:
+            if not cancelled and jobs.is_cancel_requested(kind, job_id):
+                cancelled = cancellations.cancel(kind, job_id, "cancelled by client")
+            if time.monotonic() - last_beat >= interval:
+                jobs.heartbeat(kind, job_id)
+                last_beat = time.monotonic()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("worker.heartbeat_failed | %s:%s | err=%s", kind, job_id, exc)
+
+
+def _slot_main(kind: str, stop: Any, poll_interval: float, heartbeat_interval: float) -> None:
+    """Claim and run jobs of one kind until `stop` is set (runs in a child process)."""
+    # The supervisor handles Ctrl+C; a slot finishes its current job and exits on `stop`
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    from app.services.job_runner import run_job
+    from app.utils.dspy_config import ensure_configured
+    from app.utils.jobs import batch_limits_from_env, jobs
+    from app.utils.tracing import SpanContext, processor
+
+    if kind == "generate":
+        ensure_configured()
+    worker = _worker_id()
+    # Shared by every worker on the queue, so batch jobs cannot fill all slots cluster-wide
+    limits = batch_limits_from_env([kind])
+    logger.info("worker.slot.started | kind=%s | worker=%s", kind, worker)
+    while not stop.is_set():
+        job = jobs.claim([kind], worker, limits)
+        if job is None:
+            stop.wait(poll_interval)
+            continue
+        parent = SpanContext(job["trace_id"], job["parent_span_id"]) if job["trace_id"] else None
+        done = threading.Event()
+        beat = threading.Thread(target=_heartbeat, args=(kind, job["id"], done, heartbeat_interval), daemon=True)
+        beat.start()
+        try:
+            run_job(kind, job["id"], job["payload"], parent)
+        finally:
+            done.set()
+            processor.flush()
+    logger.info("worker.slot.stopped | kind=%s | worker=%s", kind, worker)
+
+
+class Supervisor:
+    """Keeps `parallelism[kind]` slot processes alive and reaps jobs of dead or silent slots."""
+
+    def __init__(self, parallelism: Dict[str, int], poll_interval: float, heartbeat_interval: float, stale_after: float) -> None:
+        self.parallelism = parallelism
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self._ctx = multiprocessing.get_context("spawn")
+        self.stop = self._ctx.Event()
+        # Set from signal handlers; setting `stop` there could deadlock with a pending wait()
+        self.stopping = False
+        self._slots: Dict[Tuple[str, int], Any] = {}
+
+    def _spawn(self, kind: str, index: int) -> None:
+        proc = self._ctx.Process(
+            target=_slot_main,
+            args=(kind, self.stop, self.poll_interval, self.heartbeat_interval),
+            name=f"ych-worker-{kind}-{index}",
+        )
+        proc.start()
+        self._slots[(kind, index)] = proc
+
+    def run(self) -> None:
+        from app.utils.jobs import jobs
+
+        for kind, count in self.parallelism.items():
+            for index in range(count):
+                self._spawn(kind, index)
+        logger.info("worker.started | parallelism=%s", self.parallelism)
+        last_reap = 0.0
+        while not self.stopping:
+            for (kind, index), proc in list(self._slots.items()):
+                if proc.is_alive():
+                    continue
+                jobs.fail_running(f"worker process exited with code {proc.exitcode}", worker=_worker_id(proc.pid))
+                if not self.stopping:
+                    logger.warning("worker.slot.restart | kind=%s | index=%s | exitcode=%s", kind, index, proc.exitcode)
+                    self._spawn(kind, index)
+            if time.time() - last_reap > self.heartbeat_interval:
+                # Jobs of slots on hosts/processes that vanished without this supervisor noticing
+                jobs.fail_running("worker heartbeat timed out", stale_after=self.stale_after)
+                last_reap = time.time()
+            time.sleep(1.0)
+
+    def shutdown(self, grace: float = 30.0) -> None:
+        self.stop.set()
+        deadline = time.time() + grace
+        for proc in self._slots.values():
+            proc.join(max(0.0, deadline - time.time()))
+        for proc in self._slots.values():
+            if proc.is_alive():
+                proc.terminate()
+                proc.join(5)
+        logger.info("worker.stopped")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run audit/generation jobs from the shared queue")
+    parser.add_argument("--audit", type=int, default=int(os.getenv("WORKER_AUDIT_CONCURRENCY", "1")), help="Audit slots (processes)")
+    parser.add_argument("--generate", type=int, default=int(os.getenv("WORKER_GENERATE_CONCURRENCY", "2")), help="Generation slots (processes)")
+    parser.add_argument("--poll-interval", type=float, default=float(os.getenv("WORKER_POLL_INTERVAL", "0.5")))
+    parser.add_argument("--heartbeat-interval", type=float, default=float(os.getenv("WORKER_HEARTBEAT_INTERVAL", "10")))
+    parser.add_argument("--stale-after", type=float, default=float(os.getenv("JOB_HEARTBEAT_TIMEOUT", "120")),
+                        help="Fail running jobs whose heartbeat is older than this many seconds")
+    parser.add_argument("--grace", type=float, default=60.0, help="Seconds to let running jobs finish on shutdown")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    from app.utils.jobs import jobs
+
+    if not jobs.out_of_process:
+        logger.error("worker requires a shared queue; set JOB_QUEUE=sqlite for both the API and the worker")
+        return 2
+    parallelism = {kind: n for kind, n in (("audit", args.audit), ("generate", args.generate)) if n > 0}
+    if not parallelism:
+        logger.error("worker has no slots; pass --audit and/or --generate > 0")
+        return 2
+
+    supervisor = Supervisor(parallelism, args.poll_interval, args.heartbeat_interval, args.stale_after)
+
+    def _request_stop(*_: Any) -> None:
+        supervisor.stopping = True
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+    try:
+        supervisor.run()
+    finally:
+        supervisor.shutdown(args.grace)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""Offline benchmarks for the audit and generation paths.
+
+Everything external is replaced by a local stand-in (fixture website, PSI endpoint,
+DSPy LM, dev server) so runs are repeatable and comparable across commits.
+Run with ``python -m benchmarks.run``; compare results with ``python -m benchmarks.compare``.
+"""
@@ -0,0 +1,79 @@
+"""Compare two benchmark result files.
+
+    python -m benchmarks.compare benchmarks/results/<base>.json benchmarks/results/<head>.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# (label, path into a scenario result, True if higher is better)
+METRICS: List[Tuple[str, Tuple[str, ...], bool]] = [
+    ("p50 ms", ("latency_ms", "p50"), False),
+    ("p95 ms", ("latency_ms", "p95"), False),
+    ("ops/s", ("throughput_per_s",), True),
+    ("rss MB", ("peak_rss_mb",), False),
+    ("errors", ("errors",), False),
+]
+
+
+def _get(result: Dict[str, Any], path: Tuple[str, ...]) -> Optional[float]:
+    value: Any = result
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value if isinstance(value, (int, float)) else None
+
+
+def _delta(base: Optional[float], head: Optional[float]) -> str:
+    if base is None or head is None:
+        return "n/a"
+    if base == 0:
+        return "=" if head == 0 else "new"
+    return f"{(head - base) / base * 100:+.1f}%"
+
+
+def compare(base: Dict[str, Any], head: Dict[str, Any], threshold: float = 10.0) -> Tuple[List[str], List[str]]:
+    """Return table lines and regressions beyond `threshold` percent."""
+    lines = [f"base {base['meta'].get('commit')}  ->  head {head['meta'].get('commit')}", ""]
+    lines.append(f"{'scenario':<26}{'metric':<10}{'base':>12}{'head':>12}{'delta':>10}")
+    regressions: List[str] = []
+    for name in sorted(set(base.get("scenarios", {})) | set(head.get("scenarios", {}))):
+        b = base.get("scenarios", {}).get(name, {})
+        h = head.get("scenarios", {}).get(name, {})
+        for label, path, higher_is_better in METRICS:
+            bv, hv = _get(b, path), _get(h, path)
+            lines.append(f"{name:<26}{label:<10}{str(bv):>12}{str(hv):>12}{_delta(bv, hv):>10}")
+            if bv and hv is not None:
+                change = (hv - bv) / bv * 100
+                if (change < -threshold) if higher_is_better else (change > threshold):
+                    regressions.append(f"{name} {label}: {bv} -> {hv} ({change:+.1f}%)")
+    return lines, regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Percent change reported as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+    head = json.loads(Path(args.head).read_text(encoding="utf-8"))
+    lines, regressions = compare(base, head, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print("\nRegressions (> {:.0f}%):".format(args.threshold))
+        print("\n".join(f"  {r}" for r in regressions))
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+import dspy  # type: ignore
+
+from app.services.local_devserver import LocalDevServerFilesystem
+
+
+_FIELD_RE = re.compile(r"\[\[ ## (\w+) ## \]\]")
+
+FAKE_COPY_PLAN = {
+    "summary": "Clearer value proposition with a single primary call to action.",
+    "blocks": [
+        {"path": "/hero", "original_text": "Welcome", "improved_text": "Ship faster websites: Audits and fixes in one place", "tone": "professional"},
+        {"path": "/features", "original_text": "Features", "improved_text": "Automated audits, accessible components and instant previews", "tone": "professional"},
+        {"path": "/features/speed", "original_text": "Fast", "improved_text": "Pages that load in under two seconds", "tone": "professional"},
+        {"path": "/features/a11y", "original_text": "Accessible", "improved_text": "WCAG AA out of the box", "tone": "professional"},
+        {"path": "/cta", "original_text": "Sign up", "improved_text": "Start your free audit", "tone": "professional"},
+    ],
+}
+
+FAKE_PAGE_TSX = """export default function Page() {
+  return (
+    <main className="mx-auto max-w-6xl px-6 py-16">
+      <h1 className="text-4xl font-bold">Ship faster websites</h1>
+      <p className="mt-4 text-lg">Audits and fixes in one place.</p>
+    </main>
+  );
+}
+"""
+
+FAKE_HIERARCHY = {
+    "url": None,
+    "nodes": [
+        {"id": "hero", "tag": "h1", "text": "Welcome", "path": "/hero", "children": []},
+        {"id": "features", "tag": "section", "text": "Features", "path": "/features", "children": []},
+    ],
+}
+
+FAKE_STYLE_SYSTEM = {
+    "layout_paradigm": "modern",
+    "design_tokens": {"color_primary": "#2563eb", "font_sans": "Inter, system-ui, sans-serif"},
+    "components": ["Navbar", "Hero", "FeatureGrid", "CTASection", "Footer"],
+}
+
+
+class FakeLM(dspy.BaseLM):  # type: ignore[misc]
+    """Deterministic DSPy LM for benchmarks (ChatAdapter format, no network).
+
+    Answers every requested output field from canned values. ReAct loops write the
+    homepage with ``tool_write_files`` on the first step and ``finish`` afterwards.
+    Each call sleeps ``latency`` seconds plus up to ``jitter`` (seeded, so reproducible).
+    """
+
+    def __init__(self, latency: float = 0.2, jitter: float = 0.0, seed: int = 0) -> None:
+        super().__init__(model="fake/bench", cache=False)
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _field_value(self, name: str, prompt: str) -> str:
+        if name == "copy_plan_json":
+            return json.dumps(FAKE_COPY_PLAN)
+        if name == "hierarchy_json":
+            return json.dumps(FAKE_HIERARCHY)
+        if name == "style_system_json":
+            return json.dumps(FAKE_STYLE_SYSTEM)
+        if name == "page_tsx":
+            return FAKE_PAGE_TSX
+        if name == "next_tool_name":
+            return "finish" if "observation_0" in prompt else "tool_write_files"
+        if name == "next_tool_args":
+            if "observation_0" in prompt:
+                return "{}"
+            return json.dumps({"files": {"app/page.tsx": FAKE_PAGE_TSX}})
+        if name == "status":
+            return "Updated app/page.tsx"
+        return "Deterministic benchmark response."
+
+    def forward(self, prompt: Optional[str] = None, messages: Optional[List[Dict[str, Any]]] = None, **kwargs: Any) -> Any:
+        messages = messages or [{"role": "user", "content": prompt or ""}]
+        text = "\n".join(str(m.get("content", "")) for m in messages)
+        last = str(messages[-1].get("content", ""))
+        # ChatAdapter ends the last user turn with "Respond with ... [[ ## field ## ]] ..."
+        instructions = last.rsplit("Respond with the corresponding output fields", 1)
+        fields = [f for f in _FIELD_RE.findall(instructions[-1]) if f != "completed"] if len(instructions) == 2 else ["answer"]
+        body = "".join(f"[[ ## {f} ## ]]\n{self._field_value(f, text)}\n\n" for f in fields) + "[[ ## completed ## ]]"
+
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + (self._rng.random() * self.jitter if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        usage = {"prompt_tokens": len(text) // 4, "completion_tokens": len(body) // 4, "total_tokens": (len(text) + len(body)) // 4}
+        message = SimpleNamespace(content=body, tool_calls=None)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")],
+            usage=usage,
+            model=self.model,
+        )
+
+
+class FakeDevServerProcess:
+    """`process` handle whose npm commands succeed after a fixed delay."""
+
+    def __init__(self, latencies: Optional[Dict[str, float]] = None) -> None:
+        self.latencies = {"install": 0.0, "lint": 0.0, "build": 0.0, "other": 0.0, **(latencies or {})}
+        self.commands: List[str] = []
+        self._ids = itertools.count(1)
+
+    def exec(self, cmd: str, background: bool = False) -> Dict[str, Any]:
+        self.commands.append(cmd)
+        if "install" in cmd or "npm ci" in cmd:
+            kind, stdout = "install", "added 312 packages in 4s\n"
+        elif "lint" in cmd:
+            kind, stdout = "lint", "✔ No ESLint warnings or errors\n"
+        elif "build" in cmd:
+            kind, stdout = "build", "✓ Compiled successfully\n✓ Generating static pages (4/4)\n"
+        else:
+            kind, stdout = "other", ""
+        if self.latencies[kind] > 0:
+            time.sleep(self.latencies[kind])
+        return {"id": str(next(self._ids)), "isNew": True, "stdout": stdout, "stderr": "", "exitCode": 0}
+
+
+def make_fake_dev_server(
+    root: str,
+    exec_latencies: Optional[Dict[str, float]] = None,
+    push_latency: float = 0.0,
+) -> Dict[str, Any]:
+    """Dev Server handle (same shape as devserver.provision_dev_server) backed by a local dir.
+
+    Files really are written under `root`; commands and pushes only sleep. Each handle
+    gets a fresh repo_id, so pushes are never short-circuited by an older push manifest.
+    """
+    path = Path(root).resolve()
+    path.mkdir(parents=True, exist_ok=True)
+    pushes: List[str] = []
+
+    def commit_and_push(message: str) -> None:
+        if push_latency > 0:
+            time.sleep(push_latency)
+        pushes.append(message)
+
+    return {
+        "repo_id": f"bench-{uuid4().hex[:12]}",
+        "ephemeral_url": "http://127.0.0.1:0/bench-preview",
+        "mcp_ephemeral_url": "http://127.0.0.1:0/bench-mcp",
+        "code_server_url": "http://127.0.0.1:0/bench-code",
+        "commit_and_push": commit_and_push,
+        "fs": LocalDevServerFilesystem(path),
+        "process": FakeDevServerProcess(exec_latencies),
+        "shutdown": lambda: {"success": True, "message": "fake dev server stopped"},
+        "project_dir": str(path),
+        "pushes": pushes,
+    }
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+
+logger = logging.getLogger("ych.bench.fixtures")
+
+
+# name -> (sections, images, scripts); sizes grow roughly linearly with sections
+PAGE_PROFILES: Dict[str, Tuple[int, int, int]] = {
+    "small": (3, 1, 1),
+    "medium": (20, 8, 4),
+    "large": (120, 40, 12),
+}
+
+# Minimal axe-core stand-in: reports one violation per <img> without alt text
+AXE_STUB_JS = """
+window.axe = {
+  run: async function () {
+    var imgs = Array.prototype.slice.call(document.querySelectorAll('img:not([alt])'));
+    return {
+      violations: imgs.length ? [{
+        id: 'image-alt', impact: 'critical', description: 'Images must have alternate text',
+        helpUrl: 'https://dequeuniversity.com/rules/axe/4.9/image-alt',
+        nodes: imgs.slice(0, 20).map(function (el) { return {target: [el.getAttribute('src')]}; })
+      }] : [],
+      passes: [], incomplete: [], inapplicable: []
+    };
+  }
+};
+"""
+
+# 1x1 transparent PNG
+_PIXEL = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+def render_page(name: str) -> str:
+    """Deterministic HTML page for a profile in PAGE_PROFILES."""
+    sections, images, scripts = PAGE_PROFILES[name]
+    parts = [
+        "<!doctype html><html lang='en'><head><meta charset='utf-8'>",
+        f"<title>Fixture {name}</title>",
+        "<link rel='stylesheet' href='/static/site.css'>",
+    ]
+    parts += [f"<script src='/static/app{i}.js' defer></script>" for i in range(scripts)]
+    parts.append("</head><body><header><nav><a href='/'>Home</a> <a href='/pricing'>Pricing</a></nav>")
+    parts.append(f"<h1>Fixture site ({name})</h1><p>Helping teams ship better websites.</p></header><main>")
+    for i in range(sections):
+        parts.append(
+            f"<section id='s{i}'><h2>Feature {i}</h2>"
+            f"<p>{'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 6}</p>"
+            f"<ul><li>Point {i}.1</li><li>Point {i}.2</li><li>Point {i}.3</li></ul>"
+            f"<button>Learn more {i}</button></section>"
+        )
+    for i in range(images):
+        alt = "" if i % 3 == 0 else f" alt='Image {i}'"
+        parts.append(f"<img src='/static/img{i}.png'{alt} width='320' height='200'>")
+    parts.append("</main><footer><p>&copy; Fixture Inc.</p></footer></body></html>")
+    return "".join(parts)
+
+
+def psi_payload(url: str, strategy: str) -> Dict[str, object]:
+    """PageSpeed Insights-shaped response with the fields perform_audit reads."""
+    return {
+        "id": url,
+        "lighthouseResult": {
+            "requestedUrl": url,
+            "configSettings": {"formFactor": strategy},
+            "categories": {
+                "performance": {"score": 0.82},
+                "accessibility": {"score": 0.91},
+                "seo": {"score": 0.88},
+            },
+            "audits": {
+                "largest-contentful-paint": {"numericValue": 2300.0},
+                "cumulative-layout-shift": {"numericValue": 0.04},
+            },
+        },
+    }
+
+
+class FixtureServer:
+    """Local HTTP server for fixture pages, static assets, an axe stub and a fake PSI API.
+
+    Routes:
+    - ``/pages/<small|medium|large>.html`` fixture pages
+    - ``/static/*`` CSS/JS/PNG assets
+    - ``/axe.min.js`` axe-core stand-in (point AXE_JS_URL here)
+    - ``/pagespeedonline/v5/runPagespeed`` fake PSI (point PAGESPEED_API_URL here)
+
+    ``asset_latency`` and ``psi_latency`` (seconds) are added to the matching responses.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, asset_latency: float = 0.0, psi_latency: float = 0.5) -> None:
+        self.asset_latency = asset_latency
+        self.psi_latency = psi_latency
+        self.requests = 0
+        self._pages = {name: render_page(name).encode("utf-8") for name in PAGE_PROFILES}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def page_url(self, name: str) -> str:
+        return f"{self.base_url}/pages/{name}.html"
+
+    @property
+    def psi_url(self) -> str:
+        return f"{self.base_url}/pagespeedonline/v5/runPagespeed"
+
+    @property
+    def axe_url(self) -> str:
+        return f"{self.base_url}/axe.min.js"
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="bench-fixtures", daemon=True)
+        self._thread.start()
+        logger.info("bench.fixtures.started | url=%s", self.base_url)
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _route(self, raw_path: str) -> Tuple[int, str, bytes, float]:
+        parsed = urlparse(raw_path)
+        path = parsed.path
+        if path.startswith("/pages/") and path.endswith(".html"):
+            page = self._pages.get(path[len("/pages/"):-len(".html")])
+            if page is not None:
+                return 200, "text/html; charset=utf-8", page, 0.0
+        elif path == "/axe.min.js":
+            return 200, "application/javascript", AXE_STUB_JS.encode("utf-8"), 0.0
+        elif path == "/pagespeedonline/v5/runPagespeed":
+            params = dict(p.split("=", 1) for p in parsed.query.split("&") if "=" in p)
+            body = json.dumps(psi_payload(params.get("url", ""), params.get("strategy", "mobile"))).encode("utf-8")
+            return 200, "application/json", body, self.psi_latency
+        elif path == "/static/site.css":
+            css = "body{font-family:system-ui;margin:0}section{padding:2rem}" * 20
+            return 200, "text/css", css.encode("utf-8"), self.asset_latency
+        elif path.startswith("/static/app") and path.endswith(".js"):
+            js = "(function(){var n=0;for(var i=0;i<1000;i++){n+=i}window.__n=n})();\n" * 30
+            return 200, "application/javascript", js.encode("utf-8"), self.asset_latency
+        elif path.startswith("/static/img") and path.endswith(".png"):
+            return 200, "image/png", _PIXEL, self.asset_latency
+        return 404, "text/plain", b"not found", 0.0
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                status, content_type, body, delay = server._route(self.path)
+                with server._lock:
+                    server.requests += 1
+                if delay:
+                    time.sleep(delay)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                return
+
+        return Handler
@@ -0,0 +1,379 @@
+"""Run the offline benchmark suite.
+
+    python -m benchmarks.run                                  # all scenarios, defaults
+    python -m benchmarks.run --scenarios run_full_generation,http_api --iterations 50 --concurrency 8
+    python -m benchmarks.compare benchmarks/results/<old>.json benchmarks/results/<new>.json
+
+Each scenario runs in its own subprocess (working directory under a temp dir) so peak RSS
+and the ./runtime tree are per scenario. Results are written as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger("ych.bench")
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+SAMPLE_CONTENT = """# Acme Analytics
+## Hero
+Welcome to Acme. We help teams understand their customers.
+## Features
+- Realtime dashboards
+- Privacy-first tracking
+- Integrations with your stack
+## Call to action
+Sign up today
+"""
+
+SAMPLE_AUDIT_RESULTS: Dict[str, Any] = {
+    "url": "http://127.0.0.1/pages/medium.html",
+    "scores": {"performance": 82, "accessibility": 91, "usability": 88},
+    "issues": [
+        {"id": "image-alt", "category": "accessibility", "severity": "critical", "summary": "Images must have alternate text"},
+        {"id": "color-contrast", "category": "accessibility", "severity": "serious", "summary": "Insufficient color contrast"},
+    ],
+    "artifacts": {"screenshots": [], "axe": {"violations": [{"id": "image-alt", "impact": "critical"}]}},
+}
+
+Op = Callable[[int], None]
+
+
+# Stand-ins
+def _install_stand_ins(args: argparse.Namespace, work_dir: Path) -> Dict[str, Any]:
+    """Start the fixture server and route every external dependency to a local stand-in.
+
+    Must run before app modules are imported: the PSI/axe URLs are read from the environment.
+    """
+    from benchmarks.fixtures import FixtureServer
+
+    fixtures = FixtureServer(asset_latency=args.asset_latency, psi_latency=args.psi_latency).start()
+    os.environ["PAGESPEED_API_URL"] = fixtures.psi_url
+    os.environ["AXE_JS_URL"] = fixtures.axe_url
+    os.environ.setdefault("TRACE_EXPORTERS", "none")
+    # Every fixture page shares one origin; politeness limits would measure the limiter, not the app
+    os.environ.setdefault("ORIGIN_MAX_CONCURRENCY", "64")
+    os.environ.setdefault("ORIGIN_MIN_INTERVAL", "0")
+
+    import dspy  # type: ignore
+
+    import app.main  # noqa: F401
+    from app.services import audit as audit_mod
+    from app.services import pipeline as pipeline_mod
+    from app.utils.dspy_config import _lm_metrics_callback
+    from benchmarks.fakes import FakeLM, make_fake_dev_server
+
+    if args.cassette:
+        from app.utils.lm_cassette import ReplayLM
+
+        # Replay recorded production LM traffic instead of the synthetic LM
+        lm = ReplayLM(args.cassette, latency=args.replay_latency)
+    else:
+        lm = FakeLM(latency=args.lm_latency, jitter=args.lm_jitter, seed=args.seed)
+    # The app's lazy ensure_configured() leaves an already-configured LM alone
+    dspy.configure(lm=lm, adapter=dspy.ChatAdapter(), callbacks=[_lm_metrics_callback()])
+
+    # The fixture server is on loopback, which the SSRF guard rightly refuses
+    audit_mod.validate_public_url = lambda url: None
+    exec_latencies = {"install": args.exec_latency, "lint": args.exec_latency, "build": args.exec_latency}
+    pipeline_mod.open_dev_server = lambda out_dir: make_fake_dev_server(
+        str(Path(out_dir) / "workspace"), exec_latencies, push_latency=args.push_latency
+    )
+    return {"fixtures": fixtures, "lm": lm}
+
+
+# Scenarios
+def _scenario_perform_audit(args: argparse.Namespace, work_dir: Path, env: Dict[str, Any]) -> Op:
+    from app.services.audit import perform_audit
+
+    pages = [env["fixtures"].page_url(name) for name in args.pages.split(",")]
+
+    def op(i: int) -> None:
+        options = {"mobile": True, "profile": args.audit_profile, "psi": not args.no_psi, "throttling": args.throttling}
+        result = perform_audit(pages[i % len(pages)], options, str(work_dir / "audit" / str(i)))
+        failed = [w for w in result.get("warnings", []) if w.startswith("playwright_failed")]
+        if failed:
+            raise RuntimeError(failed[0])
+
+    return op
+
+
+def _scenario_run_full_generation(args: argparse.Namespace, work_dir: Path, env: Dict[str, Any]) -> Op:
+    from app.services.pipeline import run_full_generation
+
+    def op(i: int) -> None:
+        run_full_generation({}, str(work_dir / "generate" / str(i)), content=SAMPLE_CONTENT, mode=args.generation_mode)
+
+    return op
+
+
+def _scenario_generate_nextjs_project(args: argparse.Namespace, work_dir: Path, env: Dict[str, Any]) -> Op:
+    from app.models.agents import CopyPlan
+    from app.services.generator import generate_nextjs_project
+    from benchmarks.fakes import FAKE_COPY_PLAN
+
+    copy_plan = CopyPlan(**FAKE_COPY_PLAN)
+
+    def op(i: int) -> None:
+        generate_nextjs_project(SAMPLE_AUDIT_RESULTS, {"brand_colors": ["#2563eb"]}, str(work_dir / "project" / str(i)), copy_plan=copy_plan)
+
+    return op
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _scenario_http_api(args: argparse.Namespace, work_dir: Path, env: Dict[str, Any]) -> Op:
+    """POST /generate (fast or agentic), poll until done, then download the archive."""
+    import httpx
+    import uvicorn
+
+    from app.main import app
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="bench-api", daemon=True).start()
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 10
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError("API server did not start")
+        time.sleep(0.02)
+
+    def op(i: int) -> None:
+        with httpx.Client(base_url=base, timeout=60) as client:
+            resp = client.post("/generate", json={"content": SAMPLE_CONTENT, "mode": args.generation_mode})
+            resp.raise_for_status()
+            job_id = resp.json()["job_id"]
+            while True:
+                status = client.get(f"/generate/{job_id}").json()
+                if status["status"] == "done":
+                    break
+                if status["status"] not in ("queued", "running"):
+                    raise RuntimeError(f"job {job_id} ended with status={status['status']}: {status.get('error')}")
+                time.sleep(args.poll_interval)
+            client.get(f"/generate/{job_id}/archive").raise_for_status()
+
+    return op
+
+
+SCENARIOS: Dict[str, Callable[[argparse.Namespace, Path, Dict[str, Any]], Op]] = {
+    "perform_audit": _scenario_perform_audit,
+    "run_full_generation": _scenario_run_full_generation,
+    "generate_nextjs_project": _scenario_generate_nextjs_project,
+    "http_api": _scenario_http_api,
+}
+
+
+# Measurement
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile; None for an empty sample."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 1)
+
+
+def measure(op: Op, iterations: int, concurrency: int, warmup: int = 0) -> Dict[str, Any]:
+    """Run `op` `iterations` times over `concurrency` threads; latencies in milliseconds."""
+    for i in range(warmup):
+        try:
+            op(-1 - i)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("bench.warmup_failed | err=%s", exc)
+    latencies: List[float] = []
+    errors: List[str] = []
+    lock = threading.Lock()
+
+    def timed(i: int) -> None:
+        start = time.perf_counter()
+        try:
+            op(i)
+        except Exception as exc:  # noqa: BLE001
+            with lock:
+                errors.append(f"{type(exc).__name__}: {exc}"[:300])
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(timed, range(iterations)))
+    wall = time.perf_counter() - started
+
+    def _round(v: Optional[float]) -> Optional[float]:
+        return round(v, 2) if v is not None else None
+
+    return {
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "ok": len(latencies),
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+        "wall_s": round(wall, 3),
+        "throughput_per_s": round(len(latencies) / wall, 3) if wall > 0 else None,
+        "latency_ms": {
+            "p50": _round(percentile(latencies, 50)),
+            "p95": _round(percentile(latencies, 95)),
+            "mean": _round(sum(latencies) / len(latencies)) if latencies else None,
+            "min": _round(min(latencies)) if latencies else None,
+            "max": _round(max(latencies)) if latencies else None,
+        },
+    }
+
+
+def run_scenario(name: str, args: argparse.Namespace, work_dir: Path) -> Dict[str, Any]:
+    """Run one scenario in this process (the driver normally calls this in a subprocess)."""
+    work_dir.mkdir(parents=True, exist_ok=True)
+    env = _install_stand_ins(args, work_dir)
+    try:
+        op = SCENARIOS[name](args, work_dir, env)
+        result = measure(op, args.iterations, args.concurrency, args.warmup)
+        result["lm_calls"] = env["lm"].calls
+        result["fixture_requests"] = env["fixtures"].requests
+        result["peak_rss_mb"] = peak_rss_mb()
+        return result
+    finally:
+        env["fixtures"].stop()
+
+
+def _git(*cmd: str) -> str:
+    try:
+        return subprocess.run(["git", *cmd], cwd=REPO_ROOT, capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def _run_isolated(name: str, argv: List[str], tmp: Path) -> Dict[str, Any]:
+    work_dir = tmp / name
+    work_dir.mkdir(parents=True, exist_ok=True)
+    result_file = work_dir / "result.json"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")]))}
+    cmd = [sys.executable, "-m", "benchmarks.run", *argv, "--worker", name, "--result-file", str(result_file)]
+    proc = subprocess.run(cmd, cwd=work_dir, env=env, capture_output=True, text=True)
+    if proc.returncode != 0 or not result_file.exists():
+        logger.error("bench.scenario_failed | scenario=%s | rc=%s\n%s", name, proc.returncode, proc.stderr[-4000:])
+        return {"failed": True, "returncode": proc.returncode, "stderr_tail": proc.stderr[-2000:]}
+    return json.loads(result_file.read_text(encoding="utf-8"))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for audit and generation paths")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured iterations before timing")
+    parser.add_argument("--pages", default="small,medium,large", help="Fixture pages audited round-robin")
+    parser.add_argument("--audit-profile", choices=["fast", "fidelity"], default="fidelity")
+    parser.add_argument(
+        "--throttling", choices=["none", "slow-4g-midtier", "fast-3g", "desktop-cable"], default="none",
+        help="Network/CPU emulation profile for audits",
+    )
+    parser.add_argument("--no-psi", action="store_true", help="Skip the PSI enrichment step (lab metrics only)")
+    parser.add_argument("--generation-mode", choices=["fast", "agentic"], default="fast")
+    parser.add_argument("--lm-latency", type=float, default=0.2, help="Seconds per fake LM call")
+    parser.add_argument("--lm-jitter", type=float, default=0.0, help="Extra seeded random seconds per LM call")
+    parser.add_argument("--cassette", help="Replay LM responses from a recorded cassette instead of the fake LM")
+    parser.add_argument("--replay-latency", choices=["original", "zero"], default="original")
+    parser.add_argument("--psi-latency", type=float, default=0.5, help="Seconds per fake PSI response")
+    parser.add_argument("--asset-latency", type=float, default=0.0, help="Seconds per fixture static asset")
+    parser.add_argument("--exec-latency", type=float, default=0.0, help="Seconds per fake npm install/lint/build")
+    parser.add_argument("--push-latency", type=float, default=0.0, help="Seconds per fake commit_and_push")
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="http_api status polling interval")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Result JSON path (default benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--in-process", action="store_true", help="Run scenarios in this process (RSS is then cumulative)")
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+    if not args.verbose:
+        logging.getLogger("ych.bench").setLevel(logging.INFO)
+
+    if args.worker:
+        result = run_scenario(args.worker, args, Path.cwd())
+        Path(args.result_file).write_text(json.dumps(result, indent=2), encoding="utf-8")
+        return 0
+
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        build_parser().error(f"unknown scenarios: {', '.join(unknown)}")
+
+    commit = _git("rev-parse", "--short", "HEAD") or "unknown"
+    started = datetime.now(timezone.utc)
+    config = {k: v for k, v in vars(args).items() if k not in ("out", "worker", "result_file", "verbose", "scenarios")}
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="ych-bench-") as tmp:
+        for name in names:
+            logger.info("bench.scenario | %s | iterations=%s concurrency=%s", name, args.iterations, args.concurrency)
+            if args.in_process:
+                results[name] = run_scenario(name, args, Path(tmp) / name)
+            else:
+                child_argv = [a for a in argv if a != "--in-process"]
+                results[name] = _run_isolated(name, child_argv, Path(tmp))
+            r = results[name]
+            if not r.get("failed"):
+                logger.info(
+                    "bench.result | %s | p50=%sms p95=%sms | %s/s | rss=%sMB | errors=%s",
+                    name, r["latency_ms"]["p50"], r["latency_ms"]["p95"], r["throughput_per_s"], r["peak_rss_mb"], r["errors"],
+                )
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+            "started_at": started.isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "config": config,
+        },
+        "scenarios": results,
+    }
+    out = Path(args.out) if args.out else RESULTS_DIR / f"{commit}-{started.strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    logger.info("bench.done | out=%s", out)
+    print(str(out))
+    return 0 if all(not r.get("failed") for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
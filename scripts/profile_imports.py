@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Import-time profile of the API entry module.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter, prints the
+slowest imports, and (with --check) fails if heavy optional dependencies were loaded
+or the total exceeds --budget-ms.
+
+    python scripts/profile_imports.py
+    python scripts/profile_imports.py --check --budget-ms 1500
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+
+ROOT = Path(__file__).resolve().parents[1]
+# Must only be imported on first use (first audit / generation / dev server)
+HEAVY_MODULES = ("dspy", "litellm", "playwright", "freestyle")
+
+_LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def profile(module: str) -> Tuple[List[Tuple[str, int, int, int]], List[str]]:
+    """Return (name, self_us, cumulative_us, depth) rows and the heavy modules that got loaded."""
+    probe = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")]))}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-4000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            self_us, cum_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cum_us), len(indent) // 2))
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return rows, loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Profile import time of the API module")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--check", action="store_true", help="Exit 1 if heavy modules load or the budget is exceeded")
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    rows, loaded = profile(args.module)
+    total = next((cum for name, _, cum, depth in rows if name == args.module and depth == 0), 0) / 1000
+    print(f"import {args.module}: {total:.0f} ms cumulative")
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cum_us, _ in sorted(rows, key=lambda r: r[2], reverse=True)[: args.top]:
+        print(f"{cum_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+    print(f"\nheavy modules loaded at import: {', '.join(loaded) or 'none'}")
+
+    if not args.check:
+        return 0
+    failed = False
+    if loaded:
+        print(f"FAIL: {', '.join(loaded)} imported eagerly; import them on first use")
+        failed = True
+    if args.budget_ms is not None and total > args.budget_ms:
+        print(f"FAIL: {total:.0f} ms exceeds budget of {args.budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,16 +2,23 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
 import os
 import subprocess
 import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 import shutil
 import webbrowser
 
 
 RUNTIME_BASE = Path(__file__).resolve().parents[1] / "runtime" / "generate"
+# Maintained by app.utils.storage whenever a runnable project is generated
+LATEST_PROJECT_FILE = RUNTIME_BASE.parent / "latest_project"
+DEPS_STORE = Path(os.getenv("RENDER_DEPS_STORE") or Path(__file__).resolve().parents[1] / "runtime" / "deps-store")
+LOCKFILES = ("pnpm-lock.yaml", "yarn.lock", "package-lock.json")
 
 
 def choose_package_manager() -> str:
@@ -22,6 +29,13 @@ def choose_package_manager() -> str:
 
 
 def find_latest_project_dir() -> Optional[Path]:
+    try:
+        latest = Path(LATEST_PROJECT_FILE.read_text().strip())
+        if (latest / "package.json").exists():
+            return latest
+    except OSError:
+        pass
+    # Fall back to scanning job directories (pointer missing or stale)
     if not RUNTIME_BASE.exists():
         return None
     job_dirs = [p for p in RUNTIME_BASE.iterdir() if p.is_dir()]
@@ -48,6 +62,107 @@ def run(cmd: list[str], cwd: Path, env: dict[str, str] | None = None) -> int:
         return 130
 
 
+def deps_key(project_dir: Path, pm: str) -> str:
+    """Hash of package.json, the lockfile (if any) and the package manager."""
+    h = hashlib.sha256(pm.encode())
+    h.update((project_dir / "package.json").read_bytes())
+    for name in LOCKFILES:
+        lock = project_dir / name
+        if lock.exists():
+            h.update(name.encode() + lock.read_bytes())
+    return h.hexdigest()[:24]
+
+
+def ensure_store_entry(project_dir: Path, pm: str, force: bool = False) -> Tuple[Optional[Path], bool]:
+    """Make sure a shared node_modules exists for the project's dependencies.
+
+    Returns (entry_dir, reused). entry_dir is None if installation failed.
+    """
+    entry = DEPS_STORE / deps_key(project_dir, pm)
+    if (entry / "node_modules").is_dir() and not force:
+        return entry, True
+
+    staging = DEPS_STORE / f".staging-{entry.name}-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    shutil.copy2(project_dir / "package.json", staging / "package.json")
+    for name in LOCKFILES:
+        if (project_dir / name).exists():
+            shutil.copy2(project_dir / name, staging / name)
+
+    print(f"Installing dependencies into shared store {entry.name} ...")
+    started = time.monotonic()
+    code = run([pm, "install"], cwd=staging)
+    if code != 0:
+        shutil.rmtree(staging, ignore_errors=True)
+        return None, False
+    elapsed = time.monotonic() - started
+    (staging / "store.json").write_text(json.dumps({"pm": pm, "install_seconds": round(elapsed, 2), "reuses": 0}))
+    shutil.rmtree(entry, ignore_errors=True)
+    staging.rename(entry)
+    print(f"Installed in {elapsed:.1f}s")
+    return entry, False
+
+
+def link_node_modules(project_dir: Path, entry: Path, mode: str = "symlink") -> None:
+    """Point project_dir/node_modules at the store entry (symlink) or a hardlinked copy."""
+    target = project_dir / "node_modules"
+    if target.is_symlink() or target.is_file():
+        target.unlink()
+    elif target.is_dir():
+        shutil.rmtree(target)
+    if mode == "hardlink":
+        shutil.copytree(entry / "node_modules", target, symlinks=True, copy_function=os.link)
+    else:
+        target.symlink_to(entry / "node_modules", target_is_directory=True)
+
+
+def break_shared_links(project_dir: Path) -> int:
+    """Turn hard-linked project files (shared read-only blobs from older runs) into private copies.
+
+    `next dev` and linters rewrite files such as tsconfig.json in place; through a link that
+    would change every job sharing the blob. node_modules is left alone (see --link-mode).
+    """
+    broken = 0
+    for dirpath, dirnames, filenames in os.walk(project_dir):
+        dirnames[:] = [d for d in dirnames if d not in ("node_modules", ".next", ".git")]
+        for name in filenames:
+            path = Path(dirpath) / name
+            if path.is_symlink() or path.stat().st_nlink < 2:
+                continue
+            tmp = path.with_name(f".{name}.unlink.tmp")
+            shutil.copyfile(path, tmp)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path)
+            broken += 1
+    return broken
+
+
+def record_reuse(entry: Path) -> float:
+    """Bump the reuse counter and return the install time this reuse saved."""
+    meta_path = entry / "store.json"
+    try:
+        meta = json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return 0.0
+    meta["reuses"] = int(meta.get("reuses", 0)) + 1
+    meta_path.write_text(json.dumps(meta))
+    return float(meta.get("install_seconds", 0.0))
+
+
+def install_dependencies(project_dir: Path, pm: str, force: bool, shared: bool, link_mode: str) -> int:
+    if not shared:
+        return run([pm, "install"], cwd=project_dir)
+    entry, reused = ensure_store_entry(project_dir, pm, force=force)
+    if entry is None:
+        return 1
+    link_node_modules(project_dir, entry, link_mode)
+    if reused:
+        saved = record_reuse(entry)
+        print(f"Reused shared dependencies {entry.name} ({link_mode}); saved ~{saved:.1f}s of install time")
+    return 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Render a generated Next.js site")
     parser.add_argument("--project-dir", type=str, help="Path to generated next_project directory")
@@ -55,6 +170,9 @@ def main() -> int:
     parser.add_argument("--port", type=int, default=3000, help="Port to run the server on")
     parser.add_argument("--install", action="store_true", help="Force install dependencies")
     parser.add_argument("--open", action="store_true", help="Open the site in the default browser")
+    parser.add_argument("--prewarm", action="store_true", help="Populate the shared dependency store and exit")
+    parser.add_argument("--no-shared-deps", action="store_true", help="Install node_modules inside the project instead of the shared store")
+    parser.add_argument("--link-mode", choices=("symlink", "hardlink"), default="symlink", help="How shared node_modules are linked into the project")
     args = parser.parse_args()
 
     if args.project_dir:
@@ -68,14 +186,23 @@ def main() -> int:
         return 1
 
     print(f"Using project: {project_dir}")
+    if break_shared_links(project_dir):
+        print("Replaced shared (hard-linked) project files with private copies")
 
     pm = choose_package_manager()
     print(f"Using package manager: {pm}")
 
+    if args.prewarm:
+        entry, reused = ensure_store_entry(project_dir, pm, force=args.install)
+        if entry is None:
+            return 1
+        print(f"Dependency store {'already warm' if reused else 'ready'}: {entry}")
+        return 0
+
     # Install deps if requested or node_modules missing
     if args.install or not (project_dir / "node_modules").exists():
         print("Installing dependencies...")
-        code = run([pm, "install"], cwd=project_dir)
+        code = install_dependencies(project_dir, pm, args.install, not args.no_shared_deps, args.link_mode)
         if code != 0:
             return code
 
@@ -5,3 +5,6 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+# Keep test runs from appending spans under ./runtime
+os.environ.setdefault("TRACE_EXPORTERS", "none")
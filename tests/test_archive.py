@@ -0,0 +1,85 @@
+import io
+import zipfile
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.archive import archives, build_zip, iter_zip, parse_range, project_paths
+from app.utils.jobs import jobs
+
+
+def _project(tmp_path):
+    root = tmp_path / "next_project"
+    (root / "app").mkdir(parents=True)
+    (root / "node_modules" / "next").mkdir(parents=True)
+    (root / "package.json").write_text('{"name": "ych-generated"}')
+    (root / "app" / "page.tsx").write_text("export default function Page() { return null; }\n" * 200)
+    (root / "node_modules" / "next" / "index.js").write_text("ignored")
+    return root
+
+
+def test_build_zip_is_deterministic():
+    files = {"b.txt": b"b" * 1000, "a/x.txt": b"x"}
+    assert build_zip(files, 6) == build_zip(dict(reversed(list(files.items()))), 6)
+    assert len(list(iter_zip(files, 6))) == 3  # one chunk per entry, then the central directory
+    stored = build_zip(files, 0)
+    assert zipfile.ZipFile(io.BytesIO(stored)).infolist()[0].compress_type == zipfile.ZIP_STORED
+
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=0-500", 100) == (0, 99)
+
+
+def test_archive_endpoint(tmp_path):
+    job_id = "archive-test"
+    jobs.create_job("generate", job_id)
+    jobs.start_job("generate", job_id)
+    jobs.complete_job("generate", job_id, {"project_dir": str(_project(tmp_path))})
+    client = TestClient(app)
+
+    full = client.get(f"/generate/{job_id}/archive")
+    assert full.status_code == 200
+    # First download is streamed while zipping, without a Content-Length
+    assert "content-length" not in full.headers
+    assert full.content == build_zip(project_paths(str(tmp_path / "next_project")), 6)
+    assert archives.get(full.headers["etag"]) == full.content
+    names = zipfile.ZipFile(io.BytesIO(full.content)).namelist()
+    assert names == ["app/page.tsx", "package.json"]
+    etag = full.headers["etag"]
+
+    again = client.get(f"/generate/{job_id}/archive")
+    assert again.content == full.content and again.headers["etag"] == etag
+    assert client.get(f"/generate/{job_id}/archive", headers={"If-None-Match": etag}).status_code == 304
+
+    part = client.get(f"/generate/{job_id}/archive", headers={"Range": "bytes=10-19"})
+    assert part.status_code == 206
+    assert part.content == full.content[10:20]
+    assert part.headers["content-range"] == f"bytes 10-19/{len(full.content)}"
+    assert client.get(f"/generate/{job_id}/archive", headers={"Range": "bytes=999999-"}).status_code == 416
+
+    stored = client.get(f"/generate/{job_id}/archive?level=0")
+    assert stored.headers["etag"] != etag
+    assert len(stored.content) > len(full.content)
+
+
+def test_archive_etag_tracks_files_on_disk(tmp_path):
+    job_id = "archive-edit-test"
+    root = _project(tmp_path)
+    jobs.create_job("generate", job_id)
+    jobs.start_job("generate", job_id)
+    jobs.complete_job("generate", job_id, {"project_dir": str(root)})
+    client = TestClient(app)
+    first = client.get(f"/generate/{job_id}/archive")
+
+    (root / "package.json").write_text('{"name": "edited"}')
+    (root / "extra.txt").write_text("added after generation")
+    second = client.get(f"/generate/{job_id}/archive", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
+    zf = zipfile.ZipFile(io.BytesIO(second.content))
+    assert zf.namelist() == ["app/page.tsx", "extra.txt", "package.json"]
+    assert zf.read("package.json") == b'{"name": "edited"}'
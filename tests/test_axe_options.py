@@ -0,0 +1,22 @@
+import pytest
+from pydantic import ValidationError
+
+from app.models.schemas import AuditOptions, AxeOptions
+from app.services.audit import _axe_args
+
+
+def test_default_axe_run_is_scoped_to_wcag_violations():
+    args = _axe_args(AuditOptions().axe)
+    assert args["context"] is None
+    assert args["options"] == {"resultTypes": ["violations"], "runOnly": {"type": "tag", "values": ["wcag2a", "wcag2aa"]}}
+    assert args["resultTypes"] == ["violations"] and args["maxNodes"] == 5
+
+
+def test_axe_selectors_and_unscoped_rules():
+    axe = AxeOptions(tags=None, result_types=["violations", "incomplete"], max_nodes=2, include=["main"], exclude=[".ads"])
+    args = _axe_args(axe)
+    assert args["context"] == {"include": ["main"], "exclude": [".ads"]}
+    assert "runOnly" not in args["options"]
+    assert _axe_args(AxeOptions(exclude=["iframe"]))["context"] == {"exclude": ["iframe"]}
+    with pytest.raises(ValidationError):
+        AxeOptions(max_nodes=0)
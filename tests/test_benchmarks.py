@@ -0,0 +1,35 @@
+import dspy
+
+from app.services.dspy_agents import agent_content_improver
+from benchmarks.compare import compare
+from benchmarks.fakes import FakeLM
+from benchmarks.run import measure, percentile
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 21)]
+    assert percentile(values, 50) == 10.0
+    assert percentile(values, 95) == 19.0
+    assert percentile([], 50) is None
+
+
+def test_fake_lm_drives_agents_deterministically():
+    lm = FakeLM(latency=0)
+    with dspy.context(lm=lm, adapter=dspy.ChatAdapter()):
+        first = agent_content_improver("# Site\n## Hero\nWelcome", tone="professional")
+        second = agent_content_improver("# Site\n## Hero\nWelcome", tone="professional")
+    assert first == second
+    assert any(b.path == "/hero" for b in first.blocks)
+    assert lm.calls == 2
+
+
+def test_measure_and_compare_flag_regressions():
+    calls = []
+    result = measure(lambda i: calls.append(i), iterations=5, concurrency=2, warmup=1)
+    assert result["ok"] == 5 and result["errors"] == 0
+    assert len(calls) == 6
+
+    base = {"meta": {"commit": "a"}, "scenarios": {"s": {"latency_ms": {"p50": 100.0, "p95": 200.0}, "throughput_per_s": 10.0}}}
+    head = {"meta": {"commit": "b"}, "scenarios": {"s": {"latency_ms": {"p50": 150.0, "p95": 205.0}, "throughput_per_s": 10.0}}}
+    _, regressions = compare(base, head, threshold=10)
+    assert regressions == ["s p50 ms: 100.0 -> 150.0 (+50.0%)"]
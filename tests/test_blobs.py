@@ -0,0 +1,63 @@
+import hashlib
+import os
+
+from app.utils import storage as storage_mod
+from app.utils.jobs import jobs
+from app.utils.manifest import sync_files
+from app.utils.metrics import ARTIFACT_BYTES
+
+
+def test_identical_artifacts_share_one_blob(tmp_path):
+    mgr = storage_mod._StorageManager(tmp_path, ttl_seconds=0, quota_bytes=0, interval_seconds=0)
+    before = ARTIFACT_BYTES.value(kind="audit", outcome="deduplicated")
+    a = tmp_path / "audit" / "a1" / "dom.html"
+    b = tmp_path / "audit" / "a2" / "dom.html"
+    digest = mgr.blobs.materialize(a, "<html>same</html>", kind="audit")
+    assert mgr.blobs.materialize(b, "<html>same</html>", kind="audit") == digest
+    assert os.path.samefile(a, b) and os.path.samefile(a, tmp_path / "blobs" / digest[:2] / digest)
+    assert ARTIFACT_BYTES.value(kind="audit", outcome="deduplicated") == before + len("<html>same</html>")
+    stats = mgr.blobs.stats()
+    assert stats["blobs"] == 1 and stats["dedup_ratio"] == 2.0
+
+    # A screenshot written by someone else is adopted in place
+    shot = tmp_path / "audit" / "a2" / "shot.png"
+    shot.write_bytes(b"png")
+    mgr.blobs.adopt(shot, kind="audit")
+    assert os.stat(shot).st_nlink == 2
+
+    # Generated projects are private copies: writing through one job's file in place
+    # (as `next dev` does with tsconfig.json) leaves the other job's copy alone
+    project = tmp_path / "generate" / "g1" / "next_project"
+    other = tmp_path / "generate" / "g2" / "next_project"
+    sync_files(project, {"tsconfig.json": "{}"})
+    sync_files(other, {"tsconfig.json": "{}"})
+    assert os.stat(project / "tsconfig.json").st_nlink == 1
+    with open(project / "tsconfig.json", "w") as fh:
+        fh.write('{"strict": true}')
+    assert (other / "tsconfig.json").read_text() == "{}"
+
+    # A file still linked to a blob (older runs) is replaced, never written through
+    mgr.blobs.materialize(other / "next.config.js", "module.exports = {}", kind="generate")
+    sync_files(other, {"tsconfig.json": "{}", "next.config.js": "module.exports = {a: 1}"})
+    assert os.stat(other / "next.config.js").st_nlink == 1
+    digest = hashlib.sha256(b"module.exports = {}").hexdigest()
+    assert (tmp_path / "blobs" / digest[:2] / digest).read_text() == "module.exports = {}"
+
+def test_evicting_the_last_reference_frees_the_blob(tmp_path):
+    mgr = storage_mod._StorageManager(tmp_path, ttl_seconds=0, quota_bytes=1, interval_seconds=0)
+    for job_id in ("blob-a", "blob-b"):
+        jobs.create_job("audit", job_id)
+        jobs.start_job("audit", job_id)
+        job_dir = tmp_path / "audit" / job_id
+        mgr.blobs.materialize(job_dir / "screenshot_full.png", b"x" * 1000, kind="audit")
+        mgr.register("audit", job_id, job_dir)
+        mgr.refresh("audit", job_id)
+        jobs.complete_job("audit", job_id, {})
+    # Shared content is counted once
+    assert mgr.total_bytes() == 1000
+
+    mgr.collect_garbage()
+    assert jobs.get_job("audit", "blob-a")["status"] == "expired"
+    assert jobs.get_job("audit", "blob-b")["status"] == "expired"
+    assert mgr.blobs.stats()["blobs"] == 0
+    assert mgr.total_bytes() == 0
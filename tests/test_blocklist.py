@@ -0,0 +1,77 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.services import blocklist
+from app.services.audit import _block_resources
+from app.services.blocklist import blocking_reason
+
+
+def test_blocking_reason():
+    assert blocking_reason("https://www.google-analytics.com/g/collect", "xhr") == "tracker"
+    assert blocking_reason("https://widget.intercom.io/widget/abc", "script") == "tracker"
+    assert blocking_reason("https://www.facebook.com/tr?id=1", "image") == "tracker"
+    assert blocking_reason("https://www.facebook.com/acme", "document") is None
+    assert blocking_reason("https://example.com/hero.mp4", "media") == "media"
+    assert blocking_reason("https://example.com/font.woff2", "font") is None
+    assert blocking_reason("https://example.com/font.woff2", "font", block_fonts=True) == "font"
+    assert blocking_reason("https://example.com/app.js", "script") is None
+    # Analytics host loaded as the page itself is still audited, but not as an iframe
+    assert blocking_reason("https://hotjar.com/", "document", main_frame=True) is None
+    assert blocking_reason("https://hotjar.com/", "document") == "tracker"
+
+
+def test_blocklist_file_extends_domains(tmp_path, monkeypatch):
+    extra = tmp_path / "blocklist.txt"
+    extra.write_text("# in-house tracking\ntrack.example.net\n\n", encoding="utf-8")
+    monkeypatch.setenv("AUDIT_BLOCKLIST_FILE", str(extra))
+    blocklist.tracker_domains.cache_clear()
+    try:
+        assert blocking_reason("https://eu.track.example.net/p.js", "script") == "tracker"
+    finally:
+        monkeypatch.delenv("AUDIT_BLOCKLIST_FILE")
+        blocklist.tracker_domains.cache_clear()
+
+
+class _Route:
+    def __init__(self, url, resource_type, parent_frame=None, navigation=None):
+        navigation = resource_type == "document" if navigation is None else navigation
+        self.request = SimpleNamespace(
+            url=url,
+            resource_type=resource_type,
+            is_navigation_request=lambda: navigation,
+            frame=SimpleNamespace(parent_frame=parent_frame),
+        )
+        self.outcome = None
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+    async def abort(self, error_code=None):
+        self.outcome = error_code
+
+
+def test_fast_profile_routes_and_counts_blocked_requests():
+    handlers = []
+
+    async def route(pattern, handler):
+        handlers.append(handler)
+
+    async def run():
+        stats = await _block_resources(SimpleNamespace(route=route), block_fonts=False)
+        routes = [
+            _Route("https://example.com/", "document"),
+            _Route("https://www.googletagmanager.com/gtm.js", "script"),
+            _Route("https://example.com/intro.webm", "media"),
+            # Tracker and chat-widget iframes navigate child frames
+            _Route("https://googleads.g.doubleclick.net/pagead/ads", "document", parent_frame=object()),
+            _Route("https://example.com/embed", "document", parent_frame=object()),
+        ]
+        for r in routes:
+            await handlers[0](r)
+        return stats, routes
+
+    stats, routes = asyncio.run(run())
+    assert [r.outcome for r in routes] == ["continued", "blockedbyclient", "blockedbyclient", "blockedbyclient", "continued"]
+    assert stats["blocked"] == 3
+    assert stats["by_reason"] == {"tracker": 2, "media": 1}
+    assert stats["est_bytes_saved"] == sum(blocklist.TYPICAL_BYTES[t] for t in ("script", "media", "document"))
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.services.job_runner import RUNNERS, run_job
+from app.services.local_devserver import LocalDevServerProcess
+from app.utils.cancellation import DeadlineExceeded, JobCancelled, cancellations, check_cancelled, job_scope
+from app.utils.jobs import _Jobs, _SqliteJobs
+from app.utils.metrics import STAGE_FAILURES, track_stage
+
+
+def test_stage_deadline_interrupts_only_that_stage():
+    token = cancellations.register("generate", "deadline-test", {"lint": 0.05})
+    failures = STAGE_FAILURES.value(kind="generate", stage="lint")
+    with job_scope(token):
+        with pytest.raises(DeadlineExceeded):
+            with track_stage("generate", "lint"):
+                while True:
+                    check_cancelled()
+                    time.sleep(0.01)
+        # The job itself is still alive; later stages run normally
+        with track_stage("generate", "build"):
+            check_cancelled()
+    cancellations.release("generate", "deadline-test")
+    assert STAGE_FAILURES.value(kind="generate", stage="lint") == failures + 1
+
+
+def test_cancel_kills_running_local_exec(tmp_path):
+    proc = LocalDevServerProcess(tmp_path, tmp_path / "npm-cache")
+    token = cancellations.register("generate", "exec-test")
+    threading.Timer(0.2, cancellations.cancel, args=("generate", "exec-test", "cancelled by client")).start()
+    start = time.monotonic()
+    with job_scope(token):
+        with pytest.raises(JobCancelled, match="cancelled by client"):
+            proc.exec("sleep 30")
+    cancellations.release("generate", "exec-test")
+    assert time.monotonic() - start < 5
+
+
+def test_delete_cancels_queued_and_running_jobs(tmp_path, monkeypatch):
+    store = _SqliteJobs(tmp_path / "jobs.db")
+    monkeypatch.setattr(routes, "jobs", store)
+    client = TestClient(app)
+    for job_id in ("running", "finished"):
+        store.create_job("audit", job_id)
+        store.claim(["audit"], "w")
+    store.complete_job("audit", "finished", {})
+    store.create_job("audit", "queued")
+
+    assert client.delete("/audit/queued").json() == {"status": "cancelled"}
+    assert client.delete("/audit/running").json() == {"status": "cancelling"}
+    assert store.is_cancel_requested("audit", "running")
+    assert client.delete("/audit/finished").status_code == 409
+    assert client.delete("/audit/missing").status_code == 404
+    assert store.get_job("audit", "queued")["status"] == "cancelled"
+
+
+def test_runner_records_cancelled_job(tmp_path, monkeypatch):
+    store = _SqliteJobs(tmp_path / "jobs.db")
+    monkeypatch.setattr("app.services.job_runner.jobs", store)
+
+    def slow_job(job_id, payload):
+        store.start_job("audit", job_id)
+        while True:
+            check_cancelled()
+            time.sleep(0.01)
+
+    monkeypatch.setitem(RUNNERS, "audit", slow_job)
+    store.create_job("audit", "a1")
+    store.create_job("audit", "a2")
+    threading.Timer(0.1, cancellations.cancel, args=("audit", "a1", "cancelled by client")).start()
+    run_job("audit", "a1", {})
+    run_job("audit", "a2", {"deadlines": {"total": 0.05}})
+
+    assert store.get_job("audit", "a1") == {"status": "cancelled", "result": None, "error": {"error": "cancelled by client"}, "trace_id": None, "phases": None}
+    assert store.get_job("audit", "a2")["error"]["deadline_exceeded"] is True
+
+
+def test_cancel_between_claim_and_start_is_not_lost(monkeypatch):
+    store = _Jobs()
+    monkeypatch.setattr("app.services.job_runner.jobs", store)
+    ran = []
+    monkeypatch.setitem(RUNNERS, "audit", lambda job_id, payload: ran.append(job_id))
+    store.create_job("audit", "raced")
+    store.claim(["audit"], "w")
+    # No token is registered yet, so the route's cancellations.cancel reaches nothing
+    assert store.request_cancel("audit", "raced") == "cancelling"
+    run_job("audit", "raced", {})
+    assert ran == []
+    assert store.get_job("audit", "raced")["status"] == "cancelled"
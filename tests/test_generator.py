@@ -0,0 +1,53 @@
+from app.models.agents import CopyBlock, CopyPlan
+from app.services.generator import render_template_site
+from app.services.style_guide import default_style
+
+
+def _plan() -> CopyPlan:
+    return CopyPlan(
+        summary="Chiropractic care in San Jose",
+        blocks=[
+            CopyBlock(path="/hero", original_text="", improved_text="Feel better {today}\nCare <you> can trust."),
+            CopyBlock(path="/services/massage", original_text="", improved_text="Massage\nRelax and recover."),
+            CopyBlock(path="/cta", original_text="", improved_text="Book your visit"),
+        ],
+    )
+
+
+def test_template_site_renders_style_components():
+    style = default_style()
+    files = render_template_site(_plan(), style)
+
+    assert set(files) == {"app/page.tsx"} | {f"components/{c}.tsx" for c in style.components}
+    page = files["app/page.tsx"]
+    # Copy is embedded as JSON data, never interpolated into JSX
+    assert '"title": "Feel better {today}"' in page
+    assert '"body": "Care <you> can trust."' in page
+    assert "<FeatureGrid features={content.features} />" in page
+    assert render_template_site(_plan(), style) == files
+
+
+def test_template_site_only_mounts_requested_components():
+    style = default_style()
+    style.components = ["Hero", "Footer"]
+    files = render_template_site(None, style)
+    assert sorted(files) == ["app/page.tsx", "components/Footer.tsx", "components/Hero.tsx"]
+    assert "Navbar" not in files["app/page.tsx"]
+
+
+def test_regeneration_only_touches_changed_files(tmp_path, monkeypatch):
+    from app.services.generator import generate_nextjs_project
+    from app.utils import storage as storage_mod
+
+    monkeypatch.setattr(storage_mod, "LATEST_PROJECT_FILE", tmp_path / "latest_project")
+
+    first = generate_nextjs_project({}, {}, str(tmp_path))
+    assert first["changed"]
+    assert "package.json" in first["manifest_diff"]["added"]
+
+    again = generate_nextjs_project({}, {}, str(tmp_path))
+    assert not again["changed"]
+    assert again["manifest_diff"]["unchanged"] == sorted(first["manifest_diff"]["added"])
+
+    tweaked = generate_nextjs_project({}, {"brand_colors": ["#ff0000"]}, str(tmp_path))
+    assert tweaked["manifest_diff"]["changed"] == ["analysis.json", "styles/globals.css"]
@@ -0,0 +1,173 @@
+import json
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.utils.jobs import _Jobs, _SqliteJobs
+from app.utils.metrics import JOB_QUEUE_WAIT_SECONDS
+from app.utils.tenants import tenants
+
+
+def test_sqlite_claims_are_exclusive_and_ordered(tmp_path):
+    store = _SqliteJobs(tmp_path / "jobs.db")
+    for i in range(20):
+        store.create_job("generate", f"g{i}", trace_id="t", payload={"n": i}, parent_span_id="s")
+    store.create_job("audit", "a0", payload={"url": "https://example.com"})
+
+    first = store.claim(["generate"], "w-first")
+    assert first["id"] == "g0" and first["payload"] == {"n": 0}
+    assert (first["trace_id"], first["parent_span_id"]) == ("t", "s")
+
+    claimed, lock = [], threading.Lock()
+
+    def consume(worker: str) -> None:
+        other = _SqliteJobs(tmp_path / "jobs.db")
+        while (job := other.claim(["generate"], worker)) is not None:
+            with lock:
+                claimed.append(job["id"])
+
+    threads = [threading.Thread(target=consume, args=(f"w{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(claimed) == sorted(f"g{i}" for i in range(1, 20))
+    assert store.get_job("audit", "a0")["status"] == "queued"
+    assert store.status_counts()[("generate", "running")] == 20
+
+
+def test_sqlite_results_and_reaping(tmp_path):
+    store = _SqliteJobs(tmp_path / "jobs.db")
+    for job_id in ("ok", "crashed", "silent"):
+        store.create_job("audit", job_id)
+    store.claim(["audit"], "w1")
+    store.complete_job("audit", "ok", {"scores": {"performance": 90}})
+    store.claim(["audit"], "w2")
+    store.claim(["audit"], "w3")
+
+    assert store.fail_running("worker process exited with code -9", worker="w2") == 1
+    assert store.fail_running("worker heartbeat timed out", stale_after=-1) == 1
+    assert store.get_job("audit", "ok") == {"status": "done", "result": {"scores": {"performance": 90}}, "error": None, "trace_id": None, "phases": None}
+    assert store.get_job("audit", "crashed")["error"]["error"] == "worker process exited with code -9"
+    assert store.get_job("audit", "silent")["status"] == "error"
+    # The reaped slot finishing later does not flip the recorded outcome
+    assert store.complete_job("audit", "crashed", {"late": True}) is False
+    assert store.cancel_job("audit", "silent", "cancelled by client") is False
+    assert store.get_job("audit", "crashed")["status"] == "error"
+    assert store.get_job("audit", "silent")["error"]["error"] == "worker heartbeat timed out"
+
+
+def test_api_only_enqueues_with_shared_queue(tmp_path, monkeypatch):
+    store = _SqliteJobs(tmp_path / "jobs.db")
+    monkeypatch.setattr(routes, "jobs", store)
+    client = TestClient(app)
+
+    audit_id = client.post("/audit", json={"url": "https://example.com", "options": {"mobile": False}}).json()["audit_id"]
+    assert client.get(f"/audit/{audit_id}").json()["status"] == "queued"
+    job = store.claim(["audit"], "w")
+    assert job["id"] == audit_id
+    assert job["payload"]["options"]["mobile"] is False
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    return _Jobs() if request.param == "memory" else _SqliteJobs(tmp_path / "jobs.db")
+
+
+def test_claim_prefers_interactive_and_shares_fairly_by_weight(store):
+    for i in range(6):
+        store.create_job("audit", f"bulk{i}", tenant="bulk", priority="batch", weight=2.0)
+    for i in range(3):
+        store.create_job("audit", f"small{i}", tenant="small", priority="batch")
+    store.create_job("audit", "urgent", tenant="small", priority="interactive")
+    waits = JOB_QUEUE_WAIT_SECONDS.count(kind="audit", priority="interactive")
+
+    order = [store.claim(["audit"], "w")["id"] for _ in range(7)]
+    assert order[0] == "urgent"
+    # bulk has twice the weight, so it holds two running slots for each of small's
+    assert order[1:] == ["bulk0", "small0", "bulk1", "bulk2", "small1", "bulk3"]
+    if store.out_of_process:
+        # Claimed by workers; the API reads the waits from the shared queue
+        assert store.observe_queue_waits() == 7
+    assert JOB_QUEUE_WAIT_SECONDS.count(kind="audit", priority="interactive") == waits + 1
+
+
+def test_batch_limit_keeps_slots_for_interactive(store):
+    store.create_job("generate", "b0", priority="batch")
+    store.create_job("generate", "b1", priority="batch")
+    limits = {"generate": 1}
+    assert store.claim(["generate"], "w", limits)["id"] == "b0"
+    assert store.claim(["generate"], "w", limits) is None
+    store.create_job("generate", "i0")
+    assert store.claim(["generate"], "w", limits)["id"] == "i0"
+    store.complete_job("generate", "b0", {})
+    assert store.claim(["generate"], "w", limits)["id"] == "b1"
+
+
+def test_api_key_caps_priority(monkeypatch):
+    monkeypatch.setenv("API_KEYS", json.dumps({"k-bulk": {"tenant": "acme", "priority": "batch", "weight": 3}}))
+    tenants.reload()
+    try:
+        assert tenants.resolve("k-bulk", "interactive") == {"tenant": "acme", "priority": "batch", "weight": 3.0}
+        assert tenants.resolve(None, "batch")["priority"] == "batch"
+        assert tenants.resolve("unknown") == {"tenant": "anonymous", "priority": "interactive", "weight": 1.0}
+    finally:
+        monkeypatch.delenv("API_KEYS")
+        tenants.reload()
+
+
+def test_running_jobs_publish_partial_results(store):
+    store.create_job("audit", "a")
+    store.update_progress("audit", "a", {"artifacts": {}}, {"playwright": "running"})
+    assert store.get_job("audit", "a")["phases"] is None  # not started yet
+    store.claim(["audit"], "w")
+    store.update_progress("audit", "a", {"artifacts": {"dom_sample_path": "dom.html"}}, {"playwright": "done", "psi": "running"})
+    job = store.get_job("audit", "a")
+    assert job["status"] == "running"
+    assert job["result"]["artifacts"]["dom_sample_path"] == "dom.html"
+    assert job["phases"] == {"playwright": "done", "psi": "running"}
+
+    store.complete_job("audit", "a", {"artifacts": {"psi": {}}})
+    store.update_progress("audit", "a", {"stale": True}, {"psi": "running"})
+    assert store.get_job("audit", "a")["result"] == {"artifacts": {"psi": {}}}
+
+
+def test_generate_starts_once_the_dom_sample_exists(tmp_path, monkeypatch):
+    store = _SqliteJobs(tmp_path / "jobs.db")
+    monkeypatch.setattr(routes, "jobs", store)
+    client = TestClient(app)
+    store.create_job("audit", "a")
+    store.claim(["audit"], "w")
+    body = {"audit_id": "a", "mode": "fast"}
+    assert client.post("/generate", json=body).status_code == 400
+
+    store.update_progress("audit", "a", {"artifacts": {"dom_sample_path": "dom.html"}}, {"playwright": "done", "psi": "running"})
+    assert client.get("/audit/a").json()["phases"] == {"playwright": "done", "psi": "running"}
+    assert "job_id" in client.post("/generate", json=body).json()
+
+
+def test_finished_jobs_keep_their_terminal_state(store):
+    store.create_job("audit", "a")
+    assert store.complete_job("audit", "a", {}) is False  # never started
+    store.claim(["audit"], "w")
+    assert store.cancel_job("audit", "a", "cancelled by client") is True
+    assert store.fail_job("audit", "a", {"error": "boom"}) is False
+    assert store.get_job("audit", "a")["status"] == "cancelled"
+
+
+def test_api_metrics_include_worker_queue_waits(tmp_path, monkeypatch):
+    store = _SqliteJobs(tmp_path / "jobs.db")
+    monkeypatch.setattr("app.utils.jobs.jobs", store)
+    store.create_job("generate", "w0", priority="batch")
+    # Claimed by a worker process through its own connection
+    _SqliteJobs(tmp_path / "jobs.db").claim(["generate"], "worker-1")
+    before = JOB_QUEUE_WAIT_SECONDS.count(kind="generate", priority="batch")
+    body = TestClient(app).get("/metrics").text
+    assert JOB_QUEUE_WAIT_SECONDS.count(kind="generate", priority="batch") == before + 1
+    assert 'ych_job_queue_wait_seconds_count{kind="generate",priority="batch"}' in body
+    # Each claim is counted once
+    TestClient(app).get("/metrics")
+    assert JOB_QUEUE_WAIT_SECONDS.count(kind="generate", priority="batch") == before + 1
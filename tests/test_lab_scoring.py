@@ -0,0 +1,28 @@
+import pytest
+
+from app.services.analysis import synthesize_suggestions
+from app.services.lab import metric_score, score_lab
+
+
+def test_metric_score_matches_lighthouse_control_points():
+    assert metric_score(2500, 2500, 4000) == pytest.approx(0.9)
+    assert metric_score(4000, 2500, 4000) == pytest.approx(0.5)
+    assert metric_score(0, 2500, 4000) == 1.0
+    assert metric_score(1000, 2500, 4000) > 0.9 > metric_score(3000, 2500, 4000) > 0.5 > metric_score(10000, 2500, 4000)
+
+
+def test_score_lab_weights_measured_metrics():
+    fast = {"fcp_ms": 800, "lcp_ms": 1200, "tbt_ms": 0, "cls": 0.0}
+    slow = {"fcp_ms": 6000, "lcp_ms": 9000, "tbt_ms": 1500, "cls": 0.5}
+    assert score_lab(fast) == 100
+    assert score_lab(slow) < 20
+    # Desktop curves are stricter
+    mid = {"fcp_ms": 1500, "lcp_ms": 2000, "tbt_ms": 180, "cls": 0.05}
+    assert score_lab(mid, mobile=False) < score_lab(mid, mobile=True)
+    assert score_lab({"lcp_ms": None}) is None
+
+
+def test_suggestions_use_lab_score_without_psi():
+    result = {"scores": {"performance": 45}, "artifacts": {"lab": {"score": 45}}}
+    perf = [s for s in synthesize_suggestions(result)["suggestions"] if s["area"] == "performance"]
+    assert perf and perf[0]["priority"] == "high"
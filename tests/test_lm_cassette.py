@@ -0,0 +1,30 @@
+import json
+
+import dspy
+import pytest
+
+from app.services.dspy_agents import agent_content_improver
+from app.utils.lm_cassette import RecordingLM, ReplayLM
+from benchmarks.fakes import FakeLM
+
+
+def test_record_then_replay_offline(tmp_path):
+    cassette = tmp_path / "lm.jsonl"
+    recorder = RecordingLM(FakeLM(latency=0.05), str(cassette))
+    with dspy.context(lm=recorder, adapter=dspy.ChatAdapter()):
+        recorded = agent_content_improver("# Site\n## Hero\nWelcome", tone="bold")
+
+    entries = [json.loads(line) for line in cassette.read_text().splitlines()]
+    assert len(entries) == 1
+    assert entries[0]["latency_s"] >= 0.05
+    assert entries[0]["usage"]["total_tokens"] > 0
+    assert len(entries[0]["key"]) == 64
+
+    replay = ReplayLM(str(cassette), latency="zero")
+    with dspy.context(lm=replay, adapter=dspy.ChatAdapter()):
+        replayed = agent_content_improver("# Site\n## Hero\nWelcome", tone="bold")
+        assert replayed == recorded
+        with pytest.raises(Exception, match="cassette miss"):
+            agent_content_improver("# Another site", tone="bold")
+    # Only the recorded prompt was answered (adapter fallbacks may retry the miss)
+    assert replay.calls - replay.misses == 1
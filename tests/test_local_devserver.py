@@ -0,0 +1,34 @@
+import subprocess
+
+import pytest
+
+from app.services.local_devserver import provision_local_dev_server
+
+
+def test_local_backend_implements_dev_server_handle(tmp_path):
+    template = tmp_path / "template"
+    (template / "app").mkdir(parents=True)
+    (template / "package.json").write_text('{"name": "tpl"}')
+    (template / "app" / "page.tsx").write_text("export default function Page() { return null; }\n")
+
+    ds = provision_local_dev_server(
+        str(tmp_path / "work"), template=str(template), npm_cache_dir=str(tmp_path / "cache")
+    )
+
+    assert ds["fs"].read_file("app/page.tsx").startswith("export default")
+    ds["fs"].write_file("components/Hero.tsx", "export default function Hero() { return null; }\n")
+    assert "Hero.tsx" in ds["fs"].ls("components")
+    with pytest.raises(ValueError):
+        ds["fs"].read_file("../template/package.json")
+
+    res = ds["process"].exec("echo $npm_config_cache && exit 3")
+    assert res["exitCode"] == 3
+    assert res["stdout"].strip() == str(tmp_path / "cache")
+
+    ds["commit_and_push"]("Add hero")
+    log = subprocess.run(
+        ["git", "log", "--format=%s"], cwd=ds["repo_id"], capture_output=True, text=True
+    ).stdout.split("\n")
+    assert log[:2] == ["Add hero", "Initial template"]
+    ds["commit_and_push"]("No changes")
+    assert ds["shutdown"]()["success"]
@@ -0,0 +1,21 @@
+from app.utils.manifest import MANIFEST_NAME, load_manifest, sync_files
+
+
+def test_sync_files_writes_only_changes(tmp_path):
+    diff = sync_files(tmp_path, {"a.txt": "a", "b/c.txt": "c"})
+    assert diff["added"] == ["a.txt", "b/c.txt"]
+    assert set(load_manifest(tmp_path)) == {"a.txt", "b/c.txt"}
+
+    before = (tmp_path / "a.txt").stat().st_mtime_ns
+    diff = sync_files(tmp_path, {"a.txt": "a", "b/c.txt": "C"})
+    assert diff["changed"] == ["b/c.txt"]
+    assert diff["unchanged"] == ["a.txt"]
+    assert (tmp_path / "a.txt").stat().st_mtime_ns == before
+
+    # Out-of-band edits and dropped files are reconciled
+    (tmp_path / "a.txt").write_text("edited")
+    diff = sync_files(tmp_path, {"a.txt": "a"})
+    assert diff["changed"] == ["a.txt"] and diff["removed"] == ["b/c.txt"]
+    assert (tmp_path / "a.txt").read_text() == "a"
+    assert not (tmp_path / "b" / "c.txt").exists()
+    assert (tmp_path / MANIFEST_NAME).exists()
@@ -0,0 +1,47 @@
+from app.services.mcp_agents import SessionFileCache
+
+
+class _FakeFS:
+    def __init__(self) -> None:
+        self.files = {"app/page.tsx": "export default function Page() {}"}
+        self.reads = 0
+        self.writes = 0
+
+    def read_file(self, path: str) -> str:
+        self.reads += 1
+        return self.files[path]
+
+    def write_file(self, path: str, content: str) -> None:
+        self.writes += 1
+        self.files[path] = content
+
+
+def test_reads_are_cached_and_writes_keep_cache_coherent():
+    fs = _FakeFS()
+    cache = SessionFileCache(fs)
+
+    assert cache.read_file("app/page.tsx") == fs.files["app/page.tsx"]
+    cache.read_file("app/page.tsx")
+    assert fs.reads == 1
+
+    cache.write_file("app/page.tsx", "new")
+    assert cache.read_file("app/page.tsx") == "new"
+    assert fs.reads == 1
+
+
+def test_batch_operations():
+    fs = _FakeFS()
+    cache = SessionFileCache(fs)
+
+    cache.write_files({"a.ts": "a", "b.ts": "b"})
+    assert fs.writes == 2
+    assert cache.read_files(["a.ts", "b.ts", "app/page.tsx"]) == {
+        "a.ts": "a",
+        "b.ts": "b",
+        "app/page.tsx": fs.files["app/page.tsx"],
+    }
+    assert fs.reads == 1
+
+    cache.invalidate()
+    cache.read_file("a.ts")
+    assert fs.reads == 2
@@ -0,0 +1,38 @@
+import pytest
+
+from app.utils.metrics import Counter, Gauge, Histogram, REGISTRY, render_metrics
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram("test_latency_seconds", "test", ["stage"], buckets=(0.1, 1.0))
+    try:
+        for value in (0.05, 0.1, 0.5, 3.0):
+            hist.observe(value, stage="build")
+        lines = [line for line in hist.render() if line.startswith("test_latency_seconds")]
+        assert lines == [
+            'test_latency_seconds_bucket{stage="build",le="0.1"} 2',
+            'test_latency_seconds_bucket{stage="build",le="1"} 3',
+            'test_latency_seconds_bucket{stage="build",le="+Inf"} 4',
+            'test_latency_seconds_sum{stage="build"} 3.65',
+            'test_latency_seconds_count{stage="build"} 4',
+        ]
+        with pytest.raises(ValueError):
+            with hist.time(stage="lint"):
+                raise ValueError("boom")
+        assert hist.count(stage="lint") == 1
+    finally:
+        REGISTRY.remove(hist)
+
+
+def test_counter_and_gauges_render():
+    counter = Counter("test_failures_total", "test", ["stage"])
+    gauge = Gauge("test_pool", "test", collect=lambda: {(): 3.0})
+    try:
+        counter.inc(stage='we"ird')
+        text = render_metrics()
+        assert 'test_failures_total{stage="we\\"ird"} 1' in text
+        assert "test_pool 3" in text
+        assert "# TYPE ych_stage_failures_total counter" in text
+    finally:
+        REGISTRY.remove(counter)
+        REGISTRY.remove(gauge)
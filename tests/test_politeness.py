@@ -0,0 +1,91 @@
+import threading
+import time
+from email.utils import formatdate
+
+import pytest
+
+from app.models.schemas import AuditOptions
+from app.services import psi
+from app.services.audit import _psi_phase
+
+from app.utils.cancellation import CancelToken, JobCancelled, job_scope
+from app.utils.metrics import ORIGIN_DEFERRALS
+from app.utils.politeness import OriginBusy, OriginLimiter, _MemoryOrigins, _SqliteOrigins, origin_of, parse_retry_after
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    return _MemoryOrigins() if request.param == "memory" else _SqliteOrigins(tmp_path / "jobs.db", lease_ttl=60)
+
+
+def test_limits_concurrency_and_spacing_per_origin(backend):
+    limiter = OriginLimiter(backend, max_concurrent=2, min_interval=0.1, default_backoff=1)
+    active, peak, starts, lock = {}, {}, {}, threading.Lock()
+
+    def load(url: str) -> None:
+        origin = origin_of(url)
+        with limiter.acquire(url):
+            with lock:
+                active[origin] = active.get(origin, 0) + 1
+                peak[origin] = max(peak.get(origin, 0), active[origin])
+                starts.setdefault(origin, []).append(time.monotonic())
+            time.sleep(0.3)
+            with lock:
+                active[origin] -= 1
+
+    urls = [f"https://Example.com/p{i}" for i in range(4)] + ["https://other.example/"]
+    threads = [threading.Thread(target=load, args=(url,)) for url in urls]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak == {"example.com": 2, "other.example": 1}
+    times = sorted(starts["example.com"])
+    assert all(b - a >= 0.09 for a, b in zip(times, times[1:]))
+    assert origin_of("https://Example.com:8443/x") == "example.com:8443"
+
+
+def test_retry_after_defers_the_origin(backend):
+    limiter = OriginLimiter(backend, max_concurrent=4, min_interval=0, default_backoff=30)
+    before = ORIGIN_DEFERRALS.value(resource="page", status="429")
+    assert limiter.defer("https://busy.example/a", 429, "0.4") == pytest.approx(0.4)
+    start = time.monotonic()
+    with limiter.acquire("https://busy.example/b"):
+        pass
+    assert time.monotonic() - start >= 0.3
+    assert ORIGIN_DEFERRALS.value(resource="page", status="429") == before + 1
+
+
+def test_waiting_for_an_origin_is_cancellable():
+    limiter = OriginLimiter(_MemoryOrigins(), max_concurrent=1, min_interval=0, default_backoff=30)
+    limiter.defer("https://slow.example/", 503, None)
+    token = CancelToken()
+    threading.Timer(0.2, token.cancel).start()
+    with job_scope(token), pytest.raises(JobCancelled):
+        with limiter.acquire("https://slow.example/"):
+            pass
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("99999") == 300
+    assert parse_retry_after(formatdate(time.time() + 60, usegmt=True)) == pytest.approx(60, abs=2)
+    assert parse_retry_after("soon") is None
+
+
+def test_deferred_psi_is_skipped_instead_of_waited_out(monkeypatch):
+    limiter = OriginLimiter(_MemoryOrigins(), max_concurrent=8, min_interval=0, default_backoff=30)
+    monkeypatch.setattr(psi, "origins", limiter)
+    monkeypatch.delenv("PAGESPEED_API_URL", raising=False)
+    limiter.defer("https://www.googleapis.com/pagespeedonline/v5/runPagespeed", 429, "300", resource="psi")
+    with pytest.raises(OriginBusy):
+        with limiter.acquire("https://www.googleapis.com/x", resource="psi", max_wait=5):
+            pass
+
+    result = {"artifacts": {}, "scores": {}}
+    phases = {"psi": "running"}
+    start = time.monotonic()
+    _psi_phase("https://example.com", AuditOptions(), result, phases)
+    assert time.monotonic() - start < 1
+    assert phases["psi"] == "deferred"
+    assert result["warnings"][0].startswith("psi_deferred:")
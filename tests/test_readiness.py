@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from app.models.schemas import AuditOptions
+from app.services.audit import _navigate
+from app.utils.cancellation import CancelToken, DeadlineExceeded, job_scope
+from app.utils.metrics import AUDIT_READINESS
+
+
+class _Page:
+    def __init__(self, load_fires: bool = True, hang: bool = False):
+        self.load_fires = load_fires
+        self.hang = hang
+        self.calls = []
+        self.settle_args = None
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        self.calls.append(("goto", wait_until))
+        self.goto_timeout = timeout
+        if self.hang:
+            await asyncio.sleep(5)
+        return "response"
+
+    async def wait_for_load_state(self, state, timeout=None):
+        self.calls.append(("load", state))
+        if not self.load_fires:
+            raise PlaywrightTimeoutError("Timeout exceeded")
+
+    async def evaluate(self, script, arg):
+        self.settle_args = arg
+        return {"reason": "quiet", "mutations": 3, "shifts": 0, "settleMs": 500}
+
+
+def test_adaptive_readiness_waits_for_load_then_quiet_window():
+    page = _Page()
+    before = AUDIT_READINESS.value(reason="quiet")
+    response, readiness = asyncio.run(_navigate(page, "https://example.com", AuditOptions()))
+    assert response == "response"
+    assert page.calls == [("goto", "commit"), ("load", "load")]
+    assert page.settle_args["quietMs"] > 0 and page.settle_args["capMs"] > 0
+    assert readiness["strategy"] == "adaptive" and readiness["reason"] == "quiet"
+    assert readiness["mutations"] == 3
+    assert AUDIT_READINESS.value(reason="quiet") == before + 1
+
+
+def test_load_timeout_is_recorded_instead_of_failing():
+    page = _Page(load_fires=False)
+    _, readiness = asyncio.run(_navigate(page, "https://example.com", AuditOptions()))
+    assert readiness["reason"] == "load_timeout"
+    assert readiness["total_s"] >= readiness["load_s"]
+
+
+def test_networkidle_strategy_is_still_available():
+    page = _Page()
+    _, readiness = asyncio.run(_navigate(page, "https://example.com", AuditOptions(readiness="networkidle")))
+    assert page.calls == [("goto", "networkidle")]
+    assert readiness["reason"] == "networkidle"
+
+
+def test_goto_deadline_bounds_navigation():
+    page = _Page(hang=True)
+    start = time.monotonic()
+    with job_scope(CancelToken(deadlines={"goto": 0.2})):
+        with pytest.raises(DeadlineExceeded):
+            asyncio.run(_navigate(page, "https://example.com", AuditOptions()))
+    assert page.goto_timeout <= 200
+    assert time.monotonic() - start < 2
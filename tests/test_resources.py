@@ -0,0 +1,47 @@
+from app.services.analysis import performance_suggestions, synthesize_suggestions
+from app.services.resources import resource_entry, summarize_resources
+
+
+def _entries():
+    return [
+        resource_entry("https://shop.example/", "document", 200, {"content-type": "text/html; charset=utf-8", "content-encoding": "br"}, 20_000),
+        resource_entry("https://shop.example/app.js", "script", 200, {"content-type": "application/javascript", "cache-control": "max-age=60"}, 400_000),
+        resource_entry("https://shop.example/site.css", "stylesheet", 200, {"content-type": "text/css", "content-encoding": "gzip", "cache-control": "public, max-age=31536000, immutable"}, 30_000),
+        resource_entry("https://shop.example/hero.jpg", "image", 200, {"content-type": "image/jpeg"}, 900_000),
+        resource_entry("https://cdn.ads.example/tag.js", "script", 200, {"content-type": "text/javascript", "content-encoding": "gzip", "cache-control": "no-cache"}, 500_000),
+    ]
+
+
+def test_summary_groups_bytes_and_flags_problems():
+    summary = summarize_resources(_entries(), "https://shop.example/", ["https://shop.example/app.js", "https://shop.example/site.css"])
+    assert summary["requests"] == 5 and summary["total_bytes"] == 1_850_000
+    assert summary["bytes_by_type"] == {"script": 900_000, "image": 900_000, "stylesheet": 30_000, "document": 20_000}
+    assert summary["bytes_by_origin"]["cdn.ads.example"] == 500_000
+    assert summary["third_party_bytes"] == 500_000
+    assert summary["largest"][0]["url"] == "https://shop.example/hero.jpg"
+    assert [u["url"] for u in summary["uncompressed"]] == ["https://shop.example/app.js"]
+    assert summary["render_blocking"] == [
+        {"url": "https://shop.example/app.js", "type": "script", "bytes": 400_000},
+        {"url": "https://shop.example/site.css", "type": "stylesheet", "bytes": 30_000},
+    ]
+    # hero.jpg has no Cache-Control, app.js 60 s and tag.js no-cache; site.css is immutable
+    assert summary["short_cache_count"] == 3
+
+
+def test_suggestions_are_specific_and_ranked():
+    entries = _entries() + [resource_entry("https://cdn.ads.example/pixel.js", "script", 200, {"content-type": "text/javascript"}, 300_000)]
+    summary = summarize_resources(entries, "https://shop.example/", ["https://shop.example/app.js"])
+    ranked = performance_suggestions(summary)
+    assert [s["priority"] for s in ranked] == sorted(
+        (s["priority"] for s in ranked), key=["high", "moderate", "low"].index
+    )
+    actions = " ".join(s["action"] for s in ranked)
+    assert "gzip or brotli" in actions and "large image" in actions and "third-party" in actions
+    assert "add defer/async to 1 script(s)" in actions
+    same_priority = [s["est_savings_bytes"] for s in ranked if s["priority"] == ranked[0]["priority"]]
+    assert same_priority == sorted(same_priority, reverse=True)
+    assert ranked[-1]["action"].startswith("Serve 4 static asset(s)")
+
+    result = synthesize_suggestions({"scores": {"performance": 40}, "artifacts": {"resources": summary}})
+    perf = [s for s in result["suggestions"] if s["area"] == "performance"]
+    assert perf and not any("Optimize images, enable compression" in s["action"] for s in perf)
@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_api_import_does_not_load_heavy_dependencies():
+    probe = (
+        "import sys, app.main; "
+        "print(','.join(m for m in ('dspy', 'litellm', 'playwright', 'freestyle') if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+
+def test_queue_api_startup_does_not_configure_dspy(tmp_path):
+    probe = (
+        "import sys; from fastapi.testclient import TestClient; from app.main import app\n"
+        "with TestClient(app): print('dspy' in sys.modules)"
+    )
+    env = {**os.environ, "JOB_QUEUE": "sqlite", "JOB_QUEUE_PATH": str(tmp_path / "jobs.db")}
+    out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "False"
@@ -0,0 +1,72 @@
+import time
+
+from app.utils import storage as storage_mod
+from app.utils.jobs import _SqliteJobs, jobs
+
+
+def _job_dir(base, kind, job_id, size):
+    path = base / kind / job_id
+    (path / "next_project").mkdir(parents=True)
+    (path / "next_project" / "package.json").write_text("{}")
+    (path / "blob.bin").write_bytes(b"x" * size)
+    return path
+
+
+def test_gc_ttl_and_quota_lru(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage_mod, "LATEST_PROJECT_FILE", tmp_path / "latest_project")
+    mgr = storage_mod._StorageManager(tmp_path, ttl_seconds=3600, quota_bytes=2500, interval_seconds=0)
+
+    paths = {}
+    for job_id in ("gc-old", "gc-a", "gc-b", "gc-c"):
+        jobs.create_job("generate", job_id)
+        jobs.start_job("generate", job_id)
+        paths[job_id] = _job_dir(tmp_path, "generate", job_id, 1000)
+        mgr.register("generate", job_id, paths[job_id])
+        mgr.refresh("generate", job_id)
+        jobs.complete_job("generate", job_id, {"project_dir": str(paths[job_id] / "next_project")})
+        mgr.set_latest_project(str(paths[job_id] / "next_project"))
+
+    mgr._entries[("generate", "gc-old")]["last_accessed"] = time.time() - 7200
+    mgr.touch("generate", "gc-a")  # gc-b is now least recently used
+
+    evicted = {e["path"] for e in mgr.collect_garbage()}
+    assert evicted == {str(paths["gc-old"]), str(paths["gc-b"])}
+    assert not paths["gc-old"].exists() and not paths["gc-b"].exists()
+    assert jobs.get_job("generate", "gc-b")["status"] == "expired"
+    assert jobs.get_job("generate", "gc-a")["status"] == "done"
+    assert mgr.total_bytes() <= 2500
+    assert mgr.latest_project() == str(paths["gc-c"] / "next_project")
+
+    mgr.touch("generate", "gc-a")
+    mgr.quota_bytes = 1500
+    mgr.collect_garbage()
+    assert mgr.latest_project() == str(paths["gc-a"] / "next_project")
+
+
+def test_gc_skips_running_jobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage_mod, "LATEST_PROJECT_FILE", tmp_path / "latest_project")
+    mgr = storage_mod._StorageManager(tmp_path, ttl_seconds=0, quota_bytes=1, interval_seconds=0)
+    jobs.create_job("audit", "gc-running")
+    path = _job_dir(tmp_path, "audit", "gc-running", 10)
+    mgr.register("audit", "gc-running", path)
+    mgr.refresh("audit", "gc-running")
+    assert mgr.collect_garbage() == []
+    assert path.exists()
+
+
+def test_worker_directories_are_remeasured_until_their_job_finishes(tmp_path, monkeypatch):
+    store = _SqliteJobs(tmp_path / "jobs.db")
+    monkeypatch.setattr(storage_mod, "jobs", store)
+    mgr = storage_mod._StorageManager(tmp_path, ttl_seconds=0, quota_bytes=0, interval_seconds=0)
+    store.create_job("generate", "gc-worker")
+    store.claim(["generate"], "w")
+    # First seen while the worker is still writing
+    path = _job_dir(tmp_path, "generate", "gc-worker", 100)
+    mgr.collect_garbage()
+    assert mgr.get("generate", "gc-worker")["size"] == 102
+
+    (path / "workspace.bin").write_bytes(b"x" * 5000)
+    store.complete_job("generate", "gc-worker", {})
+    mgr.collect_garbage()
+    assert mgr.get("generate", "gc-worker")["size"] == 5102
+    assert mgr.get("generate", "gc-worker")["settled"] is True
@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.schemas import AuditOptions
+from app.services.throttling import PROFILES, apply_throttling
+
+
+class _Context:
+    def __init__(self):
+        self.sent = []
+
+    async def new_cdp_session(self, page):
+        context = self
+
+        class _Session:
+            async def send(self, method, params=None):
+                context.sent.append((method, params))
+
+        return _Session()
+
+
+def test_profile_is_applied_through_cdp_and_recorded():
+    context = _Context()
+    record = asyncio.run(apply_throttling(context, object(), "slow-4g-midtier"))
+    assert record == {"profile": "slow-4g-midtier", **PROFILES["slow-4g-midtier"]}
+    methods = dict(context.sent)
+    assert methods["Network.emulateNetworkConditions"]["latency"] == 562.5
+    assert methods["Network.emulateNetworkConditions"]["downloadThroughput"] == pytest.approx(1474.56 * 1024 / 8)
+    assert methods["Emulation.setCPUThrottlingRate"] == {"rate": 4}
+
+
+def test_unthrottled_and_unknown_profiles():
+    context = _Context()
+    assert asyncio.run(apply_throttling(context, object(), "none")) == {"profile": "none"}
+    assert context.sent == []
+    # desktop-cable and fast-3g keep the host CPU
+    asyncio.run(apply_throttling(context, object(), "desktop-cable"))
+    asyncio.run(apply_throttling(context, object(), "fast-3g"))
+    assert "Emulation.setCPUThrottlingRate" not in dict(context.sent)
+    # DevTools' Fast 3G preset, in bytes per second
+    assert context.sent[-1][1]["downloadThroughput"] == pytest.approx(180000)
+    assert context.sent[-1][1]["uploadThroughput"] == pytest.approx(84375)
+    with pytest.raises(ValidationError):
+        AuditOptions(throttling="dialup")
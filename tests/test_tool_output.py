@@ -0,0 +1,44 @@
+from app.services.tool_output import ToolOutputLog, extract_errors, summarize_exec_result
+
+
+NEXT_BUILD = """
+   Creating an optimized production build ...
+Failed to compile.
+
+./app/page.tsx:12:5
+Type error: Property 'title' does not exist on type '{}'.
+"""
+
+NEXT_LINT = """
+./app/page.tsx
+14:7  Error: img elements must have an alt prop.  jsx-a11y/alt-text
+20:1  Warning: Unexpected console statement.  no-console
+"""
+
+TSC = "components/Hero.tsx(3,10): error TS2304: Cannot find name 'Foo'."
+
+
+def test_extract_errors_from_ts_and_eslint_output():
+    errors = extract_errors(NEXT_BUILD + NEXT_LINT + TSC)
+    assert errors == [
+        {"file": "./app/page.tsx", "line": 12, "message": "Property 'title' does not exist on type '{}'."},
+        {"file": "./app/page.tsx", "line": 14, "message": "img elements must have an alt prop.", "rule": "jsx-a11y/alt-text"},
+        {"file": "components/Hero.tsx", "line": 3, "code": "TS2304", "message": "Cannot find name 'Foo'."},
+    ]
+
+
+def test_digest_is_bounded(tmp_path):
+    noisy = "\n".join(f"npm http fetch GET 200 package-{i}" for i in range(20000))
+    res = {"stdout": noisy, "stderr": NEXT_BUILD, "isNew": False}
+    digest = summarize_exec_result(res, tail_lines=5)
+    assert len(digest) < 2000
+    assert "exit_code: unknown" in digest
+    assert "./app/page.tsx:12" in digest
+
+    log = ToolOutputLog(log_dir=str(tmp_path), capacity=2)
+    for _ in range(3):
+        out = log.digest("exec", "npm run build", res)
+    assert "full log:" in out
+    assert len(log.recent()) == 2
+    assert len(log.paths) == 3
+    assert noisy in (tmp_path / "003_exec.log").read_text()
@@ -0,0 +1,50 @@
+import json
+
+from app.utils import tracing
+from app.utils.tracing import JsonlExporter, current_trace_id, span, start_span, traced
+
+
+def test_nested_spans_share_trace_and_link_parents(tmp_path, monkeypatch):
+    exporter = JsonlExporter(str(tmp_path / "spans.jsonl"))
+    monkeypatch.setattr(tracing.processor, "exporters", [exporter])
+
+    @traced("child.fn")
+    def child() -> str:
+        return current_trace_id() or ""
+
+    with span("root", route="/audit") as root:
+        inner_trace = child()
+        ctx = root.context()
+    # A span started later (e.g. a background job) can be parented explicitly
+    job = start_span("job", parent=ctx)
+    job.end()
+    tracing.processor.flush()
+
+    spans = {s["name"]: s for s in map(json.loads, (tmp_path / "spans.jsonl").read_text().splitlines())}
+    assert inner_trace == root.trace_id
+    assert spans["child.fn"]["parent_id"] == spans["root"]["span_id"]
+    assert spans["job"]["parent_id"] == spans["root"]["span_id"]
+    assert spans["root"]["parent_id"] is None
+    assert spans["root"]["attributes"] == {"route": "/audit"}
+    assert current_trace_id() is None
+
+
+def test_span_records_errors():
+    try:
+        with span("boom") as s:
+            raise RuntimeError("bad")
+    except RuntimeError:
+        pass
+    assert s.status == "error"
+    assert "RuntimeError" in s.attributes["error"]
+
+
+def test_jsonl_export_is_rotated_by_size(tmp_path):
+    exporter = JsonlExporter(str(tmp_path / "spans.jsonl"), max_bytes=600)
+    for i in range(20):
+        s = start_span(f"poll-{i}")
+        s.end()
+        exporter.export([s])
+    assert (tmp_path / "spans.jsonl").stat().st_size <= 600
+    assert (tmp_path / "spans.jsonl.1").stat().st_size <= 600
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["spans.jsonl", "spans.jsonl.1"]